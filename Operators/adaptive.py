@@ -0,0 +1,189 @@
+import time
+import numpy as np
+
+from Operators.population import calculate_fitness
+
+# Bandit policies of OperatorBandit
+POLICIES = ("ucb1", "epsilon_greedy", "probability_matching")
+# Costs an AdaptiveOperator divides the improvement of a use by
+COSTS = ("evaluations", "seconds")
+
+
+class OperatorBandit:
+    """
+    Multi-armed bandit choosing among operators online.
+
+    Every use of an operator is rewarded with the fitness improvement it brought per unit
+    of cost (see AdaptiveOperator). The mean rewards are divided by the best of them, so that they lie in
+    [0, 1] whatever the scale of the fitness.
+
+    Policies:
+    - "ucb1": the operator with the best mean reward plus an exploration bonus
+      c * sqrt(2 ln(uses of all operators) / uses of this operator); each operator is tried once first
+    - "epsilon_greedy": a random operator with probability epsilon, the best mean reward otherwise
+    - "probability_matching": each operator with a probability proportional to its mean
+      reward, and at least p_min (uniform until an operator is rewarded)
+
+    Parameters:
+    -----------
+    n_arms : int
+        Number of operators.
+    policy : str
+        One of POLICIES.
+    c : float
+        Weight of the UCB1 exploration bonus.
+    epsilon : float
+        Exploration probability of epsilon_greedy.
+    p_min : float
+        Smallest probability of an operator under probability_matching (at most 1 / n_arms).
+    """
+    def __init__(self, n_arms, policy="epsilon_greedy", c=0.5, epsilon=0.1, p_min=0.05):
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown policy {policy!r}, expected one of {POLICIES}.")
+        self.policy = policy
+        self.c = c
+        self.epsilon = epsilon
+        self.p_min = min(p_min, 1 / n_arms)
+        self.uses = np.zeros(n_arms, dtype=np.int64)
+        self.reward_sums = np.zeros(n_arms)
+        self.improvements = np.zeros(n_arms, dtype=np.int64)
+        self.improvement_sums = np.zeros(n_arms)
+        self.costs = np.zeros(n_arms)
+        self.seconds = np.zeros(n_arms)
+
+    def mean_rewards(self):
+        """Mean reward of every operator over the best mean (0 for unused ones)."""
+        means = np.divide(self.reward_sums, self.uses, out=np.zeros(len(self.uses)), where=self.uses > 0)
+        best = means.max()
+        return means / best if best > 0 else means
+
+    def choose(self):
+        """Index of the operator to use next."""
+        untried = np.flatnonzero(self.uses == 0)
+        if untried.size:
+            return int(untried[0])
+        means = self.mean_rewards()
+        if self.policy == "epsilon_greedy":
+            if np.random.random() < self.epsilon:
+                return int(np.random.randint(len(self.uses)))
+            return int(np.argmax(means))
+        if self.policy == "probability_matching":
+            n_arms = len(self.uses)
+            shares = means / means.sum() if means.sum() > 0 else np.full(n_arms, 1 / n_arms)
+            return int(np.random.choice(n_arms, p=self.p_min + (1 - n_arms * self.p_min) * shares))
+        bonus = self.c * np.sqrt(2 * np.log(self.uses.sum()) / self.uses)
+        return int(np.argmax(means + bonus))
+
+    def update(self, arm, improvement, cost, seconds=0.0):
+        """
+        Record one use of operator `arm`: fitness improvement (>= 0) obtained for `cost`
+        (rewarded with improvement / cost), and the `seconds` it took (reported only).
+        """
+        reward = improvement / max(cost, 1e-9)
+        self.uses[arm] += 1
+        self.reward_sums[arm] += reward
+        self.costs[arm] += cost
+        self.seconds[arm] += seconds
+        if improvement > 0:
+            self.improvements[arm] += 1
+            self.improvement_sums[arm] += improvement
+
+
+class AdaptiveOperator:
+    """
+    A list of mutations or crossovers used as one operator: each call asks an OperatorBandit
+    which one to apply, and rewards it with its improvement per unit of `cost`:
+    - "evaluations" (default): the children it produced (at least 1), i.e. the fitness
+      evaluations it consumed; deterministic, so seeded runs are reproducible
+    - "seconds": the wall-clock time it took. Rewards then depend on the machine load and
+      the number of workers, so seeded runs are NOT reproducible
+
+    - mutations (kind="mutation") are called as mutation(league, mut_prob); the improvement
+      is the parent's fitness minus the child's
+    - crossovers (kind="crossover") are called as crossover(parent1, parent2); the
+      improvement is the best parent's fitness minus the best valid child's
+    A rejected (None) or worse child counts as no improvement, and so does any child of an
+    invalid parent (leaving the penalty would dwarf every real improvement). The children are evaluated
+    here (their fitness is memoized, so the GA does not evaluate them again).
+
+    Usage:
+    ------
+    run_algorithm(mutation=[single_player_swap_2teams, full_position_swap_2teams],
+                  crossover=[crossover_swap_whole_position, crossover_swap_extreme_player])
+    (lists are wrapped in AdaptiveOperator by run_algorithm), or explicitly:
+    mutation = AdaptiveOperator([...], "mutation"); run_algorithm(mutation=mutation); mutation.stats()
+    """
+    def __init__(self, operators, kind, policy="epsilon_greedy", cost="evaluations", **bandit_params):
+        if kind not in ("mutation", "crossover"):
+            raise ValueError(f"Unknown operator kind {kind!r}, expected 'mutation' or 'crossover'.")
+        if cost not in COSTS:
+            raise ValueError(f"Unknown cost {cost!r}, expected one of {COSTS}.")
+        self.operators = list(operators)
+        self.kind = kind
+        self.cost = cost
+        self.bandit = OperatorBandit(len(self.operators), policy, **bandit_params)
+        self.__name__ = operator_name(self.operators)
+
+    def __call__(self, *args):
+        arm = self.bandit.choose()
+        operator = self.operators[arm]
+        if self.kind == "mutation":
+            league, mut_prob = args
+            before = self._parent_fitness(league)
+            start = time.perf_counter()
+            child = operator(league, mut_prob)
+            seconds = time.perf_counter() - start
+            after = calculate_fitness(child) if child is not None else np.inf
+            self.bandit.update(arm, max(before - after, 0.0), self._cost(1, seconds), seconds)
+            return child
+
+        parent1, parent2 = args
+        before = min(self._parent_fitness(parent1), self._parent_fitness(parent2))
+        start = time.perf_counter()
+        children = operator(parent1, parent2)
+        seconds = time.perf_counter() - start
+        valid = [calculate_fitness(child) for child in (children or ()) if child is not None and child.is_valid()]
+        produced = sum(child is not None for child in (children or ()))
+        self.bandit.update(arm, max(before - min(valid), 0.0) if valid else 0.0, self._cost(produced, seconds), seconds)
+        return children
+
+    def _cost(self, produced, seconds):
+        return seconds if self.cost == "seconds" else max(produced, 1)
+
+    @staticmethod
+    def _parent_fitness(league):
+        # Children of invalid parents earn nothing (-inf: no child can improve on it)
+        fitness = calculate_fitness(league)
+        return fitness if league.spec.is_valid_fitness(fitness) else -np.inf
+
+    def stats(self):
+        """
+        One row per operator: uses, share of uses, improving uses, total improvement, cost,
+        seconds and mean reward.
+        """
+        import pandas as pd
+
+        bandit = self.bandit
+        total = bandit.uses.sum()
+        return pd.DataFrame({
+            "operator": [operator.__name__ for operator in self.operators],
+            "uses": bandit.uses,
+            "use_share": bandit.uses / total if total else 0.0,
+            "improving_uses": bandit.improvements,
+            "improvement": bandit.improvement_sums,
+            "cost": bandit.costs,
+            "seconds": bandit.seconds,
+            "mean_reward": bandit.mean_rewards(),
+        })
+
+
+def is_operator_list(value):
+    """Whether `value` is a list (or tuple) of operators, run adaptively by run_algorithm."""
+    return isinstance(value, (list, tuple)) and len(value) > 0 and all(callable(operator) for operator in value)
+
+
+def operator_name(operator):
+    """Name of an operator, or of a list of operators chosen adaptively, for logs and labels."""
+    if is_operator_list(operator):
+        return "adaptive(" + ",".join(operator_name(op) for op in operator) + ")"
+    return operator.__name__
@@ -0,0 +1,260 @@
+"""
+Speed and memory benchmarks of the GA building blocks.
+
+Every benchmark times one operation (a mutation, a crossover, a selection, a fitness
+evaluation, a population, a whole GA run) and reports its throughput in ops/sec, the
+peak memory it allocates per call (tracemalloc) and the peak RSS of the process.
+Results can be saved as a JSON baseline and later runs compared against it:
+
+    python -m Operators.benchmark --save benchmark_baseline.json
+    python -m Operators.benchmark --compare benchmark_baseline.json --threshold 0.15
+"""
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+
+import numpy as np
+
+from Operators import mutations, crossovers, selection
+from Operators.genetic_algorithm import run_algorithm
+from Operators.population import *
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+MUTATIONS = [mutations.single_player_swap_2teams, mutations.single_player_shift_all_teams,
+             mutations.full_position_swap_2teams]
+CROSSOVERS = [crossovers.crossover_swap_whole_position, crossovers.crossover_swap_extreme_player]
+
+
+def peak_rss_mb():
+    """Peak resident set size of the process so far, in MB (None where unavailable)."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes on Linux, bytes on macOS
+    return peak / 2**20 if sys.platform == "darwin" else peak / 2**10
+
+
+def build_benchmarks(players, pop_sizes=(20, 50, 100), max_gen=10, seed=0):
+    """
+    Return {name: operation} for every benchmark; each operation is a function without
+    arguments doing one call of the benchmarked code on leagues built from `players`.
+    """
+    random.seed(seed)
+    np.random.seed(seed)
+    roster = Roster(players)
+    population = generate_population(players, 50, roster=roster)
+    fitness = population_fitness(population)
+    league, other = population[0], population[1]
+    n_teams = len(league.genome)
+    genomes = np.stack([member.genome for member in population])
+
+    def fresh_fitness():
+        # Forget the memoized values so that the whole league is evaluated again
+        league.mark_dirty(*range(n_teams))
+        return calculate_fitness(league)
+
+    def fresh_population_fitness():
+        for member in population:
+            member._fitness = None
+        return population_fitness(population)
+
+    benchmarks = {}
+    # mut_prob=1: every call attempts the mutation
+    for mutation in MUTATIONS:
+        benchmarks[f"mutation/{mutation.__name__}"] = lambda mutation=mutation: mutation(league, 1.0)
+    for crossover in CROSSOVERS:
+        benchmarks[f"crossover/{crossover.__name__}"] = lambda crossover=crossover: crossover(league, other)
+
+    benchmarks.update({
+        "selection/selection_weights": lambda: selection.selection_weights(fitness),
+        "selection/roulette_selection_indices": lambda: selection.roulette_selection_indices(fitness, 50),
+        "selection/stochastic_selection_indices": lambda: selection.stochastic_selection_indices(fitness, 50),
+        "selection/tournament_selection_indices": lambda: selection.tournament_selection_indices(fitness, 50),
+        "selection/roulette_selection": lambda: selection.roulette_selection(population, fitness),
+        "selection/tournament_selection": lambda: selection.tournament_selection(population, fitness=fitness),
+        "selection/stochastic_selection": lambda: selection.stochastic_selection(population, 50, fitness),
+        "selection/select_parent_indices": lambda: selection.select_parent_indices(
+            selection.tournament_selection, population, fitness, 50),
+        "fitness/calculate_fitness": fresh_fitness,
+        "fitness/calculate_fitness_memoized": lambda: calculate_fitness(league),
+        "fitness/evaluate_genomes_pop50": lambda: evaluate_genomes(genomes, roster),
+        "fitness/population_fitness_pop50": fresh_population_fitness,
+        "population/generate_population_pop50": lambda: generate_population(players, 50, roster=roster),
+    })
+    for pop_size in pop_sizes:
+        benchmarks[f"ga/run_algorithm_pop{pop_size}_gen{max_gen}"] = lambda pop_size=pop_size: run_algorithm(
+            players=players, POP_SIZE=pop_size, max_gen=max_gen, seed=seed)
+    return benchmarks
+
+
+def measure(operation, min_time=0.2, repeat=5, alloc_calls=10):
+    """
+    Benchmark one operation.
+
+    1. Throughput: calls are timed in rounds of at least min_time seconds, and the fastest
+       of `repeat` rounds gives ops/sec (the other rounds include more noise)
+    2. Allocations: tracemalloc peak over a call, averaged over alloc_calls calls
+       (measured separately, tracemalloc slows the code down)
+    3. Peak RSS of the process after the benchmark
+
+    Returns:
+    --------
+    dict : ops_per_sec, seconds_per_op, peak_alloc_kb, peak_rss_mb
+    """
+    # 1) Calls per round, grown until a round lasts min_time
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            operation()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            break
+        number *= 2
+
+    best = elapsed
+    for _ in range(repeat - 1):
+        start = time.perf_counter()
+        for _ in range(number):
+            operation()
+        best = min(best, time.perf_counter() - start)
+
+    # 2) Memory allocated at the peak of each call
+    peaks = []
+    tracemalloc.start()
+    try:
+        for _ in range(alloc_calls):
+            tracemalloc.reset_peak()
+            baseline, _ = tracemalloc.get_traced_memory()
+            operation()
+            peaks.append(tracemalloc.get_traced_memory()[1] - baseline)
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "ops_per_sec": number / best,
+        "seconds_per_op": best / number,
+        "peak_alloc_kb": float(np.mean(peaks)) / 1024,
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def run_benchmarks(filepath="Data/players(in).csv", pattern=None, min_time=0.2, repeat=5,
+                   pop_sizes=(20, 50, 100), max_gen=10, seed=0, verbose=True):
+    """
+    Run the benchmarks whose name contains `pattern` (all of them if None).
+
+    Returns:
+    --------
+    dict : {"meta": machine and library versions, "results": {name: measure(...)}}
+    """
+    players = load_players_from_csv(filepath)
+    benchmarks = build_benchmarks(players, pop_sizes, max_gen, seed)
+
+    results = {}
+    for name, operation in benchmarks.items():
+        if pattern and pattern not in name:
+            continue
+        # Same random streams for every benchmark, whatever ran before
+        random.seed(seed)
+        np.random.seed(seed)
+        results[name] = measure(operation, min_time, repeat)
+        if verbose:
+            r = results[name]
+            print(f"{name:<50} {r['ops_per_sec']:>12.1f} ops/s {r['peak_alloc_kb']:>10.1f} KB "
+                  f"{r['peak_rss_mb'] or float('nan'):>8.1f} MB RSS")
+
+    meta = {
+        "date": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "data": filepath,
+        "min_time": min_time,
+        "repeat": repeat,
+    }
+    return {"meta": meta, "results": results}
+
+
+def save_baseline(report, path):
+    with open(path, "w") as f:
+        json.dump(report, f, indent=2)
+
+
+def load_baseline(path):
+    with open(path) as f:
+        return json.load(f)
+
+
+def compare_to_baseline(report, baseline, threshold=0.1):
+    """
+    Compare a benchmark report with a baseline report.
+
+    A benchmark regresses when its ops/sec dropped, or its peak allocation per call grew,
+    by more than `threshold` (a fraction: 0.1 = 10%). Benchmarks missing on either side
+    are skipped.
+
+    Returns:
+    --------
+    list[dict] : one row per benchmark present in both reports, with the relative changes
+        (positive = better) and a "regression" flag.
+    """
+    rows = []
+    for name, current in report["results"].items():
+        previous = baseline["results"].get(name)
+        if previous is None:
+            continue
+        speed_change = current["ops_per_sec"] / previous["ops_per_sec"] - 1
+        alloc_change = 1 - current["peak_alloc_kb"] / previous["peak_alloc_kb"] if previous["peak_alloc_kb"] else 0.0
+        rows.append({
+            "name": name,
+            "ops_per_sec": current["ops_per_sec"],
+            "baseline_ops_per_sec": previous["ops_per_sec"],
+            "speed_change": speed_change,
+            "alloc_change": alloc_change,
+            "regression": speed_change < -threshold or alloc_change < -threshold,
+        })
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the GA operators and loop.")
+    parser.add_argument("--data", default="Data/players(in).csv", help="players CSV")
+    parser.add_argument("--filter", default=None, help="only run benchmarks whose name contains this")
+    parser.add_argument("--min-time", type=float, default=0.2, help="seconds per timing round")
+    parser.add_argument("--repeat", type=int, default=5, help="timing rounds per benchmark")
+    parser.add_argument("--max-gen", type=int, default=10, help="generations of the run_algorithm benchmarks")
+    parser.add_argument("--save", default=None, help="write the results to this JSON baseline")
+    parser.add_argument("--compare", default=None, help="compare the results with this JSON baseline")
+    parser.add_argument("--threshold", type=float, default=0.1, help="relative change counted as a regression")
+    args = parser.parse_args(argv)
+
+    report = run_benchmarks(args.data, args.filter, args.min_time, args.repeat, max_gen=args.max_gen)
+    if args.save:
+        save_baseline(report, args.save)
+        print(f"\nBaseline saved to: {args.save}")
+
+    if args.compare:
+        rows = compare_to_baseline(report, load_baseline(args.compare), args.threshold)
+        print(f"\nComparison with {args.compare} (threshold {args.threshold:.0%}):")
+        for row in rows:
+            flag = "REGRESSION" if row["regression"] else ""
+            print(f"{row['name']:<50} speed {row['speed_change']:>+8.1%}  alloc {row['alloc_change']:>+8.1%}  {flag}")
+        regressions = [row["name"] for row in rows if row["regression"]]
+        if regressions:
+            print(f"\n{len(regressions)} regression(s): {', '.join(regressions)}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,186 @@
+"""
+Headless runner: one GA run, a grid search or a racing tuner, driven by a JSON or TOML
+config file.
+
+    python -m Operators.cli run config.toml --output result.json
+    python -m Operators.cli grid config.toml --timing
+    python -m Operators.cli tune config.toml
+
+Config file (every section but the one of the command is optional):
+
+    data = "Data/players(in).csv"   # players CSV
+    seed = 0
+
+    [spec]                          # ProblemSpec arguments (DEFAULT_SPEC otherwise)
+    num_teams = 5
+    salary_cap = 750
+
+    [run]                           # run_algorithm arguments
+    POP_SIZE = 50
+    max_gen = 100
+    mutation = "single_player_swap_2teams"
+    crossover = ["crossover_swap_whole_position", "crossover_swap_extreme_player"]  # adaptive
+
+    [grid]                          # run_grid_search arguments ("tune": tune_grid_search's)
+    n_runs = 30
+    max_gen = 100
+    [grid.params]                   # the param_grid: a list of values per parameter
+    POP_SIZE = [50, 100]
+    mutation = ["single_player_swap_2teams", "full_position_swap_2teams"]
+
+Operators and selection functions are given by name (a list of names is an adaptive
+operator, see run_algorithm). Modules are only imported by the commands that need them
+(a single run never imports pandas, tqdm, filelock or scipy); --timing prints the time
+spent importing them and running the command, and the heavy modules that were loaded.
+For a breakdown of the imports, run python -X importtime -m Operators.cli ...
+"""
+import time
+
+# Start of the CLI, before any project or third-party import
+_START = time.perf_counter()
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+# Parameters given by name in a config file, and the modules their values are looked up in
+OPERATOR_PARAMETERS = {
+    "mutation": "Operators.mutations",
+    "crossover": "Operators.crossovers",
+    "selection_algorithm": "Operators.selection",
+}
+# Modules each command imports (timed separately by --timing)
+COMMAND_MODULES = {
+    "run": ("Operators.genetic_algorithm",),
+    "grid": ("Operators.genetic_algorithm",),
+    "tune": ("Operators.tuning",),
+}
+# Third-party modules whose import --timing reports
+HEAVY_MODULES = ("numpy", "pandas", "scipy", "tqdm", "filelock", "matplotlib", "seaborn", "scikit_posthocs")
+
+
+def load_config(path):
+    """Read a JSON (.json) or TOML (.toml) config file into a dict."""
+    path = Path(path)
+    if path.suffix == ".toml":
+        import tomllib
+        with open(path, "rb") as f:
+            return tomllib.load(f)
+    if path.suffix == ".json":
+        with open(path) as f:
+            return json.load(f)
+    raise ValueError(f"Unknown config format {path.suffix!r}, expected .json or .toml.")
+
+
+def resolve_operator(parameter, value):
+    """
+    Function named `value` for an operator parameter of OPERATOR_PARAMETERS (a tuple of
+    functions for a list of names, run adaptively). Other values are returned as they are.
+    """
+    if parameter not in OPERATOR_PARAMETERS or callable(value):
+        return value
+    if isinstance(value, list):
+        return tuple(resolve_operator(parameter, name) for name in value)
+    import importlib
+    module = importlib.import_module(OPERATOR_PARAMETERS[parameter])
+    operator = getattr(module, value, None)
+    if not callable(operator):
+        raise ValueError(f"Unknown {parameter} {value!r} (looked up in {module.__name__}).")
+    return operator
+
+
+def _spec(config):
+    if "spec" not in config:
+        return None
+    from Operators.population import ProblemSpec
+    return ProblemSpec(**config["spec"])
+
+
+def run_command(config, output=None, verbose=False, seed=None):
+    """
+    One run_algorithm run of the [run] section. Returns the result as a dict. `seed`
+    (--seed) overrides every seed of the config.
+    """
+    from Operators.genetic_algorithm import run_algorithm
+    from Operators.population import load_players_from_csv
+
+    params = {key: resolve_operator(key, value) for key, value in config.get("run", {}).items()}
+    if seed is not None:
+        params["seed"] = seed
+    else:
+        params.setdefault("seed", config.get("seed"))
+    players = load_players_from_csv(config.get("data", "Data/players(in).csv"))
+    league, fitness, convergence = run_algorithm(players=players, spec=_spec(config), verbose=verbose, **params)
+
+    result = {
+        "fitness": fitness,
+        "stop_reason": convergence.stop_reason,
+        "generations": len(convergence),
+        "evaluations": convergence.evaluations,
+        "teams": [[player.name for player in team.players] for team in league.teams],
+        "convergence": list(convergence),
+    }
+    print(f"Best fitness: {fitness:.6f} ({result['stop_reason']} after {result['generations']} generations, "
+          f"{result['evaluations']} evaluations)")
+    if output is not None:
+        with open(output, "w") as f:
+            json.dump(result, f, indent=2)
+        print(f"Result saved to: {output}")
+    return result
+
+
+def grid_command(config, section="grid", seed=None):
+    """
+    run_grid_search (section "grid") or tune_grid_search (section "tune") of a config
+    section. `seed` (--seed) overrides every seed of the config.
+    """
+    options = dict(config.get(section, {}))
+    param_grid = {key: [resolve_operator(key, value) for value in values]
+                  for key, values in options.pop("params").items()}
+    if seed is not None:
+        options["seed"] = seed
+    else:
+        options.setdefault("seed", config.get("seed"))
+    options.setdefault("filepath", config.get("data", "Data/players(in).csv"))
+    if section == "tune":
+        from Operators.tuning import tune_grid_search
+        return tune_grid_search(param_grid, spec=_spec(config), **options)
+    from Operators.genetic_algorithm import run_grid_search
+    return run_grid_search(param_grid, spec=_spec(config), **options)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the GA, a grid search or a tuner from a config file.")
+    parser.add_argument("command", choices=("run", "grid", "tune"),
+                        help="run: one run ([run] section); grid: run_grid_search ([grid]); tune: tune_grid_search ([tune])")
+    parser.add_argument("config", help="JSON or TOML config file")
+    parser.add_argument("--seed", type=int, default=None, help="override the config's seeds (top-level and of the command's section)")
+    parser.add_argument("--output", default=None, help="run: write the result to this JSON file")
+    parser.add_argument("--verbose", action="store_true", help="run: print the best fitness of every generation")
+    parser.add_argument("--timing", action="store_true", help="print the startup and run times")
+    args = parser.parse_args(argv)
+
+    config = load_config(args.config)
+
+    import importlib
+    ready = time.perf_counter()
+    for module in COMMAND_MODULES[args.command]:
+        importlib.import_module(module)
+    start = time.perf_counter()
+    if args.command == "run":
+        run_command(config, args.output, args.verbose, args.seed)
+    else:
+        grid_command(config, args.command, args.seed)
+    end = time.perf_counter()
+
+    if args.timing:
+        loaded = [name for name in HEAVY_MODULES if name in sys.modules]
+        print(f"\nStartup: {ready - _START:.3f}s CLI and config, {start - ready:.3f}s imports; "
+              f"command: {end - start:.3f}s (total {end - _START:.3f}s)")
+        print(f"Heavy modules loaded: {', '.join(loaded) if loaded else 'none'}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
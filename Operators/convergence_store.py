@@ -0,0 +1,323 @@
+import json
+import zipfile
+from pathlib import Path
+
+import numpy as np
+
+from Operators.adaptive import is_operator_list, operator_name
+
+# pandas is imported by the readers only: writing a store does not need it
+
+# Name of the store written by run_grid_search in its output folder
+STORE_FILENAME = "convergence.npz"
+
+# Short names of config_label (genetic_algorithm.py) -> run_algorithm parameter names
+LABEL_KEYS = {"POP": "POP_SIZE", "XO": "xo_prob", "selection_alg": "selection_algorithm"}
+
+
+def encode_runs(convergences):
+    """
+    Run-length encode convergence curves: a fitness plateau of any length is stored as
+    one (start generation, value) pair.
+
+    Parameters:
+    -----------
+    convergences : list of 1-D sequences
+        Best fitness per generation of each run (runs may have different lengths).
+
+    Returns:
+    --------
+    tuple : (values, starts, plateaus, lengths)
+        Concatenated plateau values and start generations of all the runs, and the
+        number of plateaus and of generations of each run.
+    """
+    values, starts, plateaus, lengths = [], [], [], []
+    for curve in convergences:
+        curve = np.asarray(curve, dtype=float)
+        lengths.append(len(curve))
+        if not len(curve):
+            curve = np.array([np.nan])  # an empty run is stored as one undefined plateau
+        # A new plateau starts where the value changes (NaN never equals itself, so compare both)
+        changed = np.ones(len(curve), dtype=bool)
+        if len(curve) > 1:
+            same = (curve[1:] == curve[:-1]) | (np.isnan(curve[1:]) & np.isnan(curve[:-1]))
+            changed[1:] = ~same
+        run_starts = np.flatnonzero(changed)
+        values.append(curve[run_starts])
+        starts.append(run_starts)
+        plateaus.append(len(run_starts))
+    return (np.concatenate(values) if values else np.empty(0),
+            np.concatenate(starts).astype(np.int32) if starts else np.empty(0, dtype=np.int32),
+            np.array(plateaus, dtype=np.int64),
+            np.array(lengths, dtype=np.int32))
+
+
+def encode_run(convergence):
+    """
+    Run-length encode one run as soon as it finishes (see encode_runs), with its
+    stop_reason and evaluations: what ConvergenceStoreWriter.add_encoded needs of it, so
+    the full curve can be dropped.
+    """
+    values, starts, _, lengths = encode_runs([convergence])
+    return {"values": values, "starts": starts, "length": int(lengths[0]),
+            "stop_reason": getattr(convergence, "stop_reason", None) or "",
+            "evaluations": getattr(convergence, "evaluations", 0)}
+
+
+def decode_runs(values, starts, offsets, n_generations):
+    """
+    Expand run-length encoded runs into a (runs x n_generations) array in one np.repeat.
+    Runs shorter than n_generations are padded with their last value (a run that stopped
+    early keeps its best fitness).
+    """
+    n_runs = len(offsets) - 1
+    if n_runs == 0:
+        return np.empty((0, n_generations))
+    # Each plateau lasts until the next one starts, the last plateau of a run until n_generations
+    next_starts = np.empty_like(starts, dtype=np.int64)
+    next_starts[:-1] = starts[1:]
+    next_starts[offsets[1:] - 1] = n_generations
+    counts = next_starts - starts
+    return np.repeat(values, counts).reshape(n_runs, n_generations)
+
+
+def _serialize_params(run_params):
+    # Operators and selection functions are stored by name, like in the summary CSV
+    return {k: (operator_name(v) if callable(v) or is_operator_list(v) else v.item() if isinstance(v, np.generic) else v)
+            for k, v in run_params.items()}
+
+
+class ConvergenceStoreWriter:
+    """
+    Collect the convergence logs of a grid search and write them to one .npz file.
+
+    Each configuration is run-length encoded as soon as it is added, so only the plateaus
+    are kept in memory. The file holds the encoded runs, their offsets and lengths, and a
+    JSON table of the configurations' parameters. Members are stored uncompressed so that
+    ConvergenceStore can memory-map them. Configurations may have different numbers of
+    runs (e.g. the ones a racing tuner eliminated early).
+
+    Usage:
+    ------
+    with ConvergenceStoreWriter("fitness_logs/convergence.npz") as writer:
+        writer.add(run_params, convergences, label)
+        # or, with the runs encoded one by one as they finish:
+        writer.add_encoded(run_params, [encode_run(convergence) for convergence in convergences], label)
+    """
+    def __init__(self, path):
+        self.path = Path(path)
+        self.configs = []
+        self.labels = []
+        self._values, self._starts, self._plateaus, self._lengths = [], [], [], []
+        self._stop_reasons = []
+        self._evaluations = []
+        self.run_counts = []
+
+    def add(self, run_params, convergences, label=None):
+        """
+        Add the runs (list of best-fitness-per-generation curves) of one configuration.
+        The stop_reason and evaluations of Convergence lists returned by run_algorithm are stored too.
+        """
+        self.add_encoded(run_params, [encode_run(convergence) for convergence in convergences], label)
+
+    def add_encoded(self, run_params, runs, label=None):
+        """Add the runs of one configuration, each encoded by encode_run, in run order."""
+        self.run_counts.append(len(runs))
+        self._values.append(np.concatenate([run["values"] for run in runs]) if runs else np.empty(0))
+        self._starts.append(np.concatenate([run["starts"] for run in runs]) if runs else np.empty(0, dtype=np.int32))
+        self._plateaus.append(np.array([len(run["values"]) for run in runs], dtype=np.int64))
+        self._lengths.append(np.array([run["length"] for run in runs], dtype=np.int32))
+        self._stop_reasons.extend(run["stop_reason"] for run in runs)
+        self._evaluations.extend(run["evaluations"] for run in runs)
+        self.configs.append(_serialize_params(run_params))
+        self.labels.append(label if label is not None else str(len(self.labels)))
+
+    def close(self):
+        lengths = np.concatenate(self._lengths) if self._lengths else np.empty(0, dtype=np.int32)
+        # Offset of the first plateau of every run in the concatenated arrays
+        plateaus = np.concatenate(self._plateaus) if self._plateaus else np.empty(0, dtype=np.int64)
+        offsets = np.r_[0, np.cumsum(plateaus)].astype(np.int64)
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        np.savez(
+            self.path,
+            values=np.concatenate(self._values) if self._values else np.empty(0),
+            starts=np.concatenate(self._starts) if self._starts else np.empty(0, dtype=np.int32),
+            offsets=offsets,
+            lengths=lengths,
+            stop_reasons=np.array(self._stop_reasons, dtype=str),
+            evaluations=np.array(self._evaluations, dtype=np.int64),
+            runs=np.array(self.run_counts, dtype=np.int64),
+            shape=np.array([len(self.configs), max(self.run_counts, default=0),
+                            int(lengths.max()) if lengths.size else 0]),
+            labels=np.array(self.labels, dtype=str),
+            configs=np.array(json.dumps(self.configs)),
+        )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+
+
+def _memmap_npz(path):
+    """
+    Open the members of an uncompressed .npz as read-only memory maps (np.load ignores
+    mmap_mode for .npz files): each .npy member starts at a known offset of the zip file.
+    Compressed members are read into memory instead.
+    """
+    arrays = {}
+    with zipfile.ZipFile(path) as archive, open(path, "rb") as f:
+        for info in archive.infolist():
+            name = info.filename[:-4] if info.filename.endswith(".npy") else info.filename
+            if info.compress_type != zipfile.ZIP_STORED:
+                with archive.open(info) as member:
+                    arrays[name] = np.lib.format.read_array(member, allow_pickle=False)
+                continue
+            # Local file header: 30 bytes, then the file name and the extra field
+            f.seek(info.header_offset + 26)
+            name_length, extra_length = np.frombuffer(f.read(4), dtype="<u2")
+            f.seek(info.header_offset + 30 + int(name_length) + int(extra_length))
+            version = np.lib.format.read_magic(f)
+            if version == (1, 0):
+                shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(f)
+            else:
+                shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(f)
+            if dtype.hasobject:
+                raise ValueError(f"Member {name} holds Python objects and cannot be memory-mapped.")
+            if not shape or 0 in shape:
+                arrays[name] = np.fromfile(f, dtype=dtype, count=int(np.prod(shape))).reshape(shape)
+            else:
+                arrays[name] = np.memmap(path, dtype=dtype, mode="r", offset=f.tell(), shape=shape,
+                                         order="F" if fortran_order else "C")
+    return arrays
+
+
+class ConvergenceStore:
+    """
+    Read-only view of a convergence store written by ConvergenceStoreWriter.
+
+    The file is memory-mapped when opened: nothing but the configuration table is read
+    until a configuration is asked for, and `fitness` decodes every run in one pass.
+
+    Attributes:
+    -----------
+    configs : pd.DataFrame
+        One row per configuration with its parameters, in grid order ("label" column:
+        name of the configuration, as the former CSV file names).
+    shape : tuple
+        (configurations, runs, generations); runs is the largest number of runs of a
+        configuration
+    run_counts : np.ndarray
+        Number of runs of every configuration. When they differ (`ragged`), read the
+        configurations one by one with config_runs: `fitness` needs the same number of runs
+        for all of them, and the per-run tables are padded (0 or "").
+    """
+    def __init__(self, path):
+        self.path = Path(path)
+        self._arrays = _memmap_npz(self.path)
+        self.shape = tuple(int(n) for n in self._arrays["shape"])
+        self.labels = [str(label) for label in self._arrays["labels"]]
+        import pandas as pd
+
+        self.configs = pd.DataFrame(json.loads(str(self._arrays["configs"])))
+        self.configs.insert(0, "label", self.labels)
+        # Stores written before ragged configurations hold n_runs runs for every configuration
+        self.run_counts = np.asarray(self._arrays["runs"]) if "runs" in self._arrays else \
+                          np.full(self.shape[0], self.shape[1], dtype=np.int64)
+        self.ragged = bool((self.run_counts != self.shape[1]).any())
+        self._first_run = np.r_[0, np.cumsum(self.run_counts)].astype(np.int64)
+        self._fitness = None
+
+    def __len__(self):
+        return self.shape[0]
+
+    @property
+    def fitness(self):
+        """Dense (configurations x runs x generations) array of the best fitness, decoded once."""
+        if self.ragged:
+            raise ValueError("Configurations have different numbers of runs: read them with config_runs.")
+        if self._fitness is None:
+            n_configs, n_runs, n_generations = self.shape
+            runs = decode_runs(self._arrays["values"], self._arrays["starts"],
+                               self._arrays["offsets"], n_generations)
+            self._fitness = runs.reshape(n_configs, n_runs, n_generations)
+        return self._fitness
+
+    @property
+    def run_lengths(self):
+        """(configurations x runs) number of generations each run actually ran."""
+        return self._per_run(self._arrays["lengths"], 0)
+
+    @property
+    def stop_reasons(self):
+        """(configurations x runs) reason each run stopped ("" when unknown)."""
+        if "stop_reasons" not in self._arrays:
+            return np.full(self.shape[:2], "")
+        return self._per_run(self._arrays["stop_reasons"], "")
+
+    @property
+    def evaluations(self):
+        """(configurations x runs) fitness evaluations of each run (0 when unknown)."""
+        if "evaluations" not in self._arrays:
+            return np.zeros(self.shape[:2], dtype=np.int64)
+        return self._per_run(self._arrays["evaluations"], 0)
+
+    def _per_run(self, values, fill):
+        # (configurations x runs) table of one value per run, padded after the last run of each configuration
+        values = np.asarray(values)
+        if not self.ragged:
+            return values.reshape(self.shape[:2])
+        table = np.full(self.shape[:2], fill, dtype=values.dtype)
+        table[np.arange(self.shape[1]) < self.run_counts[:, None]] = values
+        return table
+
+    def config_runs(self, config):
+        """(runs x generations) array of one configuration, given by index or label."""
+        idx = self.labels.index(config) if isinstance(config, str) else config
+        if self._fitness is not None:
+            return self._fitness[idx]
+        offsets = np.asarray(self._arrays["offsets"][self._first_run[idx]: self._first_run[idx + 1] + 1])
+        first, last = offsets[0], offsets[-1]
+        return decode_runs(self._arrays["values"][first:last], self._arrays["starts"][first:last],
+                           offsets - first, self.shape[2])
+
+    def to_dataframes(self):
+        """{label: DataFrame (runs x generations)}, the format of load_fitness_logs."""
+        import pandas as pd
+
+        if self.ragged:
+            return {label: pd.DataFrame(self.config_runs(i)) for i, label in enumerate(self.labels)}
+        return {label: pd.DataFrame(self.fitness[i]) for i, label in enumerate(self.labels)}
+
+
+def parse_config_label(label):
+    """Parameters of a configuration from its config_label ("POP=100 XO=0.9 ...")."""
+    params = {}
+    for part in label.split():
+        key, _, value = part.partition("=")
+        key = LABEL_KEYS.get(key, key)
+        try:
+            params[key] = json.loads(value.lower() if value in ("True", "False") else value)
+        except json.JSONDecodeError:
+            params[key] = value
+    return params
+
+
+def convert_csv_logs(folder_path, store_path=None):
+    """
+    Pack a folder of per-configuration convergence CSVs (the former run_grid_search output)
+    into one store, with the parameters parsed from the file names. Returns the store path.
+    """
+    import pandas as pd
+
+    folder_path = Path(folder_path)
+    store_path = Path(store_path) if store_path is not None else folder_path / STORE_FILENAME
+    with ConvergenceStoreWriter(store_path) as writer:
+        for file in sorted(folder_path.glob("*.csv")):
+            runs = pd.read_csv(file)
+            convergences = [row[~np.isnan(row)] for row in runs.to_numpy(dtype=float)]
+            writer.add(parse_config_label(file.stem), convergences, file.stem)
+    return store_path
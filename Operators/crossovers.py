@@ -1,6 +1,6 @@
-from copy import deepcopy
 import random
-from Operators.population import League
+import numpy as np
+from Operators.population import League, POSITIONS
 
 def crossover_swap_whole_position(league1, league2):
     """
@@ -55,44 +55,39 @@ def crossover_swap_whole_position(league1, league2):
         A tuple containing the two child leagues after the crossover. Each child league contains a mix of players at the 
         selected position swapped between corresponding teams.
     """
-    # Deep copy leagues to avoid altering the originals
-    child1 = deepcopy(league1)
-    child2 = deepcopy(league2)
+    # Copy the leagues to avoid altering the originals (the genomes are copied on the first write)
+    child1 = league1.copy()
+    child2 = league2.copy()
 
-    positions = ['GK', 'DEF', 'MID', 'FWD']
-    chosen_pos = random.choice(positions)
+    chosen_pos = random.choice(league1.spec.positions)
     #print(f"Swapping all players at position: {chosen_pos}")
 
-    for t1, t2 in zip(child1.teams, child2.teams):
-        # Get players by position from both teams
-        p1 = [p for p in t1.players if p.position == chosen_pos]
-        p2 = [p for p in t2.players if p.position == chosen_pos]
+    for t in range(min(len(child1.genome), len(child2.genome))):
+        # Get the slots of that position in both teams
+        p1 = child1.position_slots(t, chosen_pos)
+        p2 = child2.position_slots(t, chosen_pos)
 
         # Skip if either team lacks players at the selected position
-        if not p1 or not p2:
+        if not p1.size or not p2.size:
             #print(f"One of the teams lacks players at {chosen_pos}. Skipping swap for this pair.")
             continue
 
         # Make sure the numbers match, swap only as many players as available in both teams
-        min_len = min(len(p1), len(p2))
+        min_len = min(p1.size, p2.size)
+        p1, p2 = p1[:min_len], p2[:min_len]
 
         # Swap equal number of players for the selected position
-        for i in range(min_len):
-            player1 = p1[i]
-            player2 = p2[i]
-
-            # Replace by identity to avoid name conflicts
-            def replace_player(team, old_p, new_p):
-                team.players = [new_p if p is old_p else p for p in team.players]
-
-            replace_player(t1, player1, player2)
-            replace_player(t2, player2, player1)
+        genome1, genome2 = child1.own_genome(), child2.own_genome()
+        genome1[t, p1], genome2[t, p2] = genome2[t, p2], genome1[t, p1]
+        child1.mark_dirty(t)
+        child2.mark_dirty(t)
 
     return child1, child2
 
 def crossover_swap_extreme_player(
     parent1: League,
-    parent2: League
+    parent2: League,
+    repair=None
 ) -> tuple[League | None, League | None]:
     """
     Perform a crossover by swapping the most "extreme" player in a single position-block
@@ -118,8 +113,8 @@ def crossover_swap_extreme_player(
         First parent league.
     parent2 : League
         Second parent league.
-    cross_prob : float
-        Probability of performing the crossover (0.0 to 1.0).
+    repair : Repair, optional
+        Repairs a child over the salary cap instead of returning None for it.
 
     Returns:
     --------
@@ -130,20 +125,21 @@ def crossover_swap_extreme_player(
     """
 
     # 2) Pick position
-    position = random.choice(["GK", "DEF", "MID", "FWD"])
+    position = random.choice(parent1.spec.positions)
+    code = POSITIONS.index(position)
 
     # 3) Find extreme in each parent
     def find_extreme(league):
-        best = None  # (team_idx, player, deviation)
-        for ti, team in enumerate(league.teams):
-            block = [p for p in team.players if p.position == position]
-            if not block:
+        best = None  # (team_idx, player_idx, deviation)
+        for ti, genes in enumerate(league.genome):
+            block = genes[league.roster.position[genes] == code]
+            if not block.size:
                 continue
-            avg = sum(p.skill for p in block) / len(block)
-            for p in block:
-                dev = abs(p.skill - avg)
-                if best is None or dev > best[2]:
-                    best = (ti, p, dev)
+            skills = league.roster.skill[block]
+            devs = np.abs(skills - skills.mean())
+            i = np.argmax(devs)
+            if best is None or devs[i] > best[2]:
+                best = (ti, block[i], devs[i])
         return best
 
     ex1 = find_extreme(parent1)
@@ -153,41 +149,30 @@ def crossover_swap_extreme_player(
     ti1, ply1, _ = ex1
     ti2, ply2, _ = ex2
 
-    # 4) Clone parents
-    child1, child2 = deepcopy(parent1), deepcopy(parent2)
+    # 4) Clone parents (copy on write: the genomes are copied by the swap below)
+    child1, child2 = parent1.copy(), parent2.copy()
 
     # 5) In-place swap in each child to avoid duplicates
     def swap_in_child(child, pA, pB):
-        # find pA and pB in child
-        locA = next((ti, i)
-                    for ti, team in enumerate(child.teams)
-                    for i, p in enumerate(team.players)
-                    if p.name == pA.name)
-        locB = next((ti, i)
-                    for ti, team in enumerate(child.teams)
-                    for i, p in enumerate(team.players)
-                    if p.name == pB.name)
-        tiA, iA = locA
-        tiB, iB = locB
-        child.teams[tiA].players[iA], child.teams[tiB].players[iB] = \
-            child.teams[tiB].players[iB], child.teams[tiA].players[iA]
-
-    swap_in_child(child1, ply1, ply2)
-    swap_in_child(child2, ply2, ply1)
-
-    # 6) Validate
-    def validate(child):
-        try:
-            for t in child.teams:
-                t.validate_team()
-            child.validate_league()
-            return True
-        except ValueError:
+        # find the first slot of pA and pB in child
+        locA = np.argwhere(child.genome == pA)
+        locB = np.argwhere(child.genome == pB)
+        if not len(locA) or not len(locB):
             return False
+        (tiA, iA), (tiB, iB) = locA[0], locB[0]
+        genome = child.own_genome()
+        genome[tiA, iA], genome[tiB, iB] = pB, pA
+        child.mark_dirty(tiA, tiB)
+        return True
 
-    valid1 = validate(child1)
-    valid2 = validate(child2)
+    # 6) Validate
+    swapped1 = swap_in_child(child1, ply1, ply2)
+    swapped2 = swap_in_child(child2, ply2, ply1)
+    if repair is not None:
+        child1 = repair(child1) if swapped1 and not child1.is_valid() else child1
+        child2 = repair(child2) if swapped2 and not child2.is_valid() else child2
+    valid1 = swapped1 and child1 is not None and child1.is_valid()
+    valid2 = swapped2 and child2 is not None and child2.is_valid()
 
     return (child1 if valid1 else None,
             child2 if valid2 else None)
-
@@ -1,31 +1,45 @@
-import matplotlib.pyplot as plt
-import seaborn as sns
+import numpy as np
 import pandas as pd
 import os 
 from pathlib import Path
-from scipy.stats import friedmanchisquare
-import scikit_posthocs as sp
+# matplotlib, seaborn, scipy and scikit_posthocs are imported by the plots and tests that
+# use them, so that loading results does not pay for them
+from Operators.results import GridSearchResults, load_results
 
 # Loading the data from csv files
 
 def load_fitness_logs(folder_path):
     """
-    Load all .csv files from the given folder and organize them into a dictionary
-    where keys are configuration names and values are DataFrames (30xN generations).
-    """
-    fitness_dfs = {}
-
-    for file in Path(folder_path).glob("*.csv"):
-        config_name = file.stem  # filename without extension
-        df = pd.read_csv(file)
-        fitness_dfs[config_name] = df
+    Load the convergence logs of a grid search into a dictionary where keys are
+    configuration names and values are DataFrames (30xN generations).
 
+    The logs are read from the folder's convergence store (convergence.npz) in one go
+    when there is one, and from the one-CSV-per-configuration files otherwise.
+    To load a grid search once for several plots and tests, use load_results instead.
+    """
+    fitness_dfs = load_results(folder_path).to_dataframes()
     print(f"Loaded {len(fitness_dfs)} configurations from '{folder_path}'")
     return fitness_dfs
 
+def as_results(data):
+    """
+    Accept the results of a grid search in any of the forms the functions below take:
+    a GridSearchResults (used as is), a dict of DataFrames from load_fitness_logs, or the
+    path of an output folder (loaded once here).
+    """
+    if isinstance(data, GridSearchResults):
+        return data
+    if isinstance(data, dict):
+        return GridSearchResults.from_dataframes(data)
+    return load_results(data)
+
 # Plots 
 
 def plot_median_fitness_over_gen(fitness_dfs: dict[str, pd.DataFrame],ncol=3):
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+
+    results = as_results(fitness_dfs)
     sns.set(style="whitegrid", font_scale=1.2)
 
     fig = plt.figure(figsize=(22, 20))
@@ -34,11 +48,10 @@ def plot_median_fitness_over_gen(fitness_dfs: dict[str, pd.DataFrame],ncol=3):
     ax = fig.add_subplot(gs[0])
     handles, labels = [], []
 
-    for config_name, df in fitness_dfs.items():
-        median_fitness = df.median(axis=0)
-        x = range(df.shape[1])
+    for config_name, median_fitness in zip(results.labels, results.median_curves):
+        x = range(len(median_fitness))
 
-        line, = ax.plot(x, median_fitness.values, label=config_name)
+        line, = ax.plot(x, median_fitness, label=config_name)
         handles.append(line)
         labels.append(config_name)
 
@@ -64,34 +77,24 @@ def plot_median_fitness_over_gen(fitness_dfs: dict[str, pd.DataFrame],ncol=3):
 
 
 def plot_median_fitness_by_operator(folder_path):
-    crossover_medians = {}
-    mutation_medians = {}
-    selection_medians = {}
-
-    for file in Path(folder_path).glob("*.csv"):
-        config_name = file.stem
-        df = pd.read_csv(file)
-        median_curve = df.median(axis=0).values
-
-      
-        parts = config_name.split()
-        crossover = [p.split('=')[1] for p in parts if "crossover" in p][0]
-        mutation = [p.split('=')[1] for p in parts if "mutation" in p][0]
-        selection = [p.split('=')[1] for p in parts if "selection_alg" in p][0]
-
-        crossover_medians.setdefault(crossover, []).append(median_curve)
-        mutation_medians.setdefault(mutation, []).append(median_curve)
-        selection_medians.setdefault(selection, []).append(median_curve)
-
-    # Convert to median-of-medians
-    crossover_curves = {k: pd.DataFrame(v).median(axis=0) for k, v in crossover_medians.items()}
-    mutation_curves = {k: pd.DataFrame(v).median(axis=0) for k, v in mutation_medians.items()}
-    selection_curves = {k: pd.DataFrame(v).median(axis=0) for k, v in selection_medians.items()}
+    """
+    Plot, for each crossover, mutation and selection operator, the median over its
+    configurations of their median fitness curves. `folder_path` may also be the
+    GridSearchResults of the grid search.
+    """
+    import matplotlib.pyplot as plt
+
+    results = as_results(folder_path)
+
+    # Median-of-medians, grouped by operator
+    crossover_curves = results.group_median_curves("crossover")
+    mutation_curves = results.group_median_curves("mutation")
+    selection_curves = results.group_median_curves("selection_algorithm")
 
     # Plot crossover
     plt.figure(figsize=(10, 5))
     for name, curve in crossover_curves.items():
-        plt.plot(curve.index, curve.values, label=name)
+        plt.plot(range(len(curve)), curve, label=name)
     plt.title("Median Fitness by Crossover Operator")
     plt.xlabel("Generation")
     plt.ylabel("Fitness")
@@ -102,7 +105,7 @@ def plot_median_fitness_by_operator(folder_path):
     # Plot mutation
     plt.figure(figsize=(10, 5))
     for name, curve in mutation_curves.items():
-        plt.plot(curve.index, curve.values, label=name)
+        plt.plot(range(len(curve)), curve, label=name)
     plt.title("Median Fitness by Mutation Operator")
     plt.xlabel("Generation")
     plt.ylabel("Fitness")
@@ -113,7 +116,7 @@ def plot_median_fitness_by_operator(folder_path):
     # Plot selection
     plt.figure(figsize=(10, 5))
     for name, curve in selection_curves.items():
-        plt.plot(curve.index, curve.values, label=name)
+        plt.plot(range(len(curve)), curve, label=name)
     plt.title("Median Fitness by Selection Operator")
     plt.xlabel("Generation")
     plt.ylabel("Fitness")
@@ -131,15 +134,17 @@ def plot_top_configs(summary_path,
 
     Parameters:
     - summary_path (str): Path to ga_summary.csv
-    - fitness_log_folder (str): Path to folder with individual convergence .csvs
+    - fitness_log_folder (str): Path to the grid search output folder (or its GridSearchResults)
     - top_n (int): Number of top configurations to plot
     - metric (str): One of 'median_fitness', 'mean_fitness', 'std_fitness', 'min_fitness', 'max_fitness'
     """
+    import matplotlib.pyplot as plt
 
     assert metric in ["median_fitness", "mean_fitness", "std_fitness", "min_fitness", "max_fitness"], \
         f"Invalid metric '{metric}'."
 
-    summary_df = pd.read_csv(summary_path)
+    results = as_results(fitness_log_folder)
+    summary_df = results.summary if results.summary_path == summary_path else pd.read_csv(summary_path)
 
     if metric == "std_fitness":
         top_configs = summary_df.nsmallest(top_n, metric)  
@@ -150,25 +155,16 @@ def plot_top_configs(summary_path,
     handles, labels = [], []
 
     for _, row in top_configs.iterrows():
-        config_label = (
-            f"POP={row['POP_SIZE']} "
-            f"XO={row['xo_prob']} "
-            f"mut_prob={row['mut_prob']} "
-            f"mutation={row['mutation']} "
-            f"crossover={row['crossover']} "
-            f"selection_alg={row['selection_algorithm']} "
-            f"elitism={row['elitism']}"
-        )
-
-        filepath = Path(fitness_log_folder) / f"{config_label}.csv"
-        if filepath.exists():
-            df = pd.read_csv(filepath)
-            curve = df.median(axis=0) if metric == "median_fitness" else df.mean(axis=0)
-            line, = plt.plot(curve.values, label=config_label, linewidth=2)
+        # Find the configuration by its hyperparameters rather than by file name
+        i = results.lookup(row)
+        if i is not None:
+            config_label = results.labels[i]
+            curve = results.median_curves[i] if metric == "median_fitness" else results.mean_curves[i]
+            line, = plt.plot(curve, label=config_label, linewidth=2)
             handles.append(line)
             labels.append(config_label)
         else:
-            print(f"Missing file: {filepath}")
+            print(f"Missing convergence log for: {row.to_dict()}")
 
     plt.title(f"{metric.replace('_', ' ').capitalize()} of Top {top_n} Configurations")
     plt.xlabel("Generation")
@@ -183,22 +179,16 @@ def plot_top_configs(summary_path,
 
 
 def plot_best_fitness_boxplot(fitness_folder, title="Best Fitness Distribution (Per Run)"):
-    data = []
-
-    for file in Path(fitness_folder).glob("*.csv"):
-        config_label = file.stem
-        df = pd.read_csv(file)
-
+    import matplotlib.pyplot as plt
+    import seaborn as sns
 
-        best_per_run = df.min(axis=1).values
+    results = as_results(fitness_folder)
 
-        for value in best_per_run:
-            data.append({
-                'value': value,
-                'group': config_label
-            })
-
-    df_long = pd.DataFrame(data)
+    # Long format: one row per run, from the cached best fitness of every run
+    df_long = pd.DataFrame({
+        'value': np.concatenate(results.best_per_run),
+        'group': np.repeat(results.labels, results.n_runs),
+    })
 
 
     sns.set_theme(style="whitegrid", palette="pastel", font_scale=1.2)
@@ -221,21 +211,25 @@ def plot_best_fitness_boxplot(fitness_folder, title="Best Fitness Distribution (
 
 
 # Running friedman test on best fitness from each run
-def run_friedman_test_on_best_fitness(fitness_dfs: dict):
+def run_friedman_test_on_best_fitness(fitness_dfs: dict, n_runs=30):
     """
     Run Friedman test across all loaded configurations using the best (lowest) fitness
-    achieved in each run, not just the last generation.
+    achieved in each run, not just the last generation. `fitness_dfs` may be the dict of
+    load_fitness_logs, a GridSearchResults or an output folder; configurations without
+    exactly n_runs runs are skipped.
     """
+    from scipy.stats import friedmanchisquare
+
+    results = as_results(fitness_dfs)
     best_fitnesses = []
     labels = []
 
-    for config_label, df in fitness_dfs.items():
-        if df.shape[0] != 30:
-            print(f"Skipping {config_label}: only {df.shape[0]} runs (expected 30)")
+    # Best (min) fitness of each run, cached by the results
+    for config_label, best_per_run in zip(results.labels, results.best_per_run):
+        if len(best_per_run) != n_runs:
+            print(f"Skipping {config_label}: only {len(best_per_run)} runs (expected {n_runs})")
             continue
-        
-        # Get the best (min) fitness from each run 
-        best_per_run = df.min(axis=1)
+
         best_fitnesses.append(best_per_run)
         labels.append(config_label)
 
@@ -259,6 +253,7 @@ def run_posthoc_nemenyi_from_best_fitness(labels, best_fitnesses):
     """
     Perform post-hoc Nemenyi test using results from Friedman test (best fitness per run).
     """
+    import scikit_posthocs as sp
 
     # Convert to DataFrame: rows = runs, columns = configurations
     df_scores = pd.DataFrame({label: scores for label, scores in zip(labels, best_fitnesses)})
@@ -276,6 +271,9 @@ def run_posthoc_nemenyi_from_best_fitness(labels, best_fitnesses):
     return posthoc
 
 def plot_posthoc_heatmap(posthoc_df, title="Post-hoc Nemenyi Test (p-values)"):
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+
     plt.figure(figsize=(10, 8))
     sns.heatmap(posthoc_df, annot=True, cmap="coolwarm", fmt=".3f", linewidths=0.5)
     plt.title(title)
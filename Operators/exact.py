@@ -0,0 +1,211 @@
+import time
+import numpy as np
+import pandas as pd
+from scipy.optimize import milp, LinearConstraint, Bounds
+from scipy.sparse import lil_matrix
+
+from Operators.genetic_algorithm import run_algorithm
+from Operators.population import *
+
+
+def build_milp(roster, spec=None):
+    """
+    Mixed-integer linear program of the league problem over a roster whose players all
+    have to be placed (as in Data/players(in).csv) and have integer skills.
+
+    Variables:
+    - x[p, t] = 1 if player p plays in team t
+    - z[t, v] = 1 if the skill sum of team t equals v, for every reachable sum v
+
+    Every player plays once, every team has its formation and fits in the salary cap, and
+    the team skill sums are sorted (s_1 <= s_2 <= ... <= s_T) so that the T! relabellings
+    of a league are not all explored. The total skill is fixed, so minimizing the standard
+    deviation of the team averages is minimizing the sum of squared team sums, sum(v^2 z[t, v]).
+
+    Returns:
+    --------
+    tuple : (c, integrality, bounds, constraints, values)
+        The arguments of scipy.optimize.milp, and the team sums v of the z columns.
+    """
+    spec = spec if spec is not None else DEFAULT_SPEC
+    n_players, n_teams = len(roster), spec.num_teams
+    if n_players != spec.num_players:
+        raise ValueError(f"The exact model places every player: the roster has {n_players} players, "
+                         f"the league {spec.num_players}.")
+    skill = roster.skill
+    if not np.array_equal(skill, np.round(skill)):
+        raise ValueError("The exact model needs integer skills.")
+    skill = skill.astype(int)
+
+    # Reachable team skill sums: from the weakest to the strongest possible formation
+    low = high = 0
+    for code, count in enumerate(spec.formation_counts):
+        skills = np.sort(skill[roster.position == code])
+        if count > len(skills):
+            raise ValueError(f"Not enough {POSITIONS[code]} players for one team.")
+        low += skills[:count].sum()
+        high += skills[len(skills) - count:].sum()
+    values = np.arange(low, high + 1)
+    n_values = len(values)
+
+    n_x = n_players * n_teams
+    n_vars = n_x + n_teams * n_values
+    x = lambda p, t: p * n_teams + t
+    z = lambda t, k: n_x + t * n_values + k
+
+    rows = []           # (coefficients {column: value}, lower bound, upper bound)
+    # 1) Every player plays exactly once
+    for p in range(n_players):
+        rows.append(({x(p, t): 1 for t in range(n_teams)}, 1, 1))
+    for t in range(n_teams):
+        # 2) Formation of every team
+        for code, count in enumerate(spec.formation_counts):
+            rows.append(({x(p, t): 1 for p in np.flatnonzero(roster.position == code)}, count, count))
+        # 3) Salary cap
+        rows.append(({x(p, t): roster.cost[p] for p in range(n_players)}, -np.inf, spec.salary_cap))
+        # 4) The team skill sum is the value picked by z
+        link = {x(p, t): skill[p] for p in range(n_players)}
+        link.update({z(t, k): -v for k, v in enumerate(values)})
+        rows.append((link, 0, 0))
+        # 5) Exactly one value per team
+        rows.append(({z(t, k): 1 for k in range(n_values)}, 1, 1))
+        # 6) Symmetry breaking: team sums in increasing order
+        if t + 1 < n_teams:
+            order = {z(t, k): v for k, v in enumerate(values)}
+            order.update({z(t + 1, k): -v for k, v in enumerate(values)})
+            rows.append((order, -np.inf, 0))
+
+    A = lil_matrix((len(rows), n_vars))
+    lower, upper = np.empty(len(rows)), np.empty(len(rows))
+    for i, (coefficients, lb, ub) in enumerate(rows):
+        for column, value in coefficients.items():
+            A[i, column] = value
+        lower[i], upper[i] = lb, ub
+
+    c = np.zeros(n_vars)
+    c[n_x:] = np.tile(values.astype(float) ** 2, n_teams)
+    # Players of unknown positions cannot be placed
+    upper_bounds = np.ones(n_vars)
+    for p in np.flatnonzero(roster.position < 0):
+        upper_bounds[[x(p, t) for t in range(n_teams)]] = 0
+    return c, np.ones(n_vars), Bounds(0, upper_bounds), LinearConstraint(A.tocsr(), lower, upper), values
+
+
+def _std_from_square_sum(square_sum, total_skill, spec):
+    # Standard deviation of the team averages from the sum of squared team skill sums
+    n_teams, team_size = spec.num_teams, spec.team_size
+    mean = total_skill / (n_teams * team_size)
+    return max(square_sum / (n_teams * team_size ** 2) - mean ** 2, 0.0) ** 0.5
+
+
+def solve_exact(filepath=None, players=None, spec=None, time_limit=None, mip_rel_gap=None, verbose=False):
+    """
+    Solve the league problem exactly with scipy.optimize.milp (HiGHS branch and bound).
+
+    Returns a provably optimal League, or, when time_limit (seconds) runs out first, the
+    best league found together with a lower bound on the optimal fitness. The optimum is
+    a natural target_fitness for run_algorithm, which then stops as soon as it is reached.
+
+    Parameters:
+    -----------
+    filepath : str, optional
+        Players CSV, read with load_players_from_csv unless `players` is given.
+    spec : ProblemSpec, optional
+        Problem to solve (DEFAULT_SPEC when not given).
+    mip_rel_gap : float, optional
+        Stop once the relative gap between the best league and the bound is below this.
+
+    Returns:
+    --------
+    tuple : (League | None, float, dict)
+        The best league (None if none was found), its fitness, and a report: "status"
+        (the solver message), "optimal", "lower_bound" (on the fitness), "gap"
+        (fitness - lower_bound) and "seconds".
+    """
+    spec = spec if spec is not None else DEFAULT_SPEC
+    if players is None:
+        players = load_players_from_csv(filepath)
+    roster = Roster(players)
+
+    start = time.perf_counter()
+    c, integrality, bounds, constraints, values = build_milp(roster, spec)
+    options = {"disp": verbose}
+    if time_limit is not None:
+        options["time_limit"] = time_limit
+    if mip_rel_gap is not None:
+        options["mip_rel_gap"] = mip_rel_gap
+    result = milp(c, integrality=integrality, bounds=bounds, constraints=constraints, options=options)
+    seconds = time.perf_counter() - start
+
+    total_skill = roster.skill.sum()
+    # The solver's bound, never weaker than the counting bound of fitness_lower_bound
+    dual_bound = getattr(result, "mip_dual_bound", None)
+    lower_bound = fitness_lower_bound(roster, spec)
+    if dual_bound is not None and np.isfinite(dual_bound):
+        lower_bound = max(lower_bound, _std_from_square_sum(dual_bound, total_skill, spec))
+
+    league, fitness = None, spec.invalid_fitness
+    if result.x is not None:
+        n_x = len(roster) * spec.num_teams
+        assignment = result.x[:n_x].reshape(len(roster), spec.num_teams) > 0.5
+        # Players of each team in formation order (GK, DEF, ..., FWD)
+        genome = np.array([sorted(np.flatnonzero(assignment[:, t]), key=lambda p: roster.position[p])
+                           for t in range(spec.num_teams)], dtype=GENE_DTYPE)
+        league = League.from_genome(roster, genome, spec=spec)
+        fitness = calculate_fitness(league)
+
+    optimal = result.status == 0
+    if optimal:
+        lower_bound = fitness
+    report = {
+        "status": result.message,
+        "optimal": optimal,
+        "lower_bound": lower_bound,
+        "gap": fitness - lower_bound if league is not None else np.inf,
+        "seconds": seconds,
+    }
+    return league, fitness, report
+
+
+def time_to_optimal(filepath=None, players=None, spec=None, n_runs=10, max_gen=1000, seed=0,
+                    time_limit=None, **ga_params):
+    """
+    Time-to-optimal benchmark of the GA: solve the problem exactly, then run the GA n_runs
+    times with the optimum as target_fitness, so that every run stops as soon as it hits it.
+
+    Parameters:
+    -----------
+    time_limit : float, optional
+        Seconds given to the exact solver; when it runs out, the runs target the best
+        league it found (not proven optimal). ValueError if it found none.
+    ga_params :
+        Other parameters of run_algorithm (POP_SIZE, mutation, crossover, ...).
+
+    Returns:
+    --------
+    tuple : (float, pd.DataFrame)
+        The target fitness, and one row per run: seed, whether it reached the target,
+        generations, fitness evaluations and seconds until it stopped, and its best fitness.
+    """
+    spec = spec if spec is not None else DEFAULT_SPEC
+    if players is None:
+        players = load_players_from_csv(filepath)
+    league, optimum, report = solve_exact(players=players, spec=spec, time_limit=time_limit)
+    if league is None:
+        raise ValueError(f"The exact solver found no league to target: {report['status']}")
+
+    rows = []
+    for run in range(n_runs):
+        start = time.perf_counter()
+        _, fitness, convergence = run_algorithm(players=players, spec=spec, max_gen=max_gen, seed=seed + run,
+                                                target_fitness=optimum, **ga_params)
+        rows.append({
+            "seed": seed + run,
+            # The run may stop on another criterion (e.g. stop_at_bound) as it reaches the target
+            "reached": fitness <= optimum + 1e-9,
+            "generations": convergence.stop_generation,
+            "evaluations": convergence.evaluations,
+            "seconds": time.perf_counter() - start,
+            "best_fitness": fitness,
+        })
+    return optimum, pd.DataFrame(rows)
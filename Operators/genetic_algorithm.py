@@ -1,21 +1,27 @@
 #System libraries
 import sys
 import os
-from copy import deepcopy
-from inspect import getsource
-import pandas as pd
+import time
 from pathlib import Path
 from datetime import datetime
-from filelock import FileLock
 from itertools import product
-from tqdm import tqdm
+from collections import Counter
+from contextlib import nullcontext
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+# pandas, filelock and tqdm are imported by the functions that log or run grids, so
+# that a single run (see Operators.cli) does not pay for them
 
 
 # Project libraries
 from Operators.mutations import single_player_swap_2teams, single_player_shift_all_teams, full_position_swap_2teams
 from Operators.crossovers import crossover_swap_whole_position, crossover_swap_extreme_player
-from Operators.selection import roulette_selection, tournament_selection, stochastic_selection
+from Operators.selection import roulette_selection, tournament_selection, stochastic_selection, select_parent_indices
 from Operators.population import *
+from Operators.convergence_store import ConvergenceStoreWriter, STORE_FILENAME, encode_run, decode_runs
+from Operators.streaming import StreamingSummary
+from Operators.instrumentation import profiled
+from Operators.local_search import hill_climb, LOCAL_SEARCH_TARGETS
+from Operators.adaptive import AdaptiveOperator, is_operator_list, operator_name
 
 
 sys.path.append(os.path.abspath(".."))
@@ -39,6 +45,9 @@ def log_run_results(
     best_fitness  : float  best fitness found in the run
     csv_path      : str    path to the CSV log file
     """
+    import pandas as pd
+    from filelock import FileLock
+
     # 1) Build a one-row DataFrame
     row = {**run_params,
            "best_fitness": best_fitness,
@@ -61,142 +70,690 @@ def log_run_results(
             index=False
         )
 
-def run_algorithm(
-    filepath,
-    log_path="ga_runs.csv",
-    POP_SIZE=50,
-    max_gen=100,
+def _timed(instrumentation, phase, function, *args):
+    """Call function(*args), timed as `phase` when an Instrumentation is given."""
+    if instrumentation is None:
+        return function(*args)
+    with instrumentation.phase(phase):
+        return function(*args)
+
+def breed(first_ind, second_ind, crossover=crossover_swap_whole_position, xo_prob=0.8, instrumentation=None):
+    """
+    Two children of two parents: the crossover's offspring with probability xo_prob,
+    copies of the parents otherwise or when the crossover returns no pair. A child the
+    crossover rejects as invalid is None.
+    """
+    if random.random() < xo_prob:
+        offspring_pair = _timed(instrumentation, "crossover", crossover, first_ind, second_ind)
+        paired = offspring_pair and len(offspring_pair) == 2
+        if instrumentation is not None:
+            instrumentation.count("crossovers")
+            if paired:
+                instrumentation.count("crossover_rejected", sum(child is None for child in offspring_pair))
+            else:
+                instrumentation.count("crossover_failures")
+        if paired:
+            return offspring_pair
+    if instrumentation is None:
+        return first_ind.copy(), second_ind.copy()
+    with instrumentation.phase("copy"):
+        return first_ind.copy(), second_ind.copy()
+
+def mutate(child, mutation=single_player_swap_2teams, mut_prob=0.2, instrumentation=None):
+    """Mutated child, or None if the mutation is invalid or the child is None (rejected by the crossover)."""
+    if child is None:
+        return None
+    if instrumentation is None:
+        return mutation(child, mut_prob)
+    with instrumentation.phase("mutation"):
+        mutant = mutation(child, mut_prob)
+    instrumentation.count("mutations")
+    if mutant is None:
+        instrumentation.count("mutation_rejected")
+    return mutant
+
+def next_generation(
+    population,
     elitism=True,
-    verbose=False,
     mutation=single_player_swap_2teams,
     mut_prob=0.2,
     crossover=crossover_swap_whole_position,
     xo_prob=0.8,
-    selection_algorithm=tournament_selection
+    selection_algorithm=tournament_selection,
+    verbose=False,
+    instrumentation=None
 ):
+    """
+    Build the next generation: the elite (if elitism), then selection, crossover
+    and mutation until the new population is as large as the current one.
+    `instrumentation` (an Instrumentation) times the phases and counts rejections.
+    """
 
-    players = load_players_from_csv(filepath)
-    population = generate_population(players, POP_SIZE)
-    convergence = []
-
-    for gen in range(1, max_gen + 1):
-        new_population = []
-
-        # Elitism
-        if elitism:
-            try:
-                best_ind = deepcopy(get_best_ind(population))
-                if best_ind is not None:
-                    new_population.append(best_ind)
-            except Exception as e:
-                if verbose:
-                    print(f"Elitism skipped due to error: {e}")
-
-        # Main GA loop
-        while len(new_population) < len(population):
-            first_ind = selection_algorithm(population)
-            second_ind = selection_algorithm(population)
-
-            if not first_ind or not second_ind:
-                continue
+    new_population = []
+    # Fitness of the whole generation, looked up once and shared by every parent pick
+    fitness = _timed(instrumentation, "evaluation", population_fitness, population)
+
+    # Elitism
+    if elitism and population:
+        new_population.append(_timed(instrumentation, "copy", population[int(np.argmin(fitness))].copy))
+
+    # Main GA loop
+    passes = 0
+    while len(new_population) < len(population):
+        if instrumentation is not None and passes:
+            instrumentation.count("refills")
+        passes += 1
+        # Draw the parents of all the missing offspring in one batched call
+        # (drawn again for the offspring still missing if some get rejected)
+        n_pairs = (len(population) - len(new_population) + 1) // 2
+        parent_indices = _timed(instrumentation, "selection", select_parent_indices,
+                                selection_algorithm, population, fitness, 2 * n_pairs)
+
+        for i, j in parent_indices.reshape(-1, 2):
+            if len(new_population) >= len(population):
+                break
+            first_ind, second_ind = population[i], population[j]
 
             # Crossover or replication
-            if random.random() < xo_prob:
-                try:
-                    offspring_pair = crossover(first_ind, second_ind)
-                    if not offspring_pair or len(offspring_pair) != 2:
-                        raise ValueError("Crossover failed or returned invalid offspring.")
-                    offspring1, offspring2 = offspring_pair
-
-                except Exception:            
-                    offspring1, offspring2 = deepcopy(first_ind), deepcopy(second_ind)
-            else:
-                offspring1, offspring2 = deepcopy(first_ind), deepcopy(second_ind)
-                
+            offspring1, offspring2 = breed(first_ind, second_ind, crossover, xo_prob, instrumentation)
 
-            # Mutation
-            try:
-                first_new_ind = mutation(offspring1, mut_prob)
-                if first_new_ind is not None:
-                    new_population.append(first_new_ind)
-            except:
-                pass
+            # Mutation (a child rejected by the crossover or the mutation is None and dropped)
+            first_new_ind = mutate(offspring1, mutation, mut_prob, instrumentation)
+            if first_new_ind is not None:
+                new_population.append(first_new_ind)
 
             if len(new_population) < len(population):
-                try:
-                    second_new_ind = mutation(offspring2, mut_prob)
-                    if second_new_ind is not None:
-                        new_population.append(second_new_ind)
-                except:
-                    pass
+                second_new_ind = mutate(offspring2, mutation, mut_prob, instrumentation)
+                if second_new_ind is not None:
+                    new_population.append(second_new_ind)
+
+    return new_population
+
+
+# Replacement strategies of the steady-state mode
+REPLACEMENTS = ("worst", "tournament")
+
+def steady_state_step(
+    population,
+    fitness,
+    mutation=single_player_swap_2teams,
+    mut_prob=0.2,
+    crossover=crossover_swap_whole_position,
+    xo_prob=0.8,
+    selection_algorithm=tournament_selection,
+    offspring=2,
+    replacement="worst",
+    replacement_size=2,
+    instrumentation=None
+):
+    """
+    One step of a steady-state GA: select two parents, breed `offspring` (1 or 2) children
+    with the same crossover and mutation as next_generation, and insert them into the
+    population in place of current members:
+
+    - "worst": each child replaces the worst league of the population
+    - "tournament": each child faces the worst of replacement_size leagues drawn at random
+      and replaces it only if it is better
+
+    Only the children are copied and scored. `population` (list) and `fitness` (its
+    fitness array) are updated in place. `instrumentation` works as in next_generation.
+
+    Returns:
+    --------
+    int : number of children produced (fitness evaluations of the step)
+    """
+    if replacement not in REPLACEMENTS:
+        raise ValueError(f"Unknown replacement {replacement!r}, expected one of {REPLACEMENTS}.")
+    if instrumentation is not None:
+        instrumentation.count("steps")
+    i, j = _timed(instrumentation, "selection", select_parent_indices, selection_algorithm, population, fitness, 2)
+    first_ind, second_ind = population[i], population[j]
+
+    # Crossover or replication
+    children = breed(first_ind, second_ind, crossover, xo_prob, instrumentation)
+
+    produced = 0
+    for child in children[:offspring]:
+        # Mutation (a child rejected by the crossover or the mutation gives no child)
+        child = mutate(child, mutation, mut_prob, instrumentation)
+        if child is None:
+            continue
+        produced += 1
+        child_fitness = _timed(instrumentation, "evaluation", calculate_fitness, child)
+
+        # Replacement
+        if replacement == "worst":
+            loser = int(np.argmax(fitness))
+        else:
+            contestants = np.random.choice(len(population), size=replacement_size, replace=False)
+            loser = int(contestants[np.argmax(fitness[contestants])])
+            if child_fitness >= fitness[loser]:
+                continue
+        population[loser] = child
+        fitness[loser] = child_fitness
+    return produced
+
+
+def improve_population(population, target="elite", max_steps=None, fitness=None, instrumentation=None):
+    """
+    Memetic stage: hill_climb (see local_search.py) the best league of the population
+    ("elite") or every league ("all"), in place. `fitness`, the population's fitness array
+    if given, is updated.
 
-        population = new_population
-        best_fitness = calculate_fitness(get_best_ind(population))
-        convergence.append(best_fitness)
+    Returns:
+    --------
+    int : swaps scanned by the local search (neighbours scored)
+    """
+    if target not in LOCAL_SEARCH_TARGETS:
+        raise ValueError(f"Unknown local search target {target!r}, expected one of {LOCAL_SEARCH_TARGETS}.")
+    current = fitness if fitness is not None else population_fitness(population)
+    indices = [int(np.argmin(current))] if target == "elite" else range(len(population))
+
+    scanned = 0
+    for i in indices:
+        steps, n_scanned = hill_climb(population[i], max_steps)
+        scanned += n_scanned
+        if steps and fitness is not None:
+            fitness[i] = calculate_fitness(population[i])
+        if instrumentation is not None:
+            instrumentation.count("local_search_swaps", steps)
+    return scanned
+
+
+class Convergence(list):
+    """
+    Best fitness per generation of one run (a plain list for plots and logs), with how
+    the run ended:
+
+    - stop_reason: "max_gen", "stagnation", "target_fitness", "lower_bound", "time_limit"
+      or "max_evaluations"
+    - stop_generation: last generation run
+    - evaluations: number of leagues produced and scored: the initial population plus every
+      offspring (the elite carried over is not counted)
+    - evaluation_counts: value of `evaluations` when each entry was recorded, the x axis to
+      compare runs of the generational and steady-state modes (see fitness_at_evaluations)
+    - operator_stats: with adaptive operators, the usage and reward of every operator
+      (AdaptiveOperator.stats, with a "kind" column), None otherwise
+    """
+    def __init__(self, values=(), stop_reason=None, stop_generation=None, evaluations=0, evaluation_counts=(),
+                 operator_stats=None):
+        super().__init__(values)
+        self.stop_reason = stop_reason
+        self.stop_generation = stop_generation
+        self.evaluations = evaluations
+        self.evaluation_counts = list(evaluation_counts)
+        self.operator_stats = operator_stats
+
+def fitness_at_evaluations(convergence, evaluations):
+    """
+    Best fitness of a run after each number of fitness evaluations in `evaluations` (NaN
+    before the first recorded entry), from its Convergence.evaluation_counts.
+    """
+    counts = np.asarray(convergence.evaluation_counts)
+    values = np.asarray(convergence, dtype=float)
+    if not len(values):
+        return np.full(np.shape(evaluations), np.nan)
+    positions = np.searchsorted(counts, np.asarray(evaluations), side="right") - 1
+    return np.where(positions >= 0, values[np.maximum(positions, 0)], np.nan)
+
+def stop_reason(convergence, gen, max_gen, stagnation=None, target_fitness=None, lower_bound=None,
+                elapsed=None, time_limit=None, evaluations=None, max_evaluations=None):
+    """
+    Name of the first termination criterion met after generation `gen`, or None to go on.
+    `convergence` holds the best fitness of every generation so far.
+    """
+    best = convergence[-1]
+    # Fitness values equal up to rounding count as reaching the target
+    if lower_bound is not None and best <= lower_bound + 1e-9:
+        return "lower_bound"
+    if target_fitness is not None and best <= target_fitness + 1e-9:
+        return "target_fitness"
+    if stagnation is not None and gen > stagnation and min(convergence[-stagnation:]) >= convergence[-stagnation - 1]:
+        return "stagnation"
+    if time_limit is not None and elapsed >= time_limit:
+        return "time_limit"
+    if max_evaluations is not None and evaluations >= max_evaluations:
+        return "max_evaluations"
+    if gen >= max_gen:
+        return "max_gen"
+    return None
 
+def run_algorithm(
+    filepath=None,
+    log_path="ga_runs.csv",
+    POP_SIZE=50,
+    max_gen=100,
+    elitism=True,
+    verbose=False,
+    mutation=single_player_swap_2teams,
+    mut_prob=0.2,
+    crossover=crossover_swap_whole_position,
+    xo_prob=0.8,
+    selection_algorithm=tournament_selection,
+    cache=None,
+    players=None,
+    seed=None,
+    spec=None,
+    stagnation=None,
+    target_fitness=None,
+    stop_at_bound=False,
+    time_limit=None,
+    max_evaluations=None,
+    mode="generational",
+    offspring=2,
+    replacement="worst",
+    instrumentation=None,
+    profile_path=None,
+    local_search=None,
+    local_search_steps=None,
+    bandit_policy="epsilon_greedy",
+    bandit_cost="evaluations"
+):
+    """
+    Run one GA and return (best league, best fitness, best fitness per generation).
+
+    `cache` is an optional FitnessCache (transposition table) consulted by every fitness
+    evaluation of the run; pass the same one to repeated runs to share it between them.
+    `players` is an already loaded roster (the CSV at `filepath` is read otherwise), and
+    `seed` reseeds the `random` and `numpy.random` generators before the run starts.
+    `spec` is the ProblemSpec (teams, formation, salary cap) of the leagues to evolve,
+    DEFAULT_SPEC when not given.
+
+    The run stops after max_gen generations, or earlier when a termination criterion is met:
+    - stagnation: no improvement of the best fitness for that many generations
+    - target_fitness: the best fitness reaches this value
+    - stop_at_bound: the best fitness reaches fitness_lower_bound, so no league can do better
+    - time_limit: seconds of wall-clock time since the start of the run
+    - max_evaluations: number of fitness evaluations (see Convergence.evaluations)
+    The returned convergence is a Convergence list recording why and when the run stopped.
+
+    mode="steady_state" replaces the generational loop with steady_state_step: each step
+    breeds `offspring` (1 or 2) children and inserts them with `replacement` ("worst" or
+    "tournament"), so only the children are copied. A "generation" is then as many steps
+    as produce POP_SIZE children; the best fitness is recorded after each of them, and
+    Convergence.evaluation_counts gives the evaluations behind every entry of both modes.
+
+    Memetic local search (off by default): local_search="elite" hill-climbs the best league
+    of every generation, "all" every league, each for at most local_search_steps improving
+    swaps (None: until a local optimum), with improve_population. Every neighbour the
+    local search scores counts as one fitness evaluation.
+
+    Adaptive operators: `mutation` and `crossover` can each be a list of operators. The run
+    then chooses among them online with a multi-armed bandit (an AdaptiveOperator, new for
+    every run, built with `bandit_policy`), rewarded with the fitness improvement of every
+    use per unit of `bandit_cost`: "evaluations" (children produced, reproducible with a
+    seed) or "seconds" (wall-clock time, not reproducible). Convergence.operator_stats gives the usage and reward of every
+    operator at the end of the run.
+
+    Instrumentation (off by default):
+    - instrumentation: an Instrumentation, filled with the time spent in selection, crossover,
+      mutation, evaluation and copies, operator counters, and the mean, median and valid
+      fraction of every generation
+    - profile_path: run under cProfile and dump the statistics there (pstats format)
+    """
+    if mode not in ("generational", "steady_state"):
+        raise ValueError(f"Unknown mode {mode!r}, expected 'generational' or 'steady_state'.")
+    start = time.perf_counter()
+    if seed is not None:
+        random.seed(seed)
+        np.random.seed(seed)
+    if players is None:
+        players = load_players_from_csv(filepath)
+    adaptive = []
+    if is_operator_list(mutation):
+        mutation = AdaptiveOperator(mutation, "mutation", bandit_policy, bandit_cost)
+        adaptive.append(mutation)
+    if is_operator_list(crossover):
+        crossover = AdaptiveOperator(crossover, "crossover", bandit_policy, bandit_cost)
+        adaptive.append(crossover)
+    profiler = profiled(profile_path) if profile_path is not None else nullcontext()
+    with profiler:
+        population = generate_population(players, POP_SIZE, cache=cache, spec=spec)
+        lower_bound = fitness_lower_bound(population[0].roster, spec) if stop_at_bound else None
+        convergence = Convergence(stop_reason="max_gen", stop_generation=0, evaluations=len(population))
+        invalid_fitness = population[0].spec.invalid_fitness
+
+        fitness = population_fitness(population) if mode == "steady_state" else None
+
+        for gen in range(1, max_gen + 1):
+            if mode == "steady_state":
+                # As many steps as it takes to produce a population's worth of children
+                produced = 0
+                while produced < len(population):
+                    produced += steady_state_step(population, fitness, mutation, mut_prob, crossover, xo_prob,
+                                                  selection_algorithm, offspring, replacement,
+                                                  instrumentation=instrumentation)
+                convergence.evaluations += produced
+                if local_search is not None:
+                    convergence.evaluations += _timed(instrumentation, "local_search", improve_population,
+                                                      population, local_search, local_search_steps, fitness,
+                                                      instrumentation)
+                best_fitness = float(fitness.min())
+            else:
+                population = next_generation(population, elitism, mutation, mut_prob, crossover, xo_prob,
+                                             selection_algorithm, verbose, instrumentation)
+                convergence.evaluations += len(population) - (1 if elitism else 0)
+                if local_search is not None:
+                    convergence.evaluations += _timed(instrumentation, "local_search", improve_population,
+                                                      population, local_search, local_search_steps, None,
+                                                      instrumentation)
+                # The whole generation scored in one batch, reused by the instrumentation
+                fitness = _timed(instrumentation, "evaluation", population_fitness, population)
+                best_fitness = float(fitness.min())
+            convergence.append(best_fitness)
+            convergence.evaluation_counts.append(convergence.evaluations)
+            if instrumentation is not None:
+                instrumentation.record_generation(gen, fitness, convergence.evaluations, invalid_fitness)
+
+            if verbose:
+                print(f"Gen {gen} best fitness: {best_fitness}")
+
+            reason = stop_reason(convergence, gen, max_gen, stagnation, target_fitness, lower_bound,
+                                 time.perf_counter() - start, time_limit, convergence.evaluations, max_evaluations)
+            if reason is not None:
+                convergence.stop_reason, convergence.stop_generation = reason, gen
+                if verbose and reason != "max_gen":
+                    print(f"Stopped at generation {gen}: {reason}")
+                break
+
+    if adaptive:
+        import pandas as pd
+        convergence.operator_stats = pd.concat([operator.stats().assign(kind=operator.kind) for operator in adaptive],
+                                               ignore_index=True)
         if verbose:
-            print(f"Gen {gen} best fitness: {best_fitness}")
-    
+            print(convergence.operator_stats.to_string(index=False))
+
     best_ind = get_best_ind(population)
     final_fitness = calculate_fitness(best_ind)
 
     return best_ind, final_fitness, convergence
 
 
-def run_grid_search(param_grid, n_runs=30, max_gen=100, filepath = None, summary_path="ga_summary.csv", output_folder = 'fitness_logs'):
-   
+def config_label(run_params):
+    """Name of the convergence log of one configuration (file name without extension)."""
+    label = (
+        f"POP={run_params['POP_SIZE']} "
+        # f"GEN={run_params['max_gen']} "
+        f"XO={run_params['xo_prob']} "
+        f"mut_prob={run_params['mut_prob']} "
+        f"mutation={operator_name(run_params['mutation'])} "
+        f"crossover={operator_name(run_params['crossover'])} "
+        f"selection_alg={run_params['selection_algorithm'].__name__} "
+        f"elitism={run_params['elitism']}"
+    )
+    # Steady-state, local search and bandit parameters, only when the grid sets them (older labels are unchanged)
+    for key in ("mode", "offspring", "replacement", "local_search", "local_search_steps", "bandit_policy",
+                "bandit_cost"):
+        if key in run_params:
+            label += f" {key}={run_params[key]}"
+    return label
+
+def run_seed(master_seed, config_idx, run_idx):
+    """Seed of one run, derived from the master seed and the run's position in the grid only."""
+    sequence = np.random.SeedSequence(master_seed, spawn_key=(config_idx, run_idx))
+    return int(sequence.generate_state(1)[0])
+
+# Per-process state of the grid-search workers: the roster, loaded once by the parent
+# process, the problem spec, and the FitnessCache of the configuration the worker is running
+_worker_players = None
+_worker_spec = None
+_worker_cache_size = None
+_worker_caches = {}
+
+def _init_worker(players, cache_size, spec=None):
+    global _worker_players, _worker_spec, _worker_cache_size
+    _worker_players = players
+    _worker_spec = spec
+    _worker_cache_size = cache_size
+    _worker_caches.clear()
+
+def _run_task(config_idx, run_idx, run_params, max_gen, seed):
+    """Run one (configuration, run) task of a grid search in the current worker."""
+    cache = None
+    if _worker_cache_size:
+        if config_idx not in _worker_caches:
+            # Tasks come configuration by configuration: only keep the current cache
+            _worker_caches.clear()
+            _worker_caches[config_idx] = FitnessCache(_worker_cache_size)
+        cache = _worker_caches[config_idx]
+
+    _, fitness, convergence = run_algorithm(**run_params, max_gen=max_gen, players=_worker_players,
+                                            cache=cache, seed=seed, spec=_worker_spec)
+    cache_stats = cache.stats() if cache is not None else None
+    return config_idx, run_idx, fitness, convergence, cache_stats
+
+# Files written next to the summary of a grid search (<summary_path stem><suffix>), so that
+# the output folder holds nothing but convergence logs:
+# usage and reward of the adaptive operators of every configuration
+OPERATOR_STATS_SUFFIX = ".operator_stats.csv"
+# mean, std and median best fitness of every generation of every configuration
+GENERATION_STATS_SUFFIX = ".generation_stats.csv"
+
+def _append_csv(df, path):
+    file_exists = Path(path).is_file()
+    df.to_csv(path, mode="a" if file_exists else "w", header=not file_exists, index=False)
+
+def _summary_row(run_params, stats):
+    return {
+        **{k: (operator_name(v) if callable(v) or is_operator_list(v) else v) for k, v in run_params.items()},
+        **stats
+    }
+
+def _write_operator_stats(run_params, operator_stats, summary_path):
+    # Usage and reward of adaptive operators, summed over the runs, one file for the whole grid
+    if operator_stats:
+        import pandas as pd
+        totals = pd.concat(operator_stats).groupby(["kind", "operator"], sort=False, as_index=False)[
+            ["uses", "improving_uses", "improvement", "cost", "seconds"]].sum()
+        totals["use_share"] = totals["uses"] / totals.groupby("kind")["uses"].transform("sum")
+        totals["improvement_per_cost"] = totals["improvement"] / totals["cost"]
+        totals["improvement_per_second"] = totals["improvement"] / totals["seconds"]
+        totals.insert(0, "config", config_label(run_params))
+        _append_csv(totals, Path(summary_path).with_suffix(OPERATOR_STATS_SUFFIX))
+
+def _write_config_results(run_params, fitnesses, all_convergences, summary_path, output_folder, store=None):
+    """
+    Append the summary row of one configuration and write its convergence log: added to
+    `store` (a ConvergenceStoreWriter) if given, to a CSV of its own otherwise.
+    """
+    import pandas as pd
+
+    # Stats for csv file 
+    stats = {
+        "median_fitness": np.median(fitnesses),
+        "mean_fitness": np.mean(fitnesses),
+        "std_fitness": np.std(fitnesses),
+        "min_fitness": np.min(fitnesses),
+        "max_fitness": np.max(fitnesses),
+        # How the runs ended (see run_algorithm's termination criteria)
+        "mean_stop_generation": np.mean([len(convergence) for convergence in all_convergences]),
+        "mean_evaluations": np.mean([getattr(convergence, "evaluations", 0) for convergence in all_convergences]),
+        "stop_reasons": ";".join(f"{reason}:{count}" for reason, count in sorted(Counter(
+            getattr(convergence, "stop_reason", None) or "max_gen" for convergence in all_convergences).items())),
+    }
+
+    _append_csv(pd.DataFrame([_summary_row(run_params, stats)]), summary_path)
+    _write_operator_stats(run_params, [convergence.operator_stats for convergence in all_convergences
+                                       if getattr(convergence, "operator_stats", None) is not None], summary_path)
+
+    # Prepare for convergence plot
+    if store is not None:
+        store.add(run_params, all_convergences, config_label(run_params))
+        return
+    convergence_df = pd.DataFrame(all_convergences)
+    convergence_path = os.path.join(output_folder, f"{config_label(run_params)}.csv")
+    convergence_df.to_csv(convergence_path, index=False)
+
+def _write_streamed_config(run_params, summary, runs, summary_path, output_folder, store=None):
+    """
+    Write the results of one configuration from its StreamingSummary: summary row,
+    operator stats, per-generation statistics and convergence log (`runs`: the runs
+    encoded by encode_run for `store`, the curves for a CSV log).
+    """
+    import pandas as pd
+
+    _append_csv(pd.DataFrame([_summary_row(run_params, summary.stats())]), summary_path)
+    _write_operator_stats(run_params, summary.operator_stats, summary_path)
+
+    # Exact median of every generation, from the runs decoded (and padded) one configuration at a time
+    encoded = runs if store is not None else [encode_run(curve) for curve in runs]
+    offsets = np.r_[0, np.cumsum([len(run["values"]) for run in encoded])]
+    padded = decode_runs(np.concatenate([run["values"] for run in encoded]),
+                         np.concatenate([run["starts"] for run in encoded]), offsets, summary.max_gen)
+    curves = summary.curve_stats()
+    _append_csv(pd.DataFrame({"config": config_label(run_params), "generation": np.arange(1, summary.max_gen + 1),
+                              "mean_fitness": curves["mean"], "std_fitness": curves["std"],
+                              "median_fitness": np.median(padded, axis=0)}),
+                Path(summary_path).with_suffix(GENERATION_STATS_SUFFIX))
+
+    if store is not None:
+        store.add_encoded(run_params, runs, config_label(run_params))
+        return
+    convergence_path = os.path.join(output_folder, f"{config_label(run_params)}.csv")
+    pd.DataFrame(runs).to_csv(convergence_path, index=False)
+
+def _flush_partial_summary(path, param_combinations, summaries):
+    """
+    Rewrite the partial summary: one row per configuration with runs done but not written
+    yet (median: the P² estimate of StreamingSummary).
+    """
+    import pandas as pd
+
+    rows = [{**_summary_row(run_params, summary.stats(exact=False)), "runs_done": summary.runs}
+            for run_params, summary in zip(param_combinations, summaries)
+            if summary is not None and summary.runs]
+    temporary = Path(path).with_suffix(".tmp")
+    pd.DataFrame(rows).to_csv(temporary, index=False)
+    os.replace(temporary, path)
+
+def run_grid_search(param_grid, n_runs=30, max_gen=100, filepath = None, summary_path="ga_summary.csv", output_folder = 'fitness_logs', cache_size=100_000, n_workers=1, seed=None, spec=None, log_format="npz", flush_every=30):
+    """
+    Run every configuration of `param_grid` n_runs times and log the results.
+
+    The (configuration, run) tasks are spread over `n_workers` processes (None: one per CPU).
+    Each run is seeded from `seed` and its position in the grid only, so a given seed gives
+    the same results whatever the number of workers and the order the tasks finish in.
+    The roster is read once and handed to every worker. The runs of one configuration
+    executed by the same process share a FitnessCache of at most `cache_size` leagues
+    (None or 0 disables it); its hit rate is shown on the progress bar.
+    Operators and selection functions in `param_grid` must be module-level functions
+    when n_workers > 1, so that they can be sent to the worker processes.
+    A tuple of operators as a mutation or crossover value runs them adaptively (see
+    run_algorithm); the usage and reward of its operators, summed over the runs of the
+    configuration, go to <summary_path stem>.operator_stats.csv.
+    Every run solves the problem described by `spec` (DEFAULT_SPEC when not given).
+
+    With log_format="npz" the convergence logs of all the configurations are written, once
+    the grid is done, to a single store (output_folder/convergence.npz, read it with
+    Operators.convergence_store.ConvergenceStore); with "csv", each configuration gets its
+    own CSV named after its parameters, as before.
+
+    The statistics are streamed: each run updates the StreamingSummary of its configuration
+    (Welford mean and std of the best fitness and of every generation, final best fitness
+    of every run for the exact median) and is only kept run-length encoded, for the npz
+    store (the CSV logs keep the curves of the configurations in progress). The store
+    keeps the encoded runs of the whole grid until it is written at the end. The
+    per-generation statistics (with the exact median, from the decoded runs of the
+    configuration) go to <summary_path stem>.generation_stats.csv.
+    Every `flush_every` seconds (None: never), the statistics of the configurations in
+    progress are written to <summary_path stem>.partial.csv, with their number of runs
+    done and a P² estimate of the median, to monitor long grids; the file is removed when
+    the grid is done.
+    """
+    if log_format not in ("npz", "csv"):
+        raise ValueError(f"Unknown log format: {log_format}")
 
     if Path(summary_path).exists():
         Path(summary_path).unlink() 
+    Path(summary_path).with_suffix(OPERATOR_STATS_SUFFIX).unlink(missing_ok=True)
+    Path(summary_path).with_suffix(GENERATION_STATS_SUFFIX).unlink(missing_ok=True)
+    if log_format == "csv":
+        # A store left by an earlier npz run would be read instead of the new CSV logs
+        (Path(output_folder) / STORE_FILENAME).unlink(missing_ok=True)
+    partial_path = Path(summary_path).with_suffix(".partial.csv")
 
     keys = list(param_grid.keys())
     values = (param_grid[key] for key in keys)
-    param_combinations = list(product(*values))
+    param_combinations = [dict(zip(keys, param_values)) for param_values in product(*values)]
 
     Path(output_folder).mkdir(parents=True, exist_ok=True)
+    store = ConvergenceStoreWriter(Path(output_folder) / STORE_FILENAME) if log_format == "npz" else None
 
-    for param_values in tqdm(param_combinations, desc="Grid Search Progress", unit="config"):
-        run_params = dict(zip(keys, param_values))
-        fitnesses = []
-        all_convergences = []
-
-        for _ in range(n_runs):
-            _, fitness, convergence = run_algorithm(**run_params, max_gen=max_gen, filepath=filepath)
-            fitnesses.append(fitness)
-            all_convergences.append(convergence)
-
-        # Stats for csv file 
-        stats = {
-            "median_fitness": np.median(fitnesses),
-            "mean_fitness": np.mean(fitnesses),
-            "std_fitness": np.std(fitnesses),
-            "min_fitness": np.min(fitnesses),
-            "max_fitness": np.max(fitnesses),
-        }
-
-        summary_row = {
-            **{k: (v.__name__ if callable(v) else v) for k, v in run_params.items()},
-            **stats
-        }
-
-        df_new = pd.DataFrame([summary_row])
-        file_exists = Path(summary_path).is_file()
-        mode = "a" if file_exists else "w"
-        df_new.to_csv(summary_path, mode=mode, header=not file_exists, index=False)
-
-        # Prepare for convergence plot
-        config_label = (
-            f"POP={run_params['POP_SIZE']} "
-            # f"GEN={run_params['max_gen']} "
-            f"XO={run_params['xo_prob']} "
-            f"mut_prob={run_params['mut_prob']} "
-            f"mutation={run_params['mutation'].__name__} "
-            f"crossover={run_params['crossover'].__name__} "
-            f"selection_alg={run_params['selection_algorithm'].__name__} "
-            f"elitism={run_params['elitism']}"
-)
-        convergence_df = pd.DataFrame(all_convergences)
-        convergence_path = os.path.join(output_folder, f"{config_label}.csv")
-        convergence_df.to_csv(convergence_path, index=False)
+    players = load_players_from_csv(filepath)
+    master_seed = seed if seed is not None else np.random.SeedSequence().entropy
+    tasks = [
+        (config_idx, run_idx, run_params, max_gen, run_seed(master_seed, config_idx, run_idx))
+        for config_idx, run_params in enumerate(param_combinations)
+        for run_idx in range(n_runs)
+    ]
+
+    # Streamed statistics and encoded runs (or curves) of the configurations not written yet,
+    # and the runs that finished before an earlier run of their configuration
+    summaries = [None] * len(param_combinations)
+    runs = [None] * len(param_combinations)
+    waiting = [{} for _ in param_combinations]
+    pending_runs = [n_runs] * len(param_combinations)
+    next_to_write = 0
+    last_flush = time.perf_counter()
+    from tqdm import tqdm
+    progress = tqdm(total=len(param_combinations), desc="Grid Search Progress", unit="config")
+
+    def collect(result):
+        # Stream one finished run and write every configuration completed so far, in grid order
+        nonlocal next_to_write, last_flush
+        config_idx, run_idx, fitness, convergence, cache_stats = result
+        if summaries[config_idx] is None:
+            summaries[config_idx] = StreamingSummary(max_gen)
+            runs[config_idx] = []
+        # Runs are streamed in run order, so that the statistics do not depend on the
+        # order the workers finish in (at most the tasks in flight wait here)
+        waiting[config_idx][run_idx] = (fitness, convergence)
+        while len(runs[config_idx]) in waiting[config_idx]:
+            fitness, convergence = waiting[config_idx].pop(len(runs[config_idx]))
+            summaries[config_idx].add(fitness, convergence)
+            runs[config_idx].append(encode_run(convergence) if store is not None else list(convergence))
+            pending_runs[config_idx] -= 1
+        if cache_stats is not None:
+            progress.set_postfix(cache_hit_rate=f"{cache_stats['hit_rate']:.1%}",
+                                 cache_evictions=cache_stats["evictions"])
+
+        while next_to_write < len(param_combinations) and pending_runs[next_to_write] == 0:
+            _write_streamed_config(param_combinations[next_to_write], summaries[next_to_write],
+                                   runs[next_to_write], summary_path, output_folder, store)
+            summaries[next_to_write] = runs[next_to_write] = None
+            next_to_write += 1
+            progress.update()
+
+        if flush_every is not None and time.perf_counter() - last_flush >= flush_every:
+            _flush_partial_summary(partial_path, param_combinations, summaries)
+            last_flush = time.perf_counter()
+
+    if n_workers == 1:
+        _init_worker(players, cache_size, spec)
+        for task in tasks:
+            collect(_run_task(*task))
+    else:
+        with ProcessPoolExecutor(max_workers=n_workers, initializer=_init_worker,
+                                 initargs=(players, cache_size, spec)) as executor:
+            # A bounded number of tasks in flight, so that finished results are not kept around
+            max_pending = 4 * (n_workers or os.cpu_count() or 1)
+            task_iter = iter(tasks)
+            pending = set()
+            for task in task_iter:
+                pending.add(executor.submit(_run_task, *task))
+                if len(pending) < max_pending:
+                    continue
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    collect(future.result())
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    collect(future.result())
+    progress.close()
+    partial_path.unlink(missing_ok=True)
+    if store is not None:
+        store.close()
+        print(f"\nConvergence logs saved to: {store.path}")
 
     print(f"\nSummary saved to: {summary_path}")
@@ -0,0 +1,150 @@
+import time
+import numpy as np
+import pandas as pd
+
+from Operators.genetic_algorithm import next_generation, get_best_ind, single_player_swap_2teams, \
+    crossover_swap_whole_position, tournament_selection
+from Operators.population import *
+
+# Profile of each position, fitted on Data/players(in).csv:
+# skill ~ Normal(mean, std), and salary = intercept + slope * skill + Normal(0, noise)
+POSITION_PROFILES = {
+    "GK":  {"skill": (84.6, 3.2), "salary": (-115.3, 2.43, 1.35)},
+    "DEF": {"skill": (84.2, 3.6), "salary": (-263.4, 4.15, 1.40)},
+    "MID": {"skill": (87.2, 3.4), "salary": (-241.2, 3.90, 1.90)},
+    "FWD": {"skill": (88.7, 4.5), "salary": (-383.1, 5.58, 3.51)},
+}
+SKILL_RANGE = (70, 99)
+MIN_SALARY = 20
+
+FIRST_NAMES = ["Alex", "Jordan", "Ryan", "Chris", "Blake", "Daniel", "Lucas", "Owen", "Ethan", "Mason",
+               "Logan", "Caleb", "Nathan", "Connor", "Dylan", "Hunter", "Austin", "Gavin", "Spencer",
+               "Sebastian", "Xavier", "Elijah", "Adrian", "Tyler", "Chase", "Landon", "Julian", "Bentley",
+               "Maxwell", "Dominic", "Jaxon", "Ashton", "Colton", "Brayden", "Zachary"]
+LAST_NAMES = ["Carter", "Smith", "Mitchell", "Thompson", "Henderson", "Foster", "Bennett", "Parker", "Howard",
+              "Reed", "Brooks", "Fisher", "Wright", "Hayes", "Morgan", "Cooper", "Torres", "Richardson", "Ward",
+              "Perry", "Bryant", "Sanders", "Collins", "Jenkins", "Murphy", "Powell", "Scott", "Rivera",
+              "Flores", "Bell", "Griffin", "Phillips", "Gray", "Hughes", "Nelson"]
+
+
+def instance_spec(n_players, formation=None, salary_cap=750):
+    """ProblemSpec with as many teams of `formation` as n_players can fill."""
+    team_size = ProblemSpec(formation=formation).team_size
+    return ProblemSpec(num_teams=n_players // team_size, formation=formation, salary_cap=salary_cap)
+
+
+def generate_players(n_players, spec=None, seed=None):
+    """
+    Generate a synthetic roster of n_players in the style of Data/players(in).csv.
+
+    Positions follow the formation of `spec` (by default the instance_spec of n_players,
+    so 35 players give 5 GK, 10 DEF, 10 MID and 10 FWD as in the original data); players
+    left over when n_players is not a multiple of the team size get random positions.
+    Skills and salaries are drawn from the per-position profiles fitted on the original
+    data, so a team costs about as much as there, relative to the 750M cap.
+    Names are unique, as the Roster requires.
+
+    Parameters:
+    -----------
+    n_players : int
+        Number of players of the roster.
+    spec : ProblemSpec, optional
+        Problem the roster is made for.
+    seed : int, optional
+        Seed of the generator (the global random state is left untouched).
+
+    Returns:
+    --------
+    list[Player]
+    """
+    rng = np.random.default_rng(seed)
+    if spec is None:
+        spec = instance_spec(n_players)
+
+    # 1) Positions: full teams first, then the leftovers
+    positions = [pos for pos in spec.positions for _ in range(spec.num_teams * spec.formation[pos])]
+    if len(positions) > n_players:
+        raise ValueError(f"{n_players} players cannot fill {spec.num_teams} teams of {spec.team_size}.")
+    positions += list(rng.choice(spec.positions, size=n_players - len(positions)))
+    positions = [positions[i] for i in rng.permutation(n_players)]
+
+    # 2) Unique names: first name x last name, numbered once all the pairs are taken
+    pairs = [(first, last) for first in FIRST_NAMES for last in LAST_NAMES]
+    order = rng.permutation(len(pairs))
+    names = []
+    for i in range(n_players):
+        first, last = pairs[order[i % len(pairs)]]
+        rank = i // len(pairs)
+        names.append(f"{first} {last}" if rank == 0 else f"{first} {last} {rank + 1}")
+
+    # 3) Skill and salary from the profile of each position
+    players = []
+    for name, position in zip(names, positions):
+        skill_mean, skill_std = POSITION_PROFILES[position]["skill"]
+        intercept, slope, noise = POSITION_PROFILES[position]["salary"]
+        skill = int(np.clip(round(rng.normal(skill_mean, skill_std)), *SKILL_RANGE))
+        salary = max(MIN_SALARY, int(round(intercept + slope * skill + rng.normal(0, noise))))
+        players.append(Player(name, position, skill, salary))
+    return players
+
+
+def write_players_csv(players, filepath):
+    """Write a roster with the columns of Data/players(in).csv, readable by load_players_from_csv."""
+    df = pd.DataFrame({
+        "Name": [p.name for p in players],
+        "Position": [p.position for p in players],
+        "Skill": [p.skill for p in players],
+        "Salary (€M)": [p.cost for p in players],
+    })
+    df.to_csv(filepath)
+
+
+def run_scaling_benchmark(sizes=(35, 350, 3500), POP_SIZE=50, max_gen=10, seed=0, verbose=True, **ga_params):
+    """
+    Time the GA on synthetic instances of growing size.
+
+    For every number of players in `sizes`, a roster is generated with generate_players,
+    the population is created with generate_population and evolved for max_gen generations
+    with next_generation (ga_params override its defaults, e.g. mutation or crossover).
+
+    Returns:
+    --------
+    pd.DataFrame
+        One row per size: players, teams, seconds to build the population, mean seconds
+        per generation, and the best fitness after the last generation.
+    """
+    params = {"elitism": True, "mutation": single_player_swap_2teams, "mut_prob": 0.2,
+              "crossover": crossover_swap_whole_position, "xo_prob": 0.8,
+              "selection_algorithm": tournament_selection, "verbose": False, **ga_params}
+
+    rows = []
+    for n_players in sizes:
+        random.seed(seed)
+        np.random.seed(seed)
+        spec = instance_spec(n_players)
+        players = generate_players(n_players, spec, seed=seed)
+
+        start = time.perf_counter()
+        population = generate_population(players, POP_SIZE, spec=spec)
+        init_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for _ in range(max_gen):
+            population = next_generation(population, **params)
+        gen_time = (time.perf_counter() - start) / max_gen
+
+        row = {
+            "n_players": n_players,
+            "n_teams": spec.num_teams,
+            "init_seconds": init_time,
+            "seconds_per_generation": gen_time,
+            "best_fitness": float(calculate_fitness(get_best_ind(population))),
+        }
+        rows.append(row)
+        if verbose:
+            print(row)
+    return pd.DataFrame(rows)
+
+
+if __name__ == "__main__":
+    print(run_scaling_benchmark().to_string(index=False))
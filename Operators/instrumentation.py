@@ -0,0 +1,117 @@
+import time
+from collections import Counter
+from contextlib import contextmanager
+
+import numpy as np
+
+# Phases of a generation timed by Instrumentation
+PHASES = ("selection", "crossover", "mutation", "evaluation", "copy", "local_search")
+
+
+class Instrumentation:
+    """
+    Where one GA run spends its time, and what its operators do.
+
+    Pass an instance to run_algorithm (instrumentation=...) and read it after the run.
+    Without one (the default) the GA loop only pays for a few `is None` checks.
+
+    Attributes:
+    -----------
+    times : dict
+        Seconds spent in each phase of PHASES: parent selection, crossover, mutation
+        (including the copy a mutation makes), fitness evaluation, copies of parents
+        (replication) and of the elite, and the memetic local search.
+    counts : Counter
+        - crossovers: crossovers attempted
+        - crossover_failures: crossovers that returned no pair of children (the parents are copied)
+        - crossover_rejected: children a crossover returned as None (invalid)
+        - mutations: calls of the mutation (each mutates with probability mut_prob)
+        - mutation_rejected: mutations that returned None (invalid move)
+        - refills: extra passes of next_generation's loop to replace rejected children
+        - steps: steady-state steps
+        - local_search_swaps: improving swaps applied by the local search
+    generations : list[dict]
+        One row per generation: best, mean and median fitness of the valid leagues,
+        fraction of valid leagues, evaluations so far and seconds since the start.
+    """
+    def __init__(self):
+        self.times = dict.fromkeys(PHASES, 0.0)
+        self.counts = Counter()
+        self.generations = []
+        self._start = time.perf_counter()
+
+    @contextmanager
+    def phase(self, name):
+        """Add the time spent in the `with` block to phase `name`."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.times[name] += time.perf_counter() - start
+
+    def count(self, name, n=1):
+        self.counts[name] += n
+
+    def record_generation(self, generation, fitness, evaluations, invalid_fitness):
+        """Statistics of the fitness vector of one generation's population."""
+        fitness = np.asarray(fitness, dtype=float)
+        valid = fitness[fitness < invalid_fitness]
+        self.generations.append({
+            "generation": generation,
+            "best_fitness": float(fitness.min()),
+            "mean_fitness": float(valid.mean()) if valid.size else np.nan,
+            "median_fitness": float(np.median(valid)) if valid.size else np.nan,
+            "valid_fraction": valid.size / fitness.size,
+            "evaluations": evaluations,
+            "seconds": time.perf_counter() - self._start,
+        })
+
+    def to_dataframe(self):
+        """Per-generation statistics as a DataFrame."""
+        import pandas as pd
+
+        return pd.DataFrame(self.generations)
+
+    def summary(self):
+        """Phase times (and their share of the timed total) and counters, as one dict."""
+        total = sum(self.times.values())
+        summary = {f"{name}_seconds": seconds for name, seconds in self.times.items()}
+        summary.update({f"{name}_share": seconds / total if total else 0.0 for name, seconds in self.times.items()})
+        summary.update(self.counts)
+        return summary
+
+    def report(self):
+        """Readable table of the phase times and counters."""
+        total = sum(self.times.values())
+        lines = [f"{'phase':<12}{'seconds':>10}{'share':>8}"]
+        for name, seconds in sorted(self.times.items(), key=lambda item: -item[1]):
+            lines.append(f"{name:<12}{seconds:>10.4f}{seconds / total if total else 0.0:>8.1%}")
+        lines += [f"{name:<20}{count:>10}" for name, count in sorted(self.counts.items())]
+        return "\n".join(lines)
+
+
+@contextmanager
+def profiled(path=None, sort="cumulative", limit=25):
+    """
+    Run the `with` block under cProfile. The statistics are dumped to `path` (read them
+    back with pstats.Stats(path) or snakeviz) or, without a path, the `limit` most
+    expensive functions are printed, sorted by `sort`.
+
+    Usage:
+    ------
+    with profiled("slow_config.prof"):
+        run_algorithm(...)
+    """
+    import cProfile
+    import pstats
+
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield profiler
+    finally:
+        profiler.disable()
+        if path is not None:
+            profiler.dump_stats(path)
+        else:
+            pstats.Stats(profiler).sort_stats(sort).print_stats(limit)
@@ -0,0 +1,176 @@
+import random
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+
+from Operators.genetic_algorithm import next_generation, get_best_ind
+from Operators.population import *
+
+
+def migration_targets(n_islands, topology="ring"):
+    """
+    List, for each island, the islands its emigrants are sent to.
+
+    - "ring": island i sends to island i+1 (the last one sends to the first one)
+    - "fully_connected": every island sends to all the others
+    """
+    if topology == "ring":
+        return [[(i + 1) % n_islands] for i in range(n_islands)]
+    if topology == "fully_connected":
+        return [[j for j in range(n_islands) if j != i] for i in range(n_islands)]
+    raise ValueError(f"Unknown migration topology: {topology}")
+
+
+# Per-process state of the island workers: the roster and problem spec, sent once by the
+# coordinator, and a FitnessCache shared by the islands the process runs
+_island_players = None
+_island_roster = None
+_island_spec = None
+_island_cache = None
+
+def _init_island_worker(players, cache_size, spec=None):
+    global _island_players, _island_roster, _island_spec, _island_cache
+    _island_players = players
+    _island_roster = Roster(players)
+    _island_spec = spec if spec is not None else DEFAULT_SPEC
+    _island_cache = FitnessCache(cache_size) if cache_size else None
+
+def _evolve_island(state, n_generations):
+    """
+    Run n_generations of one island in the current process and return its updated state.
+    The state carries the island's genomes and RNG states, so an island gives the same
+    results whichever process runs it.
+    """
+    if state["random_state"] is None:
+        random.seed(state["seed"])
+        np.random.seed(state["seed"])
+    else:
+        random.setstate(state["random_state"])
+        np.random.set_state(state["numpy_state"])
+
+    if state["genomes"] is None:
+        population = generate_population(_island_players, state["pop_size"],
+                                         cache=_island_cache, roster=_island_roster, spec=_island_spec)
+    else:
+        population = [League.from_genome(_island_roster, genome.copy(), _island_cache, _island_spec)
+                      for genome in state["genomes"]]
+
+    for _ in range(n_generations):
+        population = next_generation(population, **state["params"])
+        state["convergence"].append(calculate_fitness(get_best_ind(population)))
+
+    state["genomes"] = np.stack([league.genome for league in population])
+    state["fitness"] = population_fitness(population)
+    state["random_state"] = random.getstate()
+    state["numpy_state"] = np.random.get_state()
+    return state
+
+def _migrate(states, targets, n_migrants):
+    """Copy the n_migrants best leagues of every island over the worst leagues of its targets."""
+    # Everybody leaves at the same time: pick all the emigrants before replacing anyone
+    emigrants = []
+    for state in states:
+        best = np.argsort(state["fitness"], kind="stable")[:n_migrants]
+        emigrants.append((state["genomes"][best], state["fitness"][best]))
+
+    for i, state in enumerate(states):
+        arriving = [emigrants[j] for j in range(len(states)) if i in targets[j]]
+        if not arriving:
+            continue
+        genomes = np.concatenate([genomes for genomes, _ in arriving])[:len(state["genomes"])]
+        fitness = np.concatenate([fitness for _, fitness in arriving])[:len(state["genomes"])]
+
+        worst = np.argsort(state["fitness"], kind="stable")[::-1][:len(genomes)]
+        state["genomes"][worst] = genomes
+        state["fitness"][worst] = fitness
+
+def run_island_model(
+    filepath=None,
+    n_islands=4,
+    island_params=None,
+    migration_interval=5,
+    n_migrants=1,
+    topology="ring",
+    POP_SIZE=50,
+    max_gen=100,
+    players=None,
+    seed=None,
+    n_workers=None,
+    cache_size=100_000,
+    verbose=False,
+    spec=None,
+    **ga_params
+):
+    """
+    Island-model GA: n_islands subpopulations of POP_SIZE leagues evolve in separate
+    processes and, every migration_interval generations, send copies of their n_migrants
+    best leagues to their neighbours in the topology ("ring" or "fully_connected"),
+    where they replace the worst leagues.
+
+    Parameters:
+    -----------
+    ga_params : keyword arguments of next_generation (elitism, mutation, mut_prob, crossover,
+        xo_prob, selection_algorithm) shared by all the islands.
+    island_params : optional list of n_islands dicts overriding ga_params per island,
+        e.g. to give every island its own mutation and crossover.
+    n_workers : number of processes (None: one per island, 1: run everything in this process).
+        Operators must be module-level functions to be sent to the worker processes.
+    seed : master seed; each island gets its own stream derived from it, so the results
+        do not depend on n_workers.
+    spec : ProblemSpec of the leagues (DEFAULT_SPEC when not given).
+
+    Returns:
+    --------
+    tuple : (League, float, list)
+        The best league over all islands, its fitness, and the best fitness over all the
+        islands at each generation (the format of run_algorithm and of the fitness_logs).
+    """
+    if island_params is None:
+        island_params = [{}] * n_islands
+    if len(island_params) != n_islands:
+        raise ValueError(f"Expected {n_islands} island parameter sets, got {len(island_params)}.")
+    if players is None:
+        players = load_players_from_csv(filepath)
+
+    targets = migration_targets(n_islands, topology)
+    seeds = np.random.SeedSequence(seed).generate_state(n_islands)
+    states = [
+        {
+            "params": {**ga_params, **island_params[i]},
+            "pop_size": POP_SIZE,
+            "seed": int(seeds[i]),
+            "random_state": None,
+            "numpy_state": None,
+            "genomes": None,
+            "fitness": None,
+            "convergence": [],
+        }
+        for i in range(n_islands)
+    ]
+
+    def evolve_all(map_islands):
+        nonlocal states
+        gen = 0
+        while gen < max_gen:
+            n_generations = min(migration_interval, max_gen - gen)
+            states = list(map_islands(_evolve_island, states, [n_generations] * n_islands))
+            gen += n_generations
+            if verbose:
+                print(f"Gen {gen} best fitness per island: {[s['convergence'][-1] for s in states]}")
+            if gen < max_gen and n_islands > 1:
+                _migrate(states, targets, n_migrants)
+
+    if n_workers == 1:
+        _init_island_worker(players, cache_size, spec)
+        evolve_all(map)
+    else:
+        with ProcessPoolExecutor(max_workers=n_workers or n_islands, initializer=_init_island_worker,
+                                 initargs=(players, cache_size, spec)) as executor:
+            evolve_all(executor.map)
+
+    # Merge: best fitness over all the islands at each generation
+    convergence = np.min([state["convergence"] for state in states], axis=0).tolist()
+
+    best_island = min(states, key=lambda state: state["fitness"].min())
+    best_idx = int(np.argmin(best_island["fitness"]))
+    best_ind = League.from_genome(Roster(players), best_island["genomes"][best_idx].copy(), spec=spec)
+    return best_ind, calculate_fitness(best_ind), convergence
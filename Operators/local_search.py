@@ -0,0 +1,97 @@
+import numpy as np
+
+# Smallest decrease of the sum of squared team skill sums counted as an improvement
+# (below it, differences are rounding noise)
+IMPROVEMENT_TOLERANCE = 1e-9
+
+# Leagues improved by the local search of run_algorithm
+LOCAL_SEARCH_TARGETS = ("elite", "all")
+
+
+def swap_neighbourhood(league):
+    """
+    Score every swap of two players of the same position between two different teams,
+    the moves of single_player_swap_2teams, from the league's cached team sums.
+
+    Arrays are indexed by (team 1, slot 1, team 2, slot 2), with team 1 < team 2: the swap
+    exchanges genome[team 1, slot 1] and genome[team 2, slot 2]. A swap only changes the
+    skill and salary sums of its two teams, and the total skill is fixed, so the change of
+    the sum of squared team skill sums ranks the swaps like the fitness does.
+
+    Returns:
+    --------
+    tuple : (delta, feasible)
+        Change of the sum of squared team skill sums of every swap, and whether the swap
+        is a same-position swap keeping both teams within the salary cap.
+    """
+    league._refresh()
+    roster, cap, genome = league.roster, league.spec.salary_cap, league.genome
+    n_teams = len(genome)
+    skill, cost, position = roster.skill[genome], roster.cost[genome], roster.position[genome]
+    sums, salary = league._team_skill, league._team_salary
+
+    # Skill and salary the first player brings to the second team (and takes from the first)
+    shift = skill[:, :, None, None] - skill[None, None, :, :]
+    saving = cost[:, :, None, None] - cost[None, None, :, :]
+    sums1, sums2 = sums[:, None, None, None], sums[None, None, :, None]
+    delta = (sums1 - shift) ** 2 + (sums2 + shift) ** 2 - sums1 ** 2 - sums2 ** 2
+
+    teams = np.arange(n_teams)
+    feasible = (position[:, :, None, None] == position[None, None, :, :]) \
+               & (teams[:, None, None, None] < teams[None, None, :, None]) \
+               & (salary[:, None, None, None] - saving <= cap) \
+               & (salary[None, None, :, None] + saving <= cap)
+    return delta, feasible
+
+
+def best_swap(league):
+    """
+    Best improving feasible swap of the neighbourhood, as a move for League.apply_move,
+    or None at a local optimum.
+
+    Returns:
+    --------
+    tuple : (move or None, number of swaps scanned)
+    """
+    delta, feasible = swap_neighbourhood(league)
+    scanned = int(feasible.sum())
+    if not scanned:
+        return None, 0
+    scores = np.where(feasible, delta, np.inf)
+    best = int(np.argmin(scores))
+    if scores.flat[best] > -IMPROVEMENT_TOLERANCE:
+        return None, scanned
+    team1, slot1, team2, slot2 = np.unravel_index(best, scores.shape)
+    genome = league.genome
+    return ([team1, team2], [slot1, slot2], [genome[team2, slot2], genome[team1, slot1]]), scanned
+
+
+def hill_climb(league, max_steps=100):
+    """
+    Steepest-descent hill climbing over the same-position swap neighbourhood: apply the
+    best improving feasible swap until none is left (a local optimum) or max_steps swaps
+    were made. The league is modified in place; invalid leagues are left unchanged.
+
+    Parameters:
+    -----------
+    league : League
+        League to improve.
+    max_steps : int, optional
+        Maximum number of swaps (None: until a local optimum).
+
+    Returns:
+    --------
+    tuple : (int, int)
+        Swaps applied, and swaps scanned over all the steps.
+    """
+    if not league.is_valid():
+        return 0, 0
+    steps = scanned = 0
+    while max_steps is None or steps < max_steps:
+        move, n_scanned = best_swap(league)
+        scanned += n_scanned
+        if move is None:
+            break
+        league.apply_move(*move)
+        steps += 1
+    return steps, scanned
@@ -1,80 +1,657 @@
+import csv
 import random
+import weakref
+from collections import OrderedDict
 import numpy as np
-import pandas as pd
+
+# Position order used for the integer position codes of the roster table
+POSITIONS = ["GK", "DEF", "MID", "FWD"]
+# Required number of players per position in every team
+FORMATION = {"GK": 1, "DEF": 2, "MID": 2, "FWD": 2}
+FORMATION_COUNTS = np.array([FORMATION[pos] for pos in POSITIONS])
+# Fitness of a league breaking a constraint (above any standard deviation of valid skills)
+INVALID_FITNESS = 9999
+# Fitness of invalid leagues: all equal ("flat") or ranked by their violations ("graded")
+PENALTIES = ("flat", "graded")
+
+# dtype of the genome: player indices into the roster table
+GENE_DTYPE = np.int32
+
+class ProblemSpec:
+    """
+    Description of the league to build: number of teams, formation of every team,
+    salary cap of every team, and the fitness given to leagues that break a constraint.
+
+    Every League carries a spec (the default one, 5 teams of 1 GK, 2 DEF, 2 MID and 2 FWD
+    under a 750M cap, unless told otherwise) and its children inherit it. The formation
+    may only use the positions of POSITIONS, which are the position codes of the Roster.
+
+    `penalty` sets the fitness of invalid leagues: "flat" gives them all invalid_fitness,
+    "graded" gives them invalid_fitness plus the size of their violations (see
+    ConstraintReport.violation), so that nearly valid leagues rank before the others.
+    Either way, every invalid league ranks after every valid one (fitness >= invalid_fitness).
+    """
+    def __init__(self, num_teams=5, formation=None, salary_cap=750, invalid_fitness=INVALID_FITNESS,
+                 penalty="flat"):
+        formation = dict(FORMATION if formation is None else formation)
+        unknown = set(formation) - set(POSITIONS)
+        if unknown:
+            raise ValueError(f"Unknown positions in the formation: {sorted(unknown)}")
+        if num_teams < 1:
+            raise ValueError("A league needs at least one team.")
+        if penalty not in PENALTIES:
+            raise ValueError(f"Unknown penalty {penalty!r}, expected one of {PENALTIES}.")
+
+        self.num_teams = num_teams
+        self.formation = {pos: formation.get(pos, 0) for pos in POSITIONS}
+        self.salary_cap = salary_cap
+        self.invalid_fitness = invalid_fitness
+        self.penalty = penalty
+        # Players per position in POSITIONS order, and positions actually used by the teams
+        self.formation_counts = np.array([self.formation[pos] for pos in POSITIONS])
+        self.positions = [pos for pos in POSITIONS if self.formation[pos]]
+        self.formation_counts.flags.writeable = False
+
+    @property
+    def team_size(self):
+        return int(self.formation_counts.sum())
+
+    @property
+    def num_players(self):
+        """Number of players the league is made of."""
+        return self.num_teams * self.team_size
+
+    @property
+    def total_budget(self):
+        return self.num_teams * self.salary_cap
+
+    def describe_formation(self):
+        return ", ".join(f"{count} {pos}" for pos, count in self.formation.items() if count)
+
+    def is_valid_fitness(self, fitness):
+        """True for the fitness of a valid league (works on arrays too)."""
+        return fitness < self.invalid_fitness
+
+    def __eq__(self, other):
+        return isinstance(other, ProblemSpec) and \
+               (self.num_teams, self.formation, self.salary_cap, self.invalid_fitness, self.penalty) == \
+               (other.num_teams, other.formation, other.salary_cap, other.invalid_fitness, other.penalty)
+
+    def __hash__(self):
+        return hash((self.num_teams, tuple(self.formation.values()), self.salary_cap, self.invalid_fitness,
+                     self.penalty))
+
+    def __repr__(self):
+        return (f"ProblemSpec(num_teams={self.num_teams}, formation={self.formation}, "
+                f"salary_cap={self.salary_cap}, invalid_fitness={self.invalid_fitness}, penalty={self.penalty!r})")
+
+# The problem of the project: 5 teams of 1 GK, 2 DEF, 2 MID, 2 FWD under a 750M cap
+DEFAULT_SPEC = ProblemSpec()
+
+def _resolve_spec(spec, num_teams=None):
+    """Spec to use when a function accepts either a ProblemSpec or just a number of teams."""
+    if spec is None:
+        return DEFAULT_SPEC if num_teams in (None, DEFAULT_SPEC.num_teams) else ProblemSpec(num_teams)
+    if num_teams is not None and num_teams != spec.num_teams:
+        raise ValueError(f"num_teams={num_teams} contradicts the spec ({spec.num_teams} teams).")
+    return spec
 
 class Player:
-    def __init__(self, name, position, skill, cost):
-        self.name = name
-        self.position = position
-        self.skill = skill
-        self.cost = cost
+    """
+    One roster entry, immutable and interned: building a player equal to an existing one
+    returns the existing instance, so there is one Player per roster entry however many
+    leagues, teams, rosters or copies refer to it (deepcopy returns the same object too).
+    """
+    __slots__ = ("name", "position", "skill", "cost", "__weakref__")
+    _interned = weakref.WeakValueDictionary()
+
+    def __new__(cls, name, position, skill, cost):
+        # The types are part of the key: 106 == 106.0, but a player built with either keeps it
+        key = (name, position, skill, type(skill), cost, type(cost))
+        player = cls._interned.get(key)
+        if player is None:
+            player = super().__new__(cls)
+            for attribute, value in zip(("name", "position", "skill", "cost"), (name, position, skill, cost)):
+                object.__setattr__(player, attribute, value)
+            cls._interned[key] = player
+        return player
+
+    def __setattr__(self, attribute, value):
+        raise AttributeError("Player is immutable")
+
+    def __delattr__(self, attribute):
+        raise AttributeError("Player is immutable")
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __reduce__(self):
+        # Unpickled players (e.g. in grid-search workers) are interned in the new process
+        return Player, (self.name, self.position, self.skill, self.cost)
 
     def __str__(self):
         return f"{self.name} ({self.position}) - Skill: {self.skill}, Cost: {self.cost}M"
-    
-class Team:
+
+class Roster:
+    """
+    Shared, read-only table of all the players of an instance.
+
+    Row i describes self.players[i] through three columns (position code, skill and cost),
+    so a League only needs to store player indices into this table. Every League built
+    from the same players points to the same Roster, which is never copied.
+    """
     def __init__(self, players):
-        self.players = players  # players is a list of Player objects
+        self.players = list(players)
+
+        # First row of each name, so duplicated names map to the same index
+        self.index = {}
+        for i, player in enumerate(self.players):
+            self.index.setdefault(player.name, i)
+
+        # Columns (unknown positions are coded as -1)
+        self.position = np.array(
+            [POSITIONS.index(p.position) if p.position in POSITIONS else -1 for p in self.players],
+            dtype=np.int8
+        )
+        self.skill = np.array([p.skill for p in self.players], dtype=float)
+        self.cost = np.array([p.cost for p in self.players], dtype=float)
+        # One-hot position matrix: summing its rows over a team gives the formation counts
+        self.position_onehot = (self.position[:, None] == np.arange(len(POSITIONS))).astype(np.int8)
+
+        for column in (self.position, self.skill, self.cost, self.position_onehot):
+            column.flags.writeable = False
+
+    def indices(self, players):
+        """Return the roster indices of a list of players (matched by name)."""
+        return np.array([self.index[p.name] for p in players], dtype=GENE_DTYPE)
+
+    def __len__(self):
+        return len(self.players)
+
+    def __deepcopy__(self, memo):
+        # Read-only and shared by design
+        return self
+
+class FitnessCache:
+    """
+    Bounded LRU transposition table mapping a canonical league key to its fitness.
+
+    The key ignores the order of the teams and the order of the players inside each team,
+    so every league that is a relabelling of an already scored one is a hit. Keys are
+    roster indices: share a cache only between leagues built on the same roster (e.g. the
+    repeated runs of one grid-search configuration, which all load the same CSV) and the
+    same ProblemSpec.
+    """
+    def __init__(self, max_size=100_000):
+        self.max_size = max_size
+        self._table = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def key(league):
+        # Sort players inside each team, then sort the teams lexicographically
+        genes = np.sort(league.genome, axis=1)
+        genes = genes[np.lexsort(genes.T[::-1])]
+        return genes.tobytes()
+
+    def lookup(self, league, evaluate):
+        """Return the cached fitness of `league`, calling `evaluate()` and storing it on a miss."""
+        key = self.key(league)
+        fitness = self.get(key)
+        if fitness is None:
+            fitness = evaluate()
+            self.put(key, fitness)
+        return fitness
+
+    def get(self, key):
+        """Cached fitness of a key (a hit), or None (a miss): lookup in two steps, for batches."""
+        fitness = self._table.get(key)
+        if fitness is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._table.move_to_end(key)
+        return fitness
+
+    def put(self, key, fitness):
+        self._table[key] = fitness
+        if len(self._table) > self.max_size:
+            self._table.popitem(last=False)
+            self.evictions += 1
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._table),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+    def clear(self):
+        self._table.clear()
+        self.hits = self.misses = self.evictions = 0
+
+    def __len__(self):
+        return len(self._table)
+
+    def __deepcopy__(self, memo):
+        # Shared by every league that points to it
+        return self
+
+class ConstraintReport:
+    """
+    Constraint violations of a league (or of teams), computed without raising an error:
+    see check_constraints.
+
+    Attributes:
+    -----------
+    missing_teams : int
+        Teams missing to reach spec.num_teams (negative: too many teams).
+    formation_deficit : np.ndarray
+        (teams x positions, POSITIONS order) players missing from each position
+        (negative: players in excess). Players of unknown positions count in no position.
+    unknown_positions : np.ndarray
+        Players of each team whose position is not one of POSITIONS.
+    salary_overage : np.ndarray
+        Salary above the cap of each team (0 for the teams within the cap).
+    duplicate_players : np.ndarray
+        Roster indices of the players placed in more than one slot.
+    duplicate_slots : int
+        Slots holding a player already placed in another slot.
+    """
+    def __init__(self, roster, genome, spec, missing_teams, formation_deficit, unknown_positions,
+                 salary_overage, duplicate_players, duplicate_slots):
+        self.roster = roster
+        self.genome = genome
+        self.spec = spec
+        self.missing_teams = missing_teams
+        self.formation_deficit = formation_deficit
+        self.unknown_positions = unknown_positions
+        self.salary_overage = salary_overage
+        self.duplicate_players = duplicate_players
+        self.duplicate_slots = duplicate_slots
+
+    @property
+    def feasible(self):
+        return (self.missing_teams == 0 and not self.formation_deficit.any() and not self.unknown_positions.any()
+                and not self.salary_overage.any() and not self.duplicate_slots)
+
+    def violation(self):
+        """
+        Size of the violations, 0 for a valid league: one unit per player missing from a
+        position (a missing team counts as a full team of them) and per duplicated slot,
+        plus the salary above the caps in units of an average player's salary
+        (salary_cap / team size).
+        """
+        return (abs(self.missing_teams) * self.spec.team_size
+                + float(np.maximum(self.formation_deficit, 0).sum())
+                + self.duplicate_slots
+                + float(self.salary_overage.sum()) / (self.spec.salary_cap / self.spec.team_size))
+
+    def errors(self):
+        """Description of every violation, in the order validate_league reports them."""
+        errors = []
+        if self.missing_teams:
+            errors.append(f"The league must have exactly {self.spec.num_teams} teams.")
+        for t, genes in enumerate(self.genome):
+            if self.unknown_positions[t]:
+                invalid = self.roster.players[genes[np.argmax(self.roster.position[genes] < 0)]]
+                errors.append(f"Invalid player position: {invalid.position}")
+            elif self.formation_deficit[t].any():
+                errors.append(f"Each team must have {self.spec.describe_formation()}.")
+            if self.salary_overage[t] > 0:
+                errors.append(f"Team salary exceeds the cap: {self.roster.cost[genes].sum()}M")
+        for gene in self.duplicate_players:
+            errors.append(f"Player {self.roster.players[gene].name} is already in another team.")
+        return errors
+
+    def __repr__(self):
+        return f"ConstraintReport(feasible={self.feasible}, violation={self.violation():.3f})"
+
+def check_constraints(roster, genome, spec=None, check_team_count=True):
+    """
+    Check every constraint of a (teams x players per team) genome without raising:
+    number of teams (unless check_team_count is False, for single teams), formation and
+    salary cap of every team, and unique players.
+
+    Returns:
+    --------
+    ConstraintReport
+    """
+    spec = spec if spec is not None else DEFAULT_SPEC
+    genome = np.asarray(genome)
+    counts = roster.position_onehot[genome].sum(axis=1)
+    genes = np.sort(genome.ravel())
+    repeated = genes[1:] == genes[:-1]
+    return ConstraintReport(
+        roster, genome, spec,
+        missing_teams=spec.num_teams - len(genome) if check_team_count else 0,
+        formation_deficit=spec.formation_counts - counts,
+        unknown_positions=(roster.position[genome] < 0).sum(axis=1),
+        salary_overage=np.maximum(roster.cost[genome].sum(axis=1) - spec.salary_cap, 0),
+        duplicate_players=np.unique(genes[1:][repeated]),
+        duplicate_slots=int(repeated.sum()),
+    )
+
+class Team:
+    """
+    A team is a thin view over one row of player indices into a Roster.
+
+    `players` builds the Player list on demand; assign a new list to `team.players`
+    to change the team (the list it returns is a fresh copy). Teams obtained from
+    `league.teams` mark themselves dirty in their league when reassigned.
+    The formation and salary cap are read from `spec` (DEFAULT_SPEC when not given).
+    """
+    def __init__(self, players, roster=None, spec=None):
+        self.roster = roster if roster is not None else Roster(players)
+        self.genes = self.roster.indices(players)
+        self.spec = spec if spec is not None else DEFAULT_SPEC
+        self._league = None
+        self._index = None
         self.validate_team()
 
+    @classmethod
+    def view(cls, roster, genes, league=None, index=None, spec=None):
+        """Build a Team over an existing row of indices without copying or validating it."""
+        team = cls.__new__(cls)
+        team.roster = roster
+        team.genes = genes
+        if spec is None:
+            spec = league.spec if league is not None else DEFAULT_SPEC
+        team.spec = spec
+        team._league = league
+        team._index = index
+        return team
+
+    @property
+    def players(self):
+        return [self.roster.players[i] for i in self.genes]
+
+    @players.setter
+    def players(self, players):
+        genes = self.roster.indices(players)
+        if len(genes) != len(self.genes):
+            raise ValueError(f"A team must keep {len(self.genes)} players, got {len(genes)}.")
+        if self._league is not None:
+            # The league's genome may be shared with a copy: write to the league's own row
+            self.genes = self._league.own_genome()[self._index]
+        self.genes[:] = genes
+        if self._league is not None:
+            self._league.mark_dirty(self._index)
+
+    def check_constraints(self):
+        """ConstraintReport of the team alone (formation, salary cap, unique players)."""
+        return check_constraints(self.roster, self.genes[None], self.spec, check_team_count=False)
+
     def validate_team(self):
-        positions = {"GK": 0, "DEF": 0, "MID": 0, "FWD": 0}
-        for player in self.players:
-            if player.position not in positions:
-                raise ValueError(f"Invalid player position: {player.position}")
-            positions[player.position] += 1
-
-        # Check the required structure
-        if positions["GK"] != 1 or positions["DEF"] != 2 or positions["MID"] != 2 or positions["FWD"] != 2:
-            raise ValueError("Each team must have 1 GK, 2 DEF, 2 MID, and 2 FWD.")
-
-        # Check if the team exceeds salary cap
-        total_salary = sum(player.cost for player in self.players)
-        if total_salary > 750:
-            raise ValueError(f"Team salary exceeds the cap: {total_salary}M")
-        
+        report = self.check_constraints()
+        if not report.feasible:
+            raise ValueError(report.errors()[0])
+
     def get_total_salary(self):
-        return sum(player.cost for player in self.players)
-    
+        return self.roster.cost[self.genes].sum()
+
     def get_average_skill(self):
-        return sum(player.skill for player in self.players) / len(self.players)
+        return self.roster.skill[self.genes].mean()
+
+    def __deepcopy__(self, memo):
+        return Team.view(self.roster, self.genes.copy(), spec=self.spec)
 
     def __str__(self):
         return "\n".join([str(player) for player in self.players])
 
 class League:
-    def __init__(self, teams):
-        self.teams = teams
+    """
+    A league is stored as a (teams x players per team) integer array of player indices
+    (the genome) into a shared Roster. `teams` exposes Team views over its rows, so copying
+    a league only copies the genome and a few per-team statistics.
+
+    Fitness and validity are memoized. The per-team skill sums, salary sums and formation
+    checks are cached too, and only the teams marked dirty are recomputed: code that edits
+    `genome` rows directly must call `mark_dirty` with the indices of the touched teams.
+    Moves that rearrange players between slots of the same position (swaps, shifts) can
+    instead be scored with `move_delta` and applied with `apply_move`.
+
+    Copies are copy-on-write: `copy` shares the genome and the team statistics with the
+    child and freezes them (read-only), and whichever league writes first gets its own
+    arrays. Code that edits `genome` directly must call `own_genome` before writing.
+    When `cache` is set to a FitnessCache, leagues already scored elsewhere are looked up
+    instead of being validated again; children inherit the cache of their parent.
+    The constraints come from `spec` (a ProblemSpec), which children inherit as well.
+    """
+    def __init__(self, teams, spec=None):
+        if spec is None:
+            spec = teams[0].spec if teams else DEFAULT_SPEC
+        rosters = {id(team.roster) for team in teams}
+        if len(rosters) == 1:
+            roster = teams[0].roster
+            genome = np.array([team.genes for team in teams], dtype=GENE_DTYPE)
+        else:
+            # Teams built independently: gather their players into a common roster
+            players = [p for team in teams for p in team.players]
+            roster = Roster(players)
+            genome = roster.indices(players).reshape(len(teams), -1) if teams else \
+                     np.empty((0, spec.team_size), dtype=GENE_DTYPE)
+
+        self.roster = roster
+        self.genome = genome
+        self.spec = spec
+        self.cache = None
+        self._reset_stats()
         self.validate_league()
-                
-    def validate_league(self):
-        if len(self.teams) != 5:
-            raise ValueError("The league must have exactly 5 teams.")
 
-        player_names = set()
-        for team in self.teams:
-            # Explicitly call team.validate_team()
-            team.validate_team()
+    @classmethod
+    def from_genome(cls, roster, genome, cache=None, spec=None):
+        """Build a League directly from a genome array, without copying or validating it."""
+        league = cls.__new__(cls)
+        league.roster = roster
+        league.genome = genome
+        league.spec = spec if spec is not None else DEFAULT_SPEC
+        league.cache = cache
+        league._reset_stats()
+        return league
+
+    def _reset_stats(self):
+        n_teams = len(self.genome)
+        self._team_skill = np.zeros(n_teams)
+        self._team_salary = np.zeros(n_teams)
+        self._team_formation = np.zeros(n_teams, dtype=bool)
+        # Running totals over the teams: skill, squared team skill sums, teams over the cap
+        self._skill_total = 0.0
+        self._skill_sq = 0.0
+        self._n_over_cap = 0
+        self._dirty = set(range(n_teams))
+        # Team count, formations and unique players: everything but the salary caps
+        self._structure = None
+        self._valid = None
+        self._fitness = None
+
+    def mark_dirty(self, *team_indices):
+        """Flag teams whose players changed, so their statistics and the fitness get recomputed."""
+        self._dirty.update(team_indices)
+        self._structure = None
+        self._valid = None
+        self._fitness = None
+
+    def own_genome(self):
+        """Return the genome ready to be written, copying it first if it is shared with a copy."""
+        if not self.genome.flags.writeable:
+            self.genome = self.genome.copy()
+        return self.genome
+
+    def _own_stats(self):
+        # Same for the per-team statistics, written when dirty teams are refreshed
+        if not self._team_skill.flags.writeable:
+            self._team_skill = self._team_skill.copy()
+            self._team_salary = self._team_salary.copy()
+            self._team_formation = self._team_formation.copy()
+
+    def _refresh(self):
+        """Recompute the cached statistics of the dirty teams only."""
+        if not self._dirty:
+            return
+        self._own_stats()
+        dirty = sorted(self._dirty)
+        genes = self.genome[dirty]
+        # Skills are added in roster order so the sums do not depend on the slot order
+        self._team_skill[dirty] = self.roster.skill[np.sort(genes, axis=1)].sum(axis=1)
+        self._team_salary[dirty] = self.roster.cost[genes].sum(axis=1)
+        counts = self.roster.position_onehot[genes].sum(axis=1)
+        self._team_formation[dirty] = (counts == self.spec.formation_counts).all(axis=1)
+        self._skill_total = float(self._team_skill.sum())
+        self._skill_sq = float(self._team_skill @ self._team_skill)
+        self._n_over_cap = int((self._team_salary > self.spec.salary_cap).sum())
+        self._dirty.clear()
+
+    def _structure_ok(self):
+        if self._structure is None:
+            self._refresh()
+            genes = self.genome.ravel().tolist()
+            self._structure = len(self.genome) == self.spec.num_teams and bool(self._team_formation.all()) \
+                              and len(set(genes)) == len(genes)
+        return self._structure
+
+    def _std_from_sums(self, skill_sq):
+        # Standard deviation of the team averages from the sums of (squared) team skill sums,
+        # the total skill being the same for every arrangement of the league's players
+        n_teams, team_size = self.genome.shape
+        mean = self._skill_total / (n_teams * team_size)
+        variance = skill_sq / (n_teams * team_size ** 2) - mean * mean
+        return max(variance, 0.0) ** 0.5
 
-            for player in team.players:
-                if player.name in player_names:
-                    raise ValueError(f"Player {player.name} is already in another team.")
-                player_names.add(player.name)
+    def move_delta(self, teams, slots, players):
+        """
+        Score a move before making it (and before copying the league): player index
+        `players[k]` goes into slot `slots[k]` of team `teams[k]`. The move must rearrange
+        players of this league between slots of the same position, as the swap and shift
+        mutations do, so formations and unique players are unchanged.
 
+        Returns (fitness delta, feasible), computed from the running team sums in
+        O(number of changed slots). The delta comes from the sum of squares and may differ
+        from a full recomputation in the last digits.
+        """
+        self._refresh()
+        skill, cost = self.roster.skill, self.roster.cost
+        cap = self.spec.salary_cap
+        new_skill, new_salary = {}, {}
+        for t, s, p in zip(teams, slots, players):
+            old = self.genome[t, s]
+            new_skill[t] = new_skill.get(t, self._team_skill[t]) + skill[p] - skill[old]
+            new_salary[t] = new_salary.get(t, self._team_salary[t]) + cost[p] - cost[old]
+
+        skill_sq = self._skill_sq
+        n_over_cap = self._n_over_cap
+        for t in new_skill:
+            skill_sq += new_skill[t] ** 2 - self._team_skill[t] ** 2
+            n_over_cap += int(new_salary[t] > cap) - int(self._team_salary[t] > cap)
+
+        delta = self._std_from_sums(skill_sq) - self._std_from_sums(self._skill_sq)
+        return delta, self._structure_ok() and n_over_cap == 0
+
+    def apply_move(self, teams, slots, players):
+        """Apply a move scored with move_delta, updating only the touched teams' statistics."""
+        structure = self._structure_ok()
+        self.own_genome()[teams, slots] = players
+        self.mark_dirty(*teams)
+        self._refresh()
+        # A same-position rearrangement keeps formations and unique players
+        self._structure = structure
+
+    @property
+    def teams(self):
+        return [Team.view(self.roster, genes, self, i) for i, genes in enumerate(self.genome)]
+
+    def copy(self):
+        """
+        Return a child League sharing the roster, the genome and the team statistics with
+        this one until either of them is modified (copy on write), so that a copy costs a
+        few pointers and a child left unchanged never copies any array.
+        """
+        # Frozen arrays: the first write on either side copies them (own_genome, _own_stats)
+        for array in (self.genome, self._team_skill, self._team_salary, self._team_formation):
+            array.flags.writeable = False
+        child = League.__new__(League)
+        child.roster = self.roster
+        child.genome = self.genome
+        child.spec = self.spec
+        child.cache = self.cache
+        child._team_skill = self._team_skill
+        child._team_salary = self._team_salary
+        child._team_formation = self._team_formation
+        child._skill_total = self._skill_total
+        child._skill_sq = self._skill_sq
+        child._n_over_cap = self._n_over_cap
+        child._dirty = self._dirty.copy()
+        child._structure = self._structure
+        child._valid = self._valid
+        child._fitness = self._fitness
+        return child
+
+    def __deepcopy__(self, memo):
+        return self.copy()
+
+    def __setstate__(self, state):
+        # Arrays shared by copies pickled together come back writable: freeze them again
+        self.__dict__.update(state)
+        for array in (self.genome, self._team_skill, self._team_salary, self._team_formation):
+            array.flags.writeable = False
+
+    def position_slots(self, team_idx, position):
+        """Return the slots of team `team_idx` holding players of the given position."""
+        code = POSITIONS.index(position)
+        return np.flatnonzero(self.roster.position[self.genome[team_idx]] == code)
+
+    def check_constraints(self):
+        """ConstraintReport of the league: every violation, without raising."""
+        return check_constraints(self.roster, self.genome, self.spec)
+
+    def validate_league(self):
+        """Raise a ValueError describing the first violated constraint, if any."""
+        report = self.check_constraints()
+        if not report.feasible:
+            raise ValueError(report.errors()[0])
 
     def is_valid(self):
-        try:
-            self.validate_league()
-            return True
-        except ValueError:
-            return False
+        if self._valid is None:
+            self.get_fitness()
+        return self._valid
 
     def get_skill_std_dev(self):
-        # Calculate average skill for each team
-        avg_skills = [team.get_average_skill() for team in self.teams]
+        # Calculate average skill for each team (sorted, so that the result is the same
+        # bit for bit whatever the order of the teams, as FitnessCache assumes)
+        self._refresh()
+        avg_skills = np.sort(self._team_skill) / self.genome.shape[1]
         # Return the standard deviation of the average skill levels of the teams
         return np.std(avg_skills)
 
+    def _evaluate(self):
+        # Same checks as validate_league, read from the cached statistics
+        if not self._structure_ok() or self._n_over_cap:
+            if self.spec.penalty == "graded":
+                return self.spec.invalid_fitness + self.check_constraints().violation()
+            return self.spec.invalid_fitness
+        return self.get_skill_std_dev()
+
+    def get_fitness(self):
+        """
+        Memoized fitness: the skill standard deviation, or at least spec.invalid_fitness for
+        an invalid league (see ProblemSpec.penalty).
+        """
+        if self._fitness is None:
+            if self.cache is None:
+                self._fitness = self._evaluate()
+            else:
+                self._fitness = self.cache.lookup(self, self._evaluate)
+            self._valid = bool(self.spec.is_valid_fitness(self._fitness))
+        return self._fitness
+
     def __str__(self):
         return "\n\n".join([str(team) for team in self.teams])
 
@@ -84,72 +661,392 @@ def calculate_fitness(league):
 
     1. If league is valid (formations, budget, unique players)
     2. Standard deviation of average skills (our main objective)
+
+    The result is memoized on the league, so it is only computed again
+    after the league changes (see League.mark_dirty).
     """
-    try:
-        league.validate_league()
-    except ValueError as e:
-        #print(f"Fitness validation failed: {e}")
-        return 9999
+    return league.get_fitness()
 
-    # If it's valid, compute and return the standard deviation of average skills
-    return league.get_skill_std_dev()
+def fitness_lower_bound(roster, spec=None):
+    """
+    Lower bound on the fitness of any valid league of `spec` over the roster.
 
-def create_valid_team_from_pool(player_pool):
-    max_attempts = 100
-    for _ in range(max_attempts):
-        gks = [p for p in player_pool if p.position == "GK"]
-        defs = [p for p in player_pool if p.position == "DEF"]
-        mids = [p for p in player_pool if p.position == "MID"]
-        fwds = [p for p in player_pool if p.position == "FWD"]
+    When the league uses every player of the roster, the team skill sums add up to the
+    roster's total skill S. With integer skills they are integers too, so the most
+    balanced split gives r = S mod T of the T teams one point more than the others, and
+    the standard deviation of the average skills is at least sqrt(r * (T - r)) / (T * team size).
+    Otherwise (players left out, or fractional skills) the bound is 0.
+    """
+    spec = _resolve_spec(spec)
+    if len(roster) != spec.num_players or not np.array_equal(roster.skill, np.round(roster.skill)):
+        return 0.0
+    n_teams = spec.num_teams
+    remainder = int(roster.skill.sum()) % n_teams
+    return (remainder * (n_teams - remainder)) ** 0.5 / (n_teams * spec.team_size)
 
-        if len(gks) < 1 or len(defs) < 2 or len(mids) < 2 or len(fwds) < 2:
-            raise ValueError("Not enough players in the pool to form a valid team.")
+def evaluate_genomes(genomes, roster, spec=DEFAULT_SPEC):
+    """
+    Vectorized fitness of a whole population, given as a (POP x teams x players per team)
+    tensor of roster indices. Gives the values calculate_fitness returns for each league
+    of this spec (spec.invalid_fitness, or its graded penalty, for invalid ones), checking
+    all the leagues in a few NumPy operations:
 
-        selected_players = random.sample(gks, 1) + \
-                           random.sample(defs, 2) + \
-                           random.sample(mids, 2) + \
-                           random.sample(fwds, 2)
+    1. Number of teams and formation of every team
+    2. Salary cap of every team
+    3. Unique players inside each league
+    4. Standard deviation of the average team skills
+    """
+    genomes = np.asarray(genomes)
+    n_leagues, n_teams, team_size = genomes.shape
 
-        try:
-            team = Team(selected_players)
-            return team
-        except ValueError:
-            continue
+    counts = roster.position_onehot[genomes].sum(axis=2)
+    formation_ok = (counts == spec.formation_counts).all(axis=(1, 2))
+    salaries = roster.cost[genomes].sum(axis=2)
+    salary_ok = (salaries <= spec.salary_cap).all(axis=1)
+    # Sorted player indices of a league have no equal neighbours iff they are unique
+    genes = np.sort(genomes.reshape(n_leagues, -1), axis=1)
+    repeated = genes[:, 1:] == genes[:, :-1]
+    unique_ok = ~repeated.any(axis=1)
+    valid = formation_ok & salary_ok & unique_ok & (n_teams == spec.num_teams)
 
-    raise ValueError("Failed to create a valid team after many attempts.")
+    avg_skills = np.sort(roster.skill[np.sort(genomes, axis=2)].sum(axis=2), axis=1) / team_size
+    penalty = spec.invalid_fitness
+    if spec.penalty == "graded":
+        # ConstraintReport.violation of every league, summed in the same order
+        violation = np.full(n_leagues, abs(spec.num_teams - n_teams) * spec.team_size, dtype=float)
+        violation += np.maximum(spec.formation_counts - counts, 0).sum(axis=(1, 2))
+        violation += repeated.sum(axis=1)
+        violation += np.maximum(salaries - spec.salary_cap, 0).sum(axis=1) / (spec.salary_cap / spec.team_size)
+        penalty = spec.invalid_fitness + violation
+    return np.where(valid, np.std(avg_skills, axis=1), penalty)
+
+def population_fitness(population):
+    """
+    Return the fitness vector of a population. Memoized values are reused, the leagues
+    not evaluated yet are looked up in their FitnessCache (if any), and the remaining ones
+    are scored together with evaluate_genomes and stored in it.
+    """
+    fitness = np.array([np.nan if league._fitness is None else league._fitness for league in population])
+    missing = np.flatnonzero(np.isnan(fitness))
+    if not missing.size:
+        return fitness
+
+    pending = [population[i] for i in missing]
+    roster, shape, spec = pending[0].roster, pending[0].genome.shape, pending[0].spec
+    if all(league.roster is roster and league.genome.shape == shape and league.spec == spec
+           for league in pending):
+        # 1) Transposition table
+        keys = [league.cache.key(league) if league.cache is not None else None for league in pending]
+        unknown = []
+        for k, (league, key) in enumerate(zip(pending, keys)):
+            value = league.cache.get(key) if key is not None else None
+            if value is None:
+                unknown.append(k)
+            else:
+                fitness[missing[k]] = value
+        # 2) One batch for the others
+        if unknown:
+            values = evaluate_genomes(np.stack([pending[k].genome for k in unknown]), roster, spec)
+            for k, value in zip(unknown, values):
+                fitness[missing[k]] = value
+                if keys[k] is not None:
+                    pending[k].cache.put(keys[k], value)
+        for league, value in zip(pending, fitness[missing]):
+            league._fitness = value
+            league._valid = bool(spec.is_valid_fitness(value))
+    else:
+        fitness[missing] = [calculate_fitness(league) for league in pending]
+    return fitness
+
+def _sample_team(player_pool, roster, spec, max_attempts=100):
+    """
+    Random valid team drawn from the pool, or None when the pool lacks players of a
+    position or no draw fits under the salary cap within max_attempts.
+    """
+    by_position = {pos: [p for p in player_pool if p.position == pos] for pos in spec.positions}
+    if any(len(by_position[pos]) < spec.formation[pos] for pos in spec.positions):
+        return None
+
+    for _ in range(max_attempts):
+        selected_players = [p for pos in spec.positions for p in random.sample(by_position[pos], spec.formation[pos])]
+        # The formation holds by construction: only the salary cap can fail
+        if sum(p.cost for p in selected_players) <= spec.salary_cap:
+            return Team(selected_players, roster, spec)
+    return None
+
+def create_valid_team_from_pool(player_pool, roster=None, spec=None):
+    spec = _resolve_spec(spec)
+    by_position = {pos: [p for p in player_pool if p.position == pos] for pos in spec.positions}
+    if any(len(by_position[pos]) < spec.formation[pos] for pos in spec.positions):
+        raise ValueError("Not enough players in the pool to form a valid team.")
+
+    team = _sample_team(player_pool, roster, spec)
+    if team is None:
+        raise ValueError("Failed to create a valid team after many attempts.")
+    return team
+
+def create_valid_league(all_players, num_teams=None, roster=None, spec=None):
+    # The league described by spec (or the default formation and cap with num_teams teams)
+    spec = _resolve_spec(spec, num_teams)
+    # Teams are views over one shared roster
+    if roster is None:
+        roster = Roster(all_players)
 
-def create_valid_league(all_players, num_teams=5):
     max_attempts = 100
     for _ in range(max_attempts):
-        random.shuffle(all_players)
-        available_players = all_players.copy()
+        # Shuffle a copy: the caller's list (and the roster order) stays untouched
+        available_players = list(all_players)
+        random.shuffle(available_players)
         used_names = set()
         teams = []
 
+        for _ in range(spec.num_teams):
+            pool = [p for p in available_players if p.name not in used_names]
+            team = _sample_team(pool, roster, spec)
+            if team is None:
+                break
+            teams.append(team)
+            used_names.update(p.name for p in team.players)
+        else:
+            return League(teams, spec)
+
+    raise ValueError("Failed to create a valid league after many attempts.")
+
+class _UnusedPlayers:
+    """
+    Players of a roster not used yet, with the cost of the cheapest ones of each position.
+
+    Each position keeps its players sorted by cost in two Fenwick trees (count and cost of
+    the unused players), so taking or releasing a player and pricing the k cheapest unused
+    players of a position both take O(log n), whatever the size of the roster.
+    """
+    def __init__(self, roster):
+        self.roster = roster
+        self.used = np.zeros(len(roster), dtype=bool)
+        self._sorted = [sorted(np.flatnonzero(roster.position == code).tolist(), key=lambda p: roster.cost[p])
+                        for code in range(len(POSITIONS))]
+        # Position code and place in the sorted list of every player
+        self._slot = {p: (code, i) for code, ordered in enumerate(self._sorted) for i, p in enumerate(ordered)}
+        self._counts = []
+        self._costs = []
+        self.reset()
+
+    def reset(self):
+        """Mark every player as unused."""
+        self.used[:] = False
+        self._counts, self._costs = [], []
+        for ordered in self._sorted:
+            counts = [0] * (len(ordered) + 1)
+            costs = [0.0] * (len(ordered) + 1)
+            self._counts.append(counts)
+            self._costs.append(costs)
+            for i, p in enumerate(ordered):
+                self._add(counts, costs, i + 1, 1, self.roster.cost[p])
+
+    @staticmethod
+    def _add(counts, costs, i, count, cost):
+        while i < len(counts):
+            counts[i] += count
+            costs[i] += cost
+            i += i & -i
+
+    def take(self, p):
+        code, i = self._slot[p]
+        self.used[p] = True
+        self._add(self._counts[code], self._costs[code], i + 1, -1, -self.roster.cost[p])
+
+    def release(self, p):
+        code, i = self._slot[p]
+        self.used[p] = False
+        self._add(self._counts[code], self._costs[code], i + 1, 1, self.roster.cost[p])
+
+    def cheapest(self, needed):
+        """Lowest total cost of `needed[code]` unused players of each position code (inf if too few)."""
+        total = 0.0
+        for code, k in enumerate(needed):
+            if k == 0:
+                continue
+            counts, costs = self._counts[code], self._costs[code]
+            # Walk down the tree to the k-th cheapest unused player, summing the costs before it
+            i, step = 0, 1 << (len(counts) - 1).bit_length()
+            while step:
+                if i + step < len(counts) and counts[i + step] < k:
+                    i += step
+                    k -= counts[i]
+                    total += costs[i]
+                step >>= 1
+            if i + 1 >= len(counts):
+                return float("inf")
+            total += self.roster.cost[self._sorted[code][i]]
+        return total
+
+def check_league_feasibility(roster, num_teams=None, spec=None):
+    """
+    Raise a ValueError when no valid league of the spec (DEFAULT_SPEC, or the default
+    formation and cap with num_teams teams) can exist in the roster, from necessary
+    conditions that are quick to check:
+
+    1. Enough players of every position for all the formations
+    2. The cheapest possible team fits in the salary cap
+    3. The cheapest possible set of players for all the teams fits in the total budget
+    """
+    spec = _resolve_spec(spec, num_teams)
+    num_teams, counts, cap = spec.num_teams, spec.formation_counts, spec.salary_cap
+    available = np.bincount(roster.position[roster.position >= 0], minlength=len(POSITIONS))
+    for code, position in enumerate(POSITIONS):
+        if available[code] < num_teams * counts[code]:
+            raise ValueError(f"Not enough {position} players for {num_teams} teams: "
+                             f"{available[code]} available, {num_teams * counts[code]} needed.")
+
+    unused = _UnusedPlayers(roster)
+    cheapest_team = unused.cheapest(counts)
+    if cheapest_team > cap:
+        raise ValueError(f"The cheapest possible team costs {cheapest_team}M, above the salary cap.")
+    cheapest_league = unused.cheapest(num_teams * counts)
+    if cheapest_league > spec.total_budget:
+        raise ValueError(f"The cheapest possible players for {num_teams} teams cost {cheapest_league}M, "
+                         f"above the total budget of {spec.total_budget}M.")
+
+class _SearchLimit(Exception):
+    """Raised inside create_feasible_league when an attempt used its search steps."""
+
+def create_feasible_league(players, num_teams=None, roster=None, max_nodes=1_000_000, first_attempt_nodes=None,
+                           spec=None):
+    """
+    Constructive alternative to create_valid_league: builds the teams one after the other,
+    slot by slot, with players tried in a random order, and backtracks when a choice cannot
+    be completed. A candidate is pruned as soon as the team's cost plus the cheapest way to
+    fill its remaining slots exceeds the salary cap, or when the cheapest players left
+    cannot fill the remaining teams within their budget.
+
+    Tight budgets make some random orders much slower than others, so the search restarts
+    with a new random order after first_attempt_nodes choices (by default 30 per player of
+    the league), doubling the limit at every attempt. Each attempt is complete, so a ValueError is raised as soon as one attempt shows
+    that no valid league exists, or once max_nodes choices were tried in total.
+    Call check_league_feasibility first to reject hopeless instances up front.
+    The league follows `spec` (DEFAULT_SPEC, or the default formation and cap with num_teams teams).
+    """
+    spec = _resolve_spec(spec, num_teams)
+    num_teams, cap = spec.num_teams, spec.salary_cap
+    if roster is None:
+        roster = Roster(players)
+
+    # Position code of every slot of a team, e.g. [GK, DEF, DEF, MID, MID, FWD, FWD]
+    slot_positions = [code for code, count in enumerate(spec.formation_counts) for _ in range(count)]
+    unused = _UnusedPlayers(roster)
+    used = unused.used
+    nodes = 0
+
+    def search(node_limit):
+        nonlocal nodes
+        # Random preference order of the players of each position
+        order = []
+        for code in range(len(POSITIONS)):
+            position_players = np.flatnonzero(roster.position == code).tolist()
+            random.shuffle(position_players)
+            order.append(position_players)
+        rank = [{p: i for i, p in enumerate(players_order)} for players_order in order]
+        unused.reset()
+
+        def team_candidates(first_start, teams_after):
+            # Yield every affordable team of unused players, in random order. The players of the
+            # yielded team stay marked as used until the generator is resumed. Teams are
+            # interchangeable, so their first players follow the preference order as well.
+            chosen = []
+            needed = spec.formation_counts.copy()
+            needed_after = teams_after * spec.formation_counts
+
+            def extend(slot, cost):
+                nonlocal nodes
+                if slot == len(slot_positions):
+                    yield list(chosen)
+                    return
+                code = slot_positions[slot]
+                # Players of the same position are taken in preference order, so that every
+                # combination is only tried once
+                if slot == 0:
+                    start = first_start
+                elif slot_positions[slot - 1] == code:
+                    start = rank[code][chosen[-1]] + 1
+                else:
+                    start = 0
+                needed[code] -= 1
+                for p in order[code][start:]:
+                    if used[p]:
+                        continue
+                    nodes += 1
+                    if nodes > node_limit:
+                        raise _SearchLimit()
+                    unused.take(p)
+                    new_cost = cost + roster.cost[p]
+                    # This team must fit in the cap, the next teams in theirs (leaving this team the most
+                    # expensive players), and all the remaining slots in the budget left
+                    if new_cost + unused.cheapest(needed) <= cap and \
+                       unused.cheapest(needed_after) <= cap * teams_after and \
+                       new_cost + unused.cheapest(needed + needed_after) <= cap * (teams_after + 1):
+                        chosen.append(p)
+                        yield from extend(slot + 1, new_cost)
+                        chosen.pop()
+                    unused.release(p)
+                needed[code] += 1
+
+            yield from extend(0, 0.0)
+
+        # Depth-first search over the teams, one generator of candidates per team
+        teams = []
+        stack = [team_candidates(0, num_teams - 1)]
+        while stack:
+            team = next(stack[-1], None)
+            if len(teams) == len(stack):
+                teams.pop()  # the previous candidate of this team was given up
+            if team is None:
+                stack.pop()
+                continue
+            teams.append(team)
+            if len(teams) == num_teams:
+                return League.from_genome(roster, np.array(teams, dtype=GENE_DTYPE), spec=spec)
+            stack.append(team_candidates(rank[slot_positions[0]][team[0]] + 1, num_teams - len(teams) - 1))
+        return None
+
+    attempt_nodes = first_attempt_nodes or 30 * spec.num_players
+    while nodes < max_nodes:
         try:
-            for _ in range(num_teams):
-                pool = [p for p in available_players if p.name not in used_names]
-                team = create_valid_team_from_pool(pool)
-                teams.append(team)
-                used_names.update(p.name for p in team.players)
-            return League(teams)
-        except ValueError:
+            league = search(min(nodes + attempt_nodes, max_nodes))
+        except _SearchLimit:
+            attempt_nodes *= 2
             continue
+        if league is None:
+            raise ValueError(f"No valid league of {num_teams} teams exists for this roster.")
+        return league
 
-    raise ValueError("Failed to create a valid league after many attempts.")
+    raise ValueError(f"No valid league found within {max_nodes} search steps.")
 
-def generate_population(players, num_leagues=5):
+def generate_population(players, num_leagues=5, cache=None, roster=None, spec=None):
+    """
+    Create num_leagues random valid leagues of the problem described by `spec` (DEFAULT_SPEC
+    when not given) over one shared Roster built from `players` (the list is not modified,
+    so leagues generated from the same list have the same roster indices and can share a
+    FitnessCache). An existing Roster of these players can be passed to reuse it.
+    """
+    spec = _resolve_spec(spec)
+    # One roster shared by every league of the population
+    if roster is None:
+        roster = Roster(players)
+    check_league_feasibility(roster, spec=spec)
     population = []
     for _ in range(num_leagues):
-        league = create_valid_league(players)
+        league = create_feasible_league(players, roster=roster, spec=spec)
+        league.cache = cache
         population.append(league)
     return population
 
 def load_players_from_csv(filepath):
-    df = pd.read_csv(filepath)
+    # Read with the csv module: a single run does not need to import pandas
+    with open(filepath, newline="", encoding="utf-8-sig") as f:
+        rows = list(csv.DictReader(f))
     players = []
 
-    for _, row in df.iterrows():
+    for row in rows:
         player = Player(
             name=row['Name'],
             position=row['Position'],
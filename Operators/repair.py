@@ -0,0 +1,162 @@
+import inspect
+import time
+import numpy as np
+
+
+class Repair:
+    """
+    Repair operator: turn a league whose only broken constraint is the salary cap into a
+    nearby valid league, instead of rejecting it.
+
+    While a team is over the cap, the repair looks at every swap of two players of the same
+    position between that team and a team with room under the cap, where the over-budget
+    team gets the cheaper player. It applies, among the swaps that keep the other team
+    within the cap:
+    1. the one that brings the team under the cap with the smallest loss of balance (sum of
+       squared team skill sums), if any swap does
+    2. otherwise the one that saves the most salary
+    Every swap keeps the formations and the set of players, so only the caps can change.
+    Leagues with other violations (formations, duplicates) are not repaired.
+
+    Use it after any operator: wrap the operator with `repaired(operator, repair)`, or pass
+    it to the mutations and to crossover_swap_extreme_player (repair=...), which then repair
+    the child of an invalid move instead of returning None.
+
+    Attributes:
+    -----------
+    counts : dict
+        - attempts: leagues given to the repair
+        - repaired: leagues made valid (children saved from rejection: each one saves the
+          selection, crossover and mutation the GA would otherwise redo for it)
+        - failed: leagues that could not be repaired
+        - swaps: swaps applied
+    seconds : float
+        Time spent repairing.
+    """
+    def __init__(self, max_swaps=10):
+        self.max_swaps = max_swaps
+        self.counts = {"attempts": 0, "repaired": 0, "failed": 0, "swaps": 0}
+        self.seconds = 0.0
+
+    def __call__(self, league):
+        """Repair `league` in place. Returns it, or None if it cannot be repaired."""
+        start = time.perf_counter()
+        self.counts["attempts"] += 1
+        repaired = self._repair(league)
+        self.counts["repaired" if repaired else "failed"] += 1
+        self.seconds += time.perf_counter() - start
+        return league if repaired else None
+
+    def repair_move(self, league, move):
+        """Child of `league` with a move rejected by move_delta applied, then repaired (or None)."""
+        if not league._structure_ok():
+            # Only salary violations can be repaired
+            self.counts["attempts"] += 1
+            self.counts["failed"] += 1
+            return None
+        child = league.copy()
+        child.apply_move(*move)
+        return self(child)
+
+    def _repair(self, league):
+        if not league._structure_ok():
+            return False
+        roster, cap = league.roster, league.spec.salary_cap
+        swaps = 0
+        while True:
+            league._refresh()
+            salary = league._team_salary
+            over = np.flatnonzero(salary > cap)
+            if not over.size:
+                return True
+            if swaps == self.max_swaps:
+                return False
+            # The team furthest over the cap first
+            move = self._best_swap(league, over[np.argmax(salary[over])], roster, cap)
+            if move is None:
+                return False
+            league.apply_move(*move)
+            swaps += 1
+            self.counts["swaps"] += 1
+
+    @staticmethod
+    def _best_swap(league, team, roster, cap):
+        """Best swap between `team` (over the cap) and another team, as a move, or None."""
+        genome, salary, skill_sums = league.genome, league._team_salary, league._team_skill
+        genes = genome[team]
+        # (slot of `team`) x (other team) x (slot of the other team) arrays of every swap
+        saving = roster.cost[genes][:, None, None] - roster.cost[genome][None, :, :]
+        room = (cap - salary)[None, :, None]
+        allowed = (roster.position[genes][:, None, None] == roster.position[genome][None, :, :]) \
+                  & (saving > 0) & (saving <= room)
+        allowed[:, team, :] = False
+        if not allowed.any():
+            return None
+        # Change of the sum of squared team skill sums (the total skill is fixed)
+        shift = roster.skill[genes][:, None, None] - roster.skill[genome][None, :, :]
+        others = skill_sums[None, :, None]
+        balance = (skill_sums[team] - shift) ** 2 + (others + shift) ** 2 - skill_sums[team] ** 2 - others ** 2
+
+        candidates = np.flatnonzero(allowed)
+        fixes = candidates[saving.flat[candidates] >= salary[team] - cap]
+        if fixes.size:
+            # The swap fixing the team with the best balance
+            best = fixes[np.argmin(balance.flat[fixes])]
+        else:
+            # The largest saving, then the best balance
+            best = candidates[np.lexsort((balance.flat[candidates], -saving.flat[candidates]))[0]]
+        i, other, j = np.unravel_index(best, allowed.shape)
+        return [team, other], [i, j], [genome[other, j], genes[i]]
+
+    def stats(self):
+        attempts = self.counts["attempts"]
+        return {
+            **self.counts,
+            "success_rate": self.counts["repaired"] / attempts if attempts else 0.0,
+            "swaps_per_repair": self.counts["swaps"] / self.counts["repaired"] if self.counts["repaired"] else 0.0,
+            "seconds": self.seconds,
+        }
+
+    def reset(self):
+        self.counts = dict.fromkeys(self.counts, 0)
+        self.seconds = 0.0
+
+
+class RepairedOperator:
+    """
+    An operator (mutation or crossover) followed by a Repair: the operator repairs its own
+    rejected moves when it takes a `repair` argument, and every invalid league it returns is
+    repaired afterwards. Named like the operator with a "_repaired" suffix (for the
+    grid-search labels), and picklable for the grid-search workers.
+
+    Usage:
+    ------
+    repair = Repair()
+    run_algorithm(mutation=repaired(single_player_swap_2teams, repair),
+                  crossover=repaired(crossover_swap_whole_position, repair))
+    print(repair.stats())
+    """
+    def __init__(self, operator, repair=None):
+        self.operator = operator
+        self.repair = repair if repair is not None else Repair()
+        self.__name__ = f"{operator.__name__}_repaired"
+        self._takes_repair = "repair" in inspect.signature(operator).parameters
+
+    def __call__(self, *args):
+        if self._takes_repair:
+            result = self.operator(*args, repair=self.repair)
+        else:
+            result = self.operator(*args)
+        if isinstance(result, tuple):
+            return tuple(self._check(league) for league in result)
+        return self._check(result)
+
+    def _check(self, league):
+        if league is None or league.is_valid():
+            return league
+        return self.repair(league)
+
+
+def repaired(operator, repair=None):
+    """`operator` followed by `repair` (a new Repair if not given): see RepairedOperator."""
+    return RepairedOperator(operator, repair)
@@ -0,0 +1,198 @@
+from concurrent.futures import ThreadPoolExecutor
+from functools import cached_property
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from Operators.convergence_store import ConvergenceStore, STORE_FILENAME, parse_config_label
+
+
+def _pad_runs(runs):
+    """Fill the generations a run did not reach (NaN in a ragged CSV) with its last value."""
+    runs = np.array(runs, dtype=float)
+    for row in runs:
+        missing = np.isnan(row)
+        if missing.any() and not missing.all():
+            last = np.flatnonzero(~missing)[-1]
+            row[last + 1:] = row[last]
+    return runs
+
+
+class GridSearchResults:
+    """
+    The output of one grid search, loaded once and shared by every plot and test.
+
+    Configurations come from the folder's convergence store (convergence.npz,
+    memory-mapped) or from its one-CSV-per-configuration files. Runs are read lazily,
+    configuration by configuration, and all the remaining ones are read in parallel the
+    first time a statistic over the whole grid is needed. The statistics (median curves,
+    best fitness of every run, groupings by hyperparameter) are computed once as NumPy
+    arrays and cached.
+
+    Parameters:
+    -----------
+    folder_path : str or Path, optional
+        Output folder of run_grid_search (convergence logs).
+    summary_path : str or Path, optional
+        Summary CSV of the same grid search, read once into `summary`.
+    n_workers : int, optional
+        Threads used to read the CSV files (None: ThreadPoolExecutor's default).
+
+    Attributes:
+    -----------
+    configs : pd.DataFrame
+        One row per configuration: "label" (the configuration name) and its hyperparameters.
+    """
+    def __init__(self, folder_path=None, summary_path=None, n_workers=None):
+        self.folder_path = Path(folder_path) if folder_path is not None else None
+        self.summary_path = summary_path
+        self.n_workers = n_workers
+        self._store = None
+        self._files = []
+        self._runs = {}
+
+        if self.folder_path is not None:
+            store_path = self.folder_path / STORE_FILENAME
+            if store_path.exists():
+                self._store = ConvergenceStore(store_path)
+                self.configs = self._store.configs
+            else:
+                self._files = sorted(self.folder_path.glob("*.csv"))
+                self.configs = pd.DataFrame([{"label": file.stem, **parse_config_label(file.stem)}
+                                             for file in self._files])
+        else:
+            self.configs = pd.DataFrame(columns=["label"])
+        self.labels = list(self.configs["label"])
+        self._position = {label: i for i, label in enumerate(self.labels)}
+
+    @classmethod
+    def from_dataframes(cls, fitness_dfs):
+        """Wrap {label: DataFrame (runs x generations)}, the output of load_fitness_logs."""
+        results = cls()
+        results.labels = list(fitness_dfs)
+        results.configs = pd.DataFrame([{"label": label, **parse_config_label(label)} for label in results.labels])
+        results._position = {label: i for i, label in enumerate(results.labels)}
+        results._runs = {i: _pad_runs(df.to_numpy(dtype=float)) for i, df in enumerate(fitness_dfs.values())}
+        return results
+
+    def __len__(self):
+        return len(self.labels)
+
+    # Loading
+
+    def index_of(self, config):
+        """Position of a configuration given by label or index."""
+        return self._position[config] if isinstance(config, str) else int(config)
+
+    def runs(self, config):
+        """(runs x generations) best fitness of one configuration, read on first use."""
+        i = self.index_of(config)
+        if i not in self._runs:
+            if self._store is not None:
+                self._runs[i] = np.asarray(self._store.config_runs(i))
+            else:
+                self._runs[i] = _pad_runs(pd.read_csv(self._files[i]).to_numpy(dtype=float))
+        return self._runs[i]
+
+    def load_all(self):
+        """Read every configuration not read yet, in parallel."""
+        missing = [i for i in range(len(self)) if i not in self._runs]
+        if not missing:
+            return
+        if self._store is not None and self._store.ragged:
+            for i in missing:
+                self._runs[i] = np.asarray(self._store.config_runs(i))
+            return
+        if self._store is not None:
+            # One decoding pass over the whole store
+            fitness = self._store.fitness
+            for i in missing:
+                self._runs[i] = fitness[i]
+            return
+        with ThreadPoolExecutor(max_workers=self.n_workers) as executor:
+            for i, runs in zip(missing, executor.map(
+                    lambda i: _pad_runs(pd.read_csv(self._files[i]).to_numpy(dtype=float)), missing)):
+                self._runs[i] = runs
+
+    def to_dataframes(self):
+        """{label: DataFrame (runs x generations)}, the format of load_fitness_logs."""
+        self.load_all()
+        return {label: pd.DataFrame(self._runs[i]) for i, label in enumerate(self.labels)}
+
+    @cached_property
+    def summary(self):
+        """The summary CSV of the grid search (None if no summary_path was given)."""
+        return pd.read_csv(self.summary_path) if self.summary_path is not None else None
+
+    # Cached statistics
+
+    @cached_property
+    def fitness(self):
+        """Dense (configurations x runs x generations) array, when all the configurations have the same shape."""
+        if self._store is not None and not self._store.ragged:
+            return self._store.fitness
+        self.load_all()
+        shapes = {self._runs[i].shape for i in range(len(self))}
+        if len(shapes) > 1:
+            raise ValueError(f"Configurations have different numbers of runs or generations: {sorted(shapes)}")
+        return np.stack([self._runs[i] for i in range(len(self))])
+
+    def _per_config(self, statistic):
+        # Vectorized over the dense array when there is one, configuration by configuration otherwise
+        try:
+            return statistic(self.fitness)
+        except ValueError:
+            return [statistic(self._runs[i][None])[0] for i in range(len(self))]
+
+    @cached_property
+    def median_curves(self):
+        """Median fitness over the runs at each generation, one row per configuration."""
+        return self._per_config(lambda fitness: np.median(fitness, axis=1))
+
+    @cached_property
+    def mean_curves(self):
+        """Mean fitness over the runs at each generation, one row per configuration."""
+        return self._per_config(lambda fitness: np.mean(fitness, axis=1))
+
+    @cached_property
+    def best_per_run(self):
+        """Best (lowest) fitness reached by every run, one row per configuration."""
+        return self._per_config(lambda fitness: np.min(fitness, axis=2))
+
+    @cached_property
+    def n_runs(self):
+        return np.array([len(runs) for runs in self.best_per_run])
+
+    def index(self, parameter):
+        """{value: array of configuration indices} for one hyperparameter, in order of first appearance."""
+        cache = self.__dict__.setdefault("_index", {})
+        if parameter not in cache:
+            groups = self.configs.groupby(parameter, sort=False).indices
+            cache[parameter] = {value: np.asarray(indices) for value, indices in groups.items()}
+        return cache[parameter]
+
+    def group_median_curves(self, parameter):
+        """{value: median over its configurations of their median curves} for one hyperparameter."""
+        cache = self.__dict__.setdefault("_group_medians", {})
+        if parameter not in cache:
+            cache[parameter] = {value: np.median([self.median_curves[i] for i in indices], axis=0)
+                                for value, indices in self.index(parameter).items()}
+        return cache[parameter]
+
+    def lookup(self, params):
+        """Index of the configuration whose hyperparameters match `params` (a dict or summary row), or None."""
+        params = dict(params)
+        columns = [c for c in self.configs.columns if c != "label" and c in params]
+        if not columns:
+            return None
+        match = np.ones(len(self), dtype=bool)
+        for column in columns:
+            match &= (self.configs[column].astype(str) == str(params[column])).to_numpy()
+        found = np.flatnonzero(match)
+        return int(found[0]) if found.size else None
+
+
+def load_results(folder_path, summary_path=None, n_workers=None):
+    """Load the output of a grid search once (see GridSearchResults)."""
+    return GridSearchResults(folder_path, summary_path, n_workers)
@@ -1,86 +1,124 @@
-import random
-from copy import deepcopy
 import numpy as np
-import builtins
-from Operators.population import League, calculate_fitness
+from Operators.population import League, population_fitness, INVALID_FITNESS
 
-def roulette_selection(population: list[League]) -> League:
+# The batched selectors below take the fitness vector of the whole population
+# (see population_fitness) and return the indices of the selected parents.
+
+def selection_weights(fitness: np.ndarray, invalid_fitness: float = INVALID_FITNESS) -> np.ndarray:
     """
-    Select one League from population using roulette‐wheel selection
-    (minimization problem ⇒ weight = 1 / fitness).
-    Leagues with invalid fitness (9999) or zero/negative fitness get a tiny weight = less chance.
+    Roulette weights for a minimization problem: weight = 1 / fitness.
+    Leagues with invalid fitness (the spec's invalid_fitness, 9999 by default, or above with
+    graded penalties) or zero/negative fitness get a tiny weight = less chance.
+    """
+    fitness = np.asarray(fitness, dtype=float)
+    weights = np.full(fitness.shape, 1e-7)
+    usable = (fitness > 0) & (fitness < invalid_fitness)
+    weights[usable] = 1 / fitness[usable]  # inverse fitness because we're minimizing
+    return weights
+
+
+def roulette_selection_indices(fitness: np.ndarray, n_parents: int, invalid_fitness: float = INVALID_FITNESS) -> np.ndarray:
     """
-    # 1) Compute fitness weights
-    weights = []
-    for league in population:
-        f = calculate_fitness(league)
-        if f <= 0 or f == 9999:
-            weights.append(1e-7)
-        else:
-            weights.append(1 / f) # inverse fitness because we're minimizing
+    Draw n_parents indices with roulette-wheel selection, all in one batch:
+    one random point per parent, located on the cumulative weights with a binary search.
+    """
+    cumulative_weights = np.cumsum(selection_weights(fitness, invalid_fitness))
+    picks = np.random.uniform(0, cumulative_weights[-1], size=n_parents)
+    # First league whose cumulative weight reaches the pick (clipped in case of rounding error)
+    indices = np.searchsorted(cumulative_weights, picks, side="left")
+    return np.minimum(indices, len(cumulative_weights) - 1)
 
-    # 2) Choose random number in [0, total_weight]
-    total_weights = builtins.sum(weights)
-    pick = random.uniform(0, total_weights)
 
-    # 3) Check which league it lands on
-    cumulative_weights = 0.0
-    for league, w in zip(population, weights):
-        cumulative_weights += w
-        if pick <= cumulative_weights:
-            return league
+def stochastic_selection_indices(fitness: np.ndarray, n_parents: int, invalid_fitness: float = INVALID_FITNESS) -> np.ndarray:
+    """
+    Stochastic Universal Sampling: n_parents evenly spaced pointers with one random offset,
+    located on the cumulative weights with a single binary search.
+    """
+    cumulative_weights = np.cumsum(selection_weights(fitness, invalid_fitness))
+    step = cumulative_weights[-1] / n_parents
+    pointers = np.random.uniform(0, step) + step * np.arange(n_parents)
+    indices = np.searchsorted(cumulative_weights, pointers, side="left")
+    return np.minimum(indices, len(cumulative_weights) - 1)
+
+
+def tournament_selection_indices(fitness: np.ndarray, n_parents: int, tournament_size: int = 3) -> np.ndarray:
+    """
+    Run n_parents tournaments at once. Each draws tournament_size distinct competitors
+    and the one with the lowest fitness (since we're minimizing) wins.
+    """
+    fitness = np.asarray(fitness, dtype=float)
+    pop_size = len(fitness)
+    if tournament_size > pop_size:
+        raise ValueError("Tournament size cannot be larger than the population.")
+
+    # Draw the competitors, then redraw the tournaments that picked someone twice
+    competitors = np.random.randint(0, pop_size, size=(n_parents, tournament_size))
+    while True:
+        ordered = np.sort(competitors, axis=1)
+        repeated = (ordered[:, 1:] == ordered[:, :-1]).any(axis=1)
+        if not repeated.any():
+            break
+        competitors[repeated] = np.random.randint(0, pop_size, size=(repeated.sum(), tournament_size))
 
-    # In case of rounding error, return the last one (fallback)
-    return population[-1]
+    winners = np.argmin(fitness[competitors], axis=1)
+    return competitors[np.arange(n_parents), winners]
 
 
-def tournament_selection(population: list[League], tournament_size: int = 3) -> League:
+def roulette_selection(population: list[League], fitness: np.ndarray = None) -> League:
+    """
+    Select one League from population using roulette‐wheel selection
+    (minimization problem ⇒ weight = 1 / fitness).
+    Leagues with invalid fitness (the spec's invalid_fitness) or zero/negative fitness get a tiny
+    weight = less chance. Pass the population's fitness vector to avoid looking it up again.
+    """
+    if fitness is None:
+        fitness = population_fitness(population)
+    return population[roulette_selection_indices(fitness, 1, population[0].spec.invalid_fitness)[0]]
+
+
+def tournament_selection(population: list[League], tournament_size: int = 3, fitness: np.ndarray = None) -> League:
     """
     Select one League by running a 'tournament' among a random subset.
     The league with the lowest fitness (since we're minimizing) wins.
     """
-    # 1) Randomly pick k competitors
-    competitors = random.sample(population, k=tournament_size)
-    # 2) Choose the best (min fitness)
-    winner = min(competitors, key=calculate_fitness)
-    return winner
+    if fitness is None:
+        fitness = population_fitness(population)
+    return population[tournament_selection_indices(fitness, 1, tournament_size)[0]]
+
 
-def stochastic_selection(population: list[League], num_parents: int) -> list[League]:
+def stochastic_selection(population: list[League], num_parents: int, fitness: np.ndarray = None) -> list[League]:
     """
     Stochastic Universal Sampling for a minimization GA.
-    Returns a list of num_parents selected Leagues.
-    """
-    # 1) Compute weights
-    weights = []
-    for league in population:
-        f = calculate_fitness(league)
-        if f <= 0 or f == 9999:
-            weights.append(1e-7)       # invalid or zero
-        else:
-            weights.append(1 / f)      # inverse fitness
-
-    total_weight = builtins.sum(weights)
-    step = total_weight / num_parents
-
-    # 2) Pick a random start in [0, step)
-    start = random.uniform(0, step)
-    pointers = [start + i * step for i in range(num_parents)]
-
-    # 3) Sweep the wheel once
-    selections = []
-    cumulative = 0.0
-    idx = 0
-    for league, w in zip(population, weights):
-        cumulative += w
-        # Select for all pointers <= cumulative
-        while idx < num_parents and pointers[idx] <= cumulative:
-            selections.append(deepcopy(league))
-            idx += 1
-        if idx >= num_parents:
-            break
+    Returns a list of num_parents selected Leagues (the population's own objects, not copies:
+    operators never modify their parents).
+    """
+    if fitness is None:
+        fitness = population_fitness(population)
+    invalid_fitness = population[0].spec.invalid_fitness
+    return [population[i] for i in stochastic_selection_indices(fitness, num_parents, invalid_fitness)]
+
+
+# Batched equivalent of each per-league selection function
+BATCHED_SELECTION = {
+    roulette_selection: roulette_selection_indices,
+    tournament_selection: tournament_selection_indices,
+    stochastic_selection: stochastic_selection_indices,
+}
+# Batched selectors whose weights depend on the fitness of invalid leagues
+WEIGHTED_SELECTION = {roulette_selection_indices, stochastic_selection_indices}
 
-    # 4) Fallback: if rounding left some pointers unassigned
-    while len(selections) < num_parents:
-        selections.append(deepcopy(population[-1]))
 
-    return selections
\ No newline at end of file
+def select_parent_indices(selection_algorithm, population: list[League], fitness: np.ndarray, n_parents: int) -> np.ndarray:
+    """
+    Draw the indices of n_parents parents with the batched version of selection_algorithm.
+    A selection function without a batched version is called once per parent instead,
+    and must return a member of the population.
+    """
+    batched = BATCHED_SELECTION.get(selection_algorithm)
+    if batched in WEIGHTED_SELECTION:
+        return batched(fitness, n_parents, population[0].spec.invalid_fitness)
+    if batched is not None:
+        return batched(fitness, n_parents)
+
+    position = {id(league): i for i, league in enumerate(population)}
+    return np.array([position[id(selection_algorithm(population))] for _ in range(n_parents)])
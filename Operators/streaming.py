@@ -0,0 +1,180 @@
+from collections import Counter
+
+import numpy as np
+
+
+class Welford:
+    """
+    Running mean and variance of a stream of observations (Welford's algorithm), element
+    by element for array observations: constant memory whatever the number of
+    observations, and no loss of precision from summing squares.
+    """
+    def __init__(self, shape=()):
+        self.count = 0
+        self.mean = np.zeros(shape)
+        self._m2 = np.zeros(shape)
+
+    def add(self, x):
+        self.count += 1
+        delta = x - self.mean
+        self.mean = self.mean + delta / self.count
+        self._m2 = self._m2 + delta * (x - self.mean)
+
+    @property
+    def variance(self):
+        """Population variance (ddof=0, like np.var), NaN before the first observation."""
+        return self._m2 / self.count if self.count else np.full(np.shape(self.mean), np.nan)
+
+    @property
+    def std(self):
+        return np.sqrt(self.variance)
+
+
+class P2Quantile:
+    """
+    Streaming estimate of a quantile with the P² algorithm (Jain & Chlamtac, 1985): five
+    markers (minimum, p/2, p, (1+p)/2 and maximum quantiles) are moved towards their
+    desired positions with a piecewise-parabolic interpolation after every observation.
+    Constant memory; exact up to five observations.
+
+    Array observations are handled element by element (one estimator per element, updated
+    together), e.g. the median of every generation of a stream of convergence curves.
+
+    Parameters:
+    -----------
+    p : float
+        Quantile to estimate (0.5: the median).
+    shape : tuple
+        Shape of the observations.
+    """
+    def __init__(self, p=0.5, shape=()):
+        self.p = p
+        self.shape = shape
+        self.count = 0
+        self._first = []
+        self._heights = None
+        self._positions = None
+        self._desired = None
+        self._increments = np.array([0, p / 2, p, (1 + p) / 2, 1])
+
+    def add(self, x):
+        x = np.broadcast_to(np.asarray(x, dtype=float), self.shape)
+        self.count += 1
+        if self.count <= 5:
+            self._first.append(x.copy())
+            if self.count == 5:
+                # Markers at the five sorted first observations
+                self._heights = np.sort(np.stack(self._first), axis=0)
+                self._positions = np.broadcast_to(np.arange(1.0, 6.0).reshape((5,) + (1,) * len(self.shape)),
+                                                  self._heights.shape).copy()
+                self._desired = 1 + 4 * self._increments.reshape((5,) + (1,) * len(self.shape))
+                self._first = []
+            return
+
+        q, n = self._heights, self._positions
+        # 1) Cell of the observation, stretching the extreme markers if it falls outside
+        q[0] = np.minimum(q[0], x)
+        q[4] = np.maximum(q[4], x)
+        cell = np.clip((x[None] >= q[1:4]).sum(axis=0), 0, 3)
+        # 2) Positions of the markers above the cell move up by one
+        n += np.arange(5).reshape((5,) + (1,) * len(self.shape)) > cell
+        self._desired = self._desired + self._increments.reshape((5,) + (1,) * len(self.shape))
+        # 3) Move the middle markers by one position towards their desired position
+        for i in (1, 2, 3):
+            d = self._desired[i] - n[i]
+            move = ((d >= 1) & (n[i + 1] - n[i] > 1)) | ((d <= -1) & (n[i - 1] - n[i] < -1))
+            if not move.any():
+                continue
+            d = np.sign(d)
+            parabolic = q[i] + d / (n[i + 1] - n[i - 1]) * (
+                (n[i] - n[i - 1] + d) * (q[i + 1] - q[i]) / (n[i + 1] - n[i])
+                + (n[i + 1] - n[i] - d) * (q[i] - q[i - 1]) / (n[i] - n[i - 1]))
+            neighbour = np.where(d > 0, i + 1, i - 1)
+            q_neighbour = np.take_along_axis(q, neighbour[None], axis=0)[0]
+            n_neighbour = np.take_along_axis(n, neighbour[None], axis=0)[0]
+            linear = q[i] + d * (q_neighbour - q[i]) / (n_neighbour - n[i])
+            inside = (q[i - 1] < parabolic) & (parabolic < q[i + 1])
+            q[i] = np.where(move, np.where(inside, parabolic, linear), q[i])
+            n[i] = np.where(move, n[i] + d, n[i])
+
+    @property
+    def value(self):
+        """Current estimate (NaN before the first observation)."""
+        if self.count == 0:
+            return np.full(self.shape, np.nan)
+        if self.count < 5:
+            return np.quantile(np.stack(self._first), self.p, axis=0)
+        return self._heights[2].copy()
+
+
+class StreamingSummary:
+    """
+    Summary of the runs of one grid-search configuration, updated run by run: the
+    statistics of the summary CSV (Welford mean and std, exact median of the final best
+    fitness of every run, minimum, maximum, mean stop generation and evaluations, stop
+    reasons), and the Welford mean and std of the best fitness of every generation (runs
+    that stopped early count with their last value, as in GridSearchResults). Only the
+    final best fitness of every run is kept (n_runs floats), not the curves.
+
+    A P² estimate of the median is kept as well, for the live partial summaries
+    (stats(exact=False)): it is approximate past five runs, so the summary CSV uses the
+    exact median.
+
+    Parameters:
+    -----------
+    max_gen : int
+        Generations of the longest possible run.
+    """
+    def __init__(self, max_gen):
+        self.max_gen = max_gen
+        self.runs = 0
+        self.fitness = Welford()
+        self.final_fitness = []
+        self.fitness_median = P2Quantile(0.5)
+        self.min_fitness = np.inf
+        self.max_fitness = -np.inf
+        self.generations = Welford()
+        self.evaluations = Welford()
+        self.stop_reasons = Counter()
+        self.curve = Welford(max_gen)
+        self.operator_stats = []
+
+    def add(self, fitness, convergence):
+        """Add one finished run: its final best fitness and its Convergence."""
+        self.runs += 1
+        self.fitness.add(fitness)
+        self.final_fitness.append(fitness)
+        self.fitness_median.add(fitness)
+        self.min_fitness = min(self.min_fitness, fitness)
+        self.max_fitness = max(self.max_fitness, fitness)
+        self.generations.add(len(convergence))
+        self.evaluations.add(getattr(convergence, "evaluations", 0))
+        self.stop_reasons[getattr(convergence, "stop_reason", None) or "max_gen"] += 1
+        if len(convergence):
+            # Pad a run that stopped early with its last value
+            curve = np.full(self.max_gen, convergence[-1], dtype=float)
+            curve[:len(convergence)] = convergence[:self.max_gen]
+            self.curve.add(curve)
+        if getattr(convergence, "operator_stats", None) is not None:
+            self.operator_stats.append(convergence.operator_stats)
+
+    def stats(self, exact=True):
+        """
+        The statistics of a summary CSV row, as _write_config_results computes them from
+        every run. exact=False gives the P² estimate of the median instead (partial summaries).
+        """
+        median = np.median(self.final_fitness) if exact else self.fitness_median.value
+        return {
+            "median_fitness": float(median),
+            "mean_fitness": float(self.fitness.mean),
+            "std_fitness": float(self.fitness.std),
+            "min_fitness": self.min_fitness,
+            "max_fitness": self.max_fitness,
+            "mean_stop_generation": float(self.generations.mean),
+            "mean_evaluations": float(self.evaluations.mean),
+            "stop_reasons": ";".join(f"{reason}:{count}" for reason, count in sorted(self.stop_reasons.items())),
+        }
+
+    def curve_stats(self):
+        """(generations) arrays of the mean and std of the best fitness, as a dict."""
+        return {"mean": self.curve.mean, "std": self.curve.std}
@@ -0,0 +1,224 @@
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import product
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from Operators.genetic_algorithm import (_init_worker, _run_task, _write_config_results, config_label, run_seed,
+                                         OPERATOR_STATS_SUFFIX)
+from Operators.convergence_store import ConvergenceStoreWriter, STORE_FILENAME
+from Operators.population import load_players_from_csv
+
+# Tuning methods of tune_grid_search
+TUNING_METHODS = ("race", "halving")
+
+
+def race_survivors(best_fitnesses, alpha=0.05):
+    """
+    One racing test over the configurations still in the race (F-Race).
+
+    The runs with the same index are the blocks of a Friedman test on the best fitness of
+    every run. If it finds a difference at level alpha, the Nemenyi post-hoc test compares
+    every configuration with the best one (lowest mean rank), and the configurations
+    significantly worse than it are eliminated. With two configurations left, a Wilcoxon
+    signed-rank test replaces both tests.
+
+    Parameters:
+    -----------
+    best_fitnesses : np.ndarray
+        (runs x configurations) best fitness of every run so far.
+    alpha : float
+        Significance level.
+
+    Returns:
+    --------
+    np.ndarray : boolean mask of the configurations kept
+    """
+    from scipy.stats import friedmanchisquare, wilcoxon
+
+    n_runs, n_configs = best_fitnesses.shape
+    keep = np.ones(n_configs, dtype=bool)
+    if n_configs < 2 or np.allclose(best_fitnesses, best_fitnesses[:, :1]):
+        # Identical results cannot be told apart
+        return keep
+
+    mean_ranks = pd.DataFrame(best_fitnesses).rank(axis=1).mean().to_numpy()
+    best = int(np.argmin(mean_ranks))
+    if n_configs == 2:
+        _, p_value = wilcoxon(best_fitnesses[:, 0], best_fitnesses[:, 1], zero_method="zsplit")
+        keep[1 - best] = not p_value < alpha
+        return keep
+
+    _, p_value = friedmanchisquare(*best_fitnesses.T)
+    if not p_value < alpha:
+        return keep
+    # Same post-hoc test as evaluation.run_posthoc_nemenyi_from_best_fitness (the tests are
+    # imported here only: the successive-halving tuner does not need them)
+    import scikit_posthocs as sp
+    p_values = sp.posthoc_nemenyi_friedman(best_fitnesses).to_numpy()
+    keep = ~((p_values[best] < alpha) & (mean_ranks > mean_ranks[best]))
+    return keep
+
+
+def halving_survivors(best_fitnesses, eta=2):
+    """
+    One round of successive halving: keep the best 1/eta of the configurations (at least
+    one), ranked by the median of their best fitness per run.
+
+    Returns:
+    --------
+    np.ndarray : boolean mask of the configurations kept
+    """
+    n_configs = best_fitnesses.shape[1]
+    n_keep = max(1, int(np.ceil(n_configs / eta)))
+    keep = np.zeros(n_configs, dtype=bool)
+    keep[np.argsort(np.median(best_fitnesses, axis=0), kind="stable")[:n_keep]] = True
+    return keep
+
+
+def tune_grid_search(param_grid, n_runs=30, max_gen=100, filepath=None, summary_path="ga_summary.csv",
+                     output_folder="fitness_logs", cache_size=100_000, n_workers=1, seed=None, spec=None,
+                     log_format="npz", method="race", first_round=5, round_size=5, alpha=0.05, eta=2):
+    """
+    Tune the configurations of `param_grid` in rounds instead of running all of them
+    n_runs times like run_grid_search, dropping the bad ones early.
+
+    - method="race" (F-Race): every configuration still in the race gets `first_round` runs,
+      then `round_size` more per round; after each round the ones statistically worse than
+      the best are eliminated (race_survivors: Friedman then Nemenyi, at level alpha)
+    - method="halving" (successive halving): the budget of runs per configuration starts at
+      `first_round` and is multiplied by `eta` every round, while only the best 1/eta of the
+      configurations go on to the next round (halving_survivors)
+    Both stop once the survivors have n_runs runs, or a single configuration is left (which
+    then gets its n_runs runs).
+
+    Run i of a configuration uses the same seed as in run_grid_search with the same `seed`,
+    so the runs made are the ones the full grid would have made. The results are written
+    like run_grid_search's (same summary CSV schema, every configuration with the runs it
+    got), and the savings are printed. With log_format="npz", the store holds every
+    configuration with the runs it got (see ConvergenceStore.run_counts).
+
+    Parameters:
+    -----------
+    The parameters of run_grid_search, and:
+    method : str
+        One of TUNING_METHODS.
+    first_round : int
+        Runs of every configuration in the first round.
+    round_size : int
+        Runs added per round by the race.
+    alpha : float
+        Significance level of the race's tests.
+    eta : int
+        Reduction factor of successive halving.
+
+    Returns:
+    --------
+    pd.DataFrame : one row per configuration: label, runs made, round it was eliminated in
+        (None for the survivors), mean best fitness and evaluations, sorted by mean best
+        fitness. Its `attrs` hold the savings: runs and evaluations made, the runs of the
+        full grid, and the fraction of them saved.
+    """
+    if method not in TUNING_METHODS:
+        raise ValueError(f"Unknown tuning method {method!r}, expected one of {TUNING_METHODS}.")
+    if log_format not in ("npz", "csv"):
+        raise ValueError(f"Unknown log format: {log_format}")
+    start = time.perf_counter()
+
+    if Path(summary_path).exists():
+        Path(summary_path).unlink()
+    Path(summary_path).with_suffix(OPERATOR_STATS_SUFFIX).unlink(missing_ok=True)
+    if log_format == "csv":
+        # A store left by an earlier npz run would be read instead of the new CSV logs
+        (Path(output_folder) / STORE_FILENAME).unlink(missing_ok=True)
+
+    keys = list(param_grid.keys())
+    param_combinations = [dict(zip(keys, param_values)) for param_values in product(*param_grid.values())]
+    n_configs = len(param_combinations)
+
+    Path(output_folder).mkdir(parents=True, exist_ok=True)
+    players = load_players_from_csv(filepath)
+    master_seed = seed if seed is not None else np.random.SeedSequence().entropy
+
+    fitnesses = [[] for _ in param_combinations]
+    convergences = [[] for _ in param_combinations]
+    eliminated = [None] * n_configs
+    alive = np.arange(n_configs)
+    budget = min(first_round, n_runs)
+    from tqdm import tqdm
+    progress = tqdm(total=n_configs * n_runs, desc="Tuning Progress", unit="run")
+
+    executor = ProcessPoolExecutor(max_workers=n_workers, initializer=_init_worker,
+                                   initargs=(players, cache_size, spec)) if n_workers != 1 else None
+    if executor is None:
+        _init_worker(players, cache_size, spec)
+    try:
+        round_idx = 0
+        while True:
+            round_idx += 1
+            # Every survivor's runs up to the budget of this round
+            tasks = [(config_idx, run_idx, param_combinations[config_idx], max_gen,
+                      run_seed(master_seed, config_idx, run_idx))
+                     for config_idx in alive for run_idx in range(len(fitnesses[config_idx]), budget)]
+            if executor is None:
+                results = [_run_task(*task) for task in tasks]
+            else:
+                results = [future.result() for future in [executor.submit(_run_task, *task) for task in tasks]]
+            for config_idx, run_idx, fitness, convergence, _ in results:
+                fitnesses[config_idx].append(fitness)
+                convergences[config_idx].append(convergence)
+            progress.update(len(tasks))
+
+            if budget == n_runs or len(alive) == 1:
+                break
+            scores = np.array([fitnesses[config_idx] for config_idx in alive]).T
+            keep = race_survivors(scores, alpha) if method == "race" else halving_survivors(scores, eta)
+            for config_idx in alive[~keep]:
+                eliminated[config_idx] = round_idx
+            alive = alive[keep]
+            if len(alive) == 1:
+                budget = n_runs
+            elif method == "race":
+                budget = min(budget + round_size, n_runs)
+            else:
+                budget = min(budget * eta, n_runs)
+    finally:
+        if executor is not None:
+            executor.shutdown()
+        progress.close()
+
+    store = ConvergenceStoreWriter(Path(output_folder) / STORE_FILENAME) if log_format == "npz" else None
+    for run_params, config_fitnesses, config_convergences in zip(param_combinations, fitnesses, convergences):
+        _write_config_results(run_params, config_fitnesses, config_convergences, summary_path, output_folder, store)
+    if store is not None:
+        store.close()
+        print(f"\nConvergence logs saved to: {store.path}")
+    print(f"\nSummary saved to: {summary_path}")
+
+    report = pd.DataFrame({
+        "config": [config_label(run_params) for run_params in param_combinations],
+        "runs": [len(config_fitnesses) for config_fitnesses in fitnesses],
+        "eliminated_round": eliminated,
+        "mean_fitness": [np.mean(config_fitnesses) for config_fitnesses in fitnesses],
+        "mean_evaluations": [np.mean([convergence.evaluations for convergence in config_convergences])
+                             for config_convergences in convergences],
+    }).sort_values("mean_fitness", kind="stable")
+
+    runs_made = int(report["runs"].sum())
+    full_runs = n_configs * n_runs
+    report.attrs = {
+        "runs": runs_made,
+        "full_grid_runs": full_runs,
+        "evaluations": int(sum(convergence.evaluations for config_convergences in convergences
+                               for convergence in config_convergences)),
+        # Every run of a configuration costs about its mean evaluations
+        "full_grid_evaluations": int(round(n_runs * report["mean_evaluations"].sum())),
+        "saved_fraction": 1 - runs_made / full_runs,
+        "seconds": time.perf_counter() - start,
+    }
+    print(f"{method}: {runs_made} of {full_runs} runs ({report.attrs['saved_fraction']:.1%} saved), "
+          f"{report.attrs['evaluations']} of ~{report.attrs['full_grid_evaluations']} evaluations, "
+          f"{len(alive)} configuration(s) left")
+    return report
@@ -0,0 +1,26 @@
+import os
+import sys
+import random
+
+import numpy as np
+import pytest
+
+# The tests import the Operators package from the project root, like the notebooks
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, ROOT)
+
+from Operators.population import load_players_from_csv, generate_population
+
+PLAYERS_CSV = os.path.join(ROOT, "Data", "players(in).csv")
+
+
+@pytest.fixture(scope="session")
+def players():
+    return load_players_from_csv(PLAYERS_CSV)
+
+
+@pytest.fixture
+def population(players):
+    random.seed(0)
+    np.random.seed(0)
+    return generate_population(players, 20)
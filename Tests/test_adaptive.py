@@ -0,0 +1,66 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from Operators.adaptive import AdaptiveOperator, OperatorBandit, POLICIES, is_operator_list, operator_name
+from Operators.genetic_algorithm import run_algorithm, run_grid_search
+from Operators.mutations import single_player_swap_2teams, full_position_swap_2teams
+from Operators.crossovers import crossover_swap_whole_position, crossover_swap_extreme_player
+from Operators.selection import tournament_selection
+from conftest import PLAYERS_CSV
+
+MUTATIONS = (single_player_swap_2teams, full_position_swap_2teams)
+CROSSOVERS = (crossover_swap_whole_position, crossover_swap_extreme_player)
+
+
+@pytest.mark.parametrize("policy", POLICIES)
+def test_bandit_favours_the_rewarded_arm(policy):
+    np.random.seed(0)
+    bandit = OperatorBandit(3, policy)
+    for _ in range(300):
+        arm = bandit.choose()
+        bandit.update(arm, 1.0 if arm == 2 else 0.1, 1)
+
+    assert bandit.uses.min() > 0
+    assert np.argmax(bandit.uses) == 2
+    np.testing.assert_allclose(bandit.mean_rewards(), [0.1, 0.1, 1.0])
+
+
+def test_unknown_policy_and_cost():
+    with pytest.raises(ValueError):
+        OperatorBandit(2, "greedy")
+    with pytest.raises(ValueError):
+        AdaptiveOperator(MUTATIONS, "mutation", cost="minutes")
+
+
+def test_operator_names():
+    assert is_operator_list(list(MUTATIONS)) and not is_operator_list(single_player_swap_2teams)
+    assert operator_name(MUTATIONS) == "adaptive(single_player_swap_2teams,full_position_swap_2teams)"
+
+
+@pytest.mark.parametrize("policy", POLICIES)
+def test_seeded_adaptive_runs_are_reproducible(players, policy):
+    results = [run_algorithm(players=players, POP_SIZE=12, max_gen=8, seed=3, mutation=MUTATIONS,
+                             crossover=CROSSOVERS, mut_prob=0.5, bandit_policy=policy) for _ in range(2)]
+
+    assert list(results[0][2]) == list(results[1][2])
+    stats = [convergence.operator_stats for _, _, convergence in results]
+    pd.testing.assert_frame_equal(stats[0].drop(columns="seconds"), stats[1].drop(columns="seconds"))
+    # The default cost: one per mutated child, at least one per crossover call
+    mutation_stats = stats[0][stats[0]["kind"] == "mutation"]
+    assert (mutation_stats["cost"] == mutation_stats["uses"]).all()
+
+
+def test_adaptive_grid_is_reproducible_across_workers(tmp_path):
+    param_grid = {"POP_SIZE": [10], "xo_prob": [0.8], "mut_prob": [0.5], "mutation": [MUTATIONS],
+                  "crossover": [CROSSOVERS], "selection_algorithm": [tournament_selection], "elitism": [True]}
+    summaries = []
+    for n_workers in (1, 3):
+        folder = tmp_path / str(n_workers)
+        run_grid_search(param_grid, n_runs=4, max_gen=8, filepath=PLAYERS_CSV, summary_path=folder / "summary.csv",
+                        output_folder=folder, n_workers=n_workers, seed=0)
+        summaries.append(pd.read_csv(folder / "summary.csv"))
+        operator_stats = pd.read_csv(folder / "summary.operator_stats.csv")
+        assert {"cost", "improvement_per_cost"} <= set(operator_stats.columns)
+
+    pd.testing.assert_frame_equal(summaries[0], summaries[1])
@@ -0,0 +1,51 @@
+import json
+
+import pytest
+
+from Operators import cli
+from Operators.genetic_algorithm import run_algorithm
+from Operators.mutations import full_position_swap_2teams
+from conftest import PLAYERS_CSV
+
+
+@pytest.fixture
+def config_path(tmp_path):
+    path = tmp_path / "config.json"
+    path.write_text(json.dumps({
+        "data": PLAYERS_CSV,
+        "seed": 0,
+        "run": {"POP_SIZE": 12, "max_gen": 6, "seed": 7, "mutation": "full_position_swap_2teams"},
+    }))
+    return path
+
+
+def _convergence(players, seed):
+    return list(run_algorithm(players=players, POP_SIZE=12, max_gen=6, seed=seed,
+                              mutation=full_position_swap_2teams)[2])
+
+
+@pytest.mark.parametrize("argv, seed", [([], 7), (["--seed", "1"], 1)])
+def test_run_seed(players, config_path, tmp_path, argv, seed):
+    output = tmp_path / "result.json"
+    cli.main(["run", str(config_path), "--output", str(output)] + argv)
+
+    assert json.loads(output.read_text())["convergence"] == _convergence(players, seed)
+
+
+def test_seed_overrides_the_grid_section(monkeypatch):
+    import Operators.genetic_algorithm as genetic_algorithm
+    seeds = []
+    monkeypatch.setattr(genetic_algorithm, "run_grid_search", lambda param_grid, **options: seeds.append(options["seed"]))
+    config = {"seed": 0, "grid": {"seed": 3, "params": {"POP_SIZE": [10]}}}
+
+    cli.grid_command(config)
+    cli.grid_command(config, seed=9)
+    assert seeds == [3, 9]
+
+
+def test_resolve_operator():
+    assert cli.resolve_operator("mutation", "full_position_swap_2teams") is full_position_swap_2teams
+    assert cli.resolve_operator("mutation", ["full_position_swap_2teams"]) == (full_position_swap_2teams,)
+    assert cli.resolve_operator("POP_SIZE", 50) == 50
+    with pytest.raises(ValueError):
+        cli.resolve_operator("crossover", "no_such_crossover")
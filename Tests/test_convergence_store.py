@@ -0,0 +1,84 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from Operators.genetic_algorithm import Convergence
+from Operators.convergence_store import (ConvergenceStore, ConvergenceStoreWriter, convert_csv_logs, decode_runs,
+                                         encode_run, encode_runs)
+from Operators.mutations import single_player_swap_2teams
+
+
+def _padded(curves, n_generations):
+    return np.array([np.r_[curve, np.full(n_generations - len(curve), curve[-1])] for curve in curves])
+
+
+CURVES = [
+    [0.9, 0.9, 0.5, 0.5, 0.5, 0.2],
+    [0.8, 0.4, 0.4],
+    [0.7],
+    [0.6, 0.6, 0.6, 0.6, 0.6, 0.6, 0.1],
+]
+
+
+def test_encode_decode_round_trip():
+    values, starts, plateaus, lengths = encode_runs(CURVES)
+
+    assert list(lengths) == [len(curve) for curve in CURVES]
+    assert list(plateaus) == [3, 2, 1, 2]
+    decoded = decode_runs(values, starts, np.r_[0, np.cumsum(plateaus)], 7)
+    np.testing.assert_array_equal(decoded, _padded(CURVES, 7))
+
+
+def test_store_round_trip(tmp_path):
+    path = tmp_path / "convergence.npz"
+    configs = [{"POP_SIZE": 50, "mutation": single_player_swap_2teams, "elitism": True},
+               {"POP_SIZE": np.int64(100), "mutation": single_player_swap_2teams, "elitism": False}]
+    runs = [CURVES[:2], CURVES[2:]]
+    with ConvergenceStoreWriter(path) as writer:
+        writer.add(configs[0], [Convergence(curve, stop_reason="stagnation", evaluations=10 * len(curve))
+                                for curve in runs[0]], "first")
+        writer.add_encoded(configs[1], [encode_run(Convergence(curve, stop_reason="max_gen", evaluations=5))
+                                        for curve in runs[1]], "second")
+
+    store = ConvergenceStore(path)
+    assert store.shape == (2, 2, 7)
+    assert store.labels == ["first", "second"]
+    assert list(store.configs["POP_SIZE"]) == [50, 100]
+    assert list(store.configs["mutation"]) == ["single_player_swap_2teams"] * 2
+    np.testing.assert_array_equal(store.config_runs("second"), _padded(runs[1], 7))
+    np.testing.assert_array_equal(store.fitness, np.stack([_padded(config_runs, 7) for config_runs in runs]))
+    np.testing.assert_array_equal(store.run_lengths, [[6, 3], [1, 7]])
+    assert store.stop_reasons.tolist() == [["stagnation", "stagnation"], ["max_gen", "max_gen"]]
+    assert store.evaluations.tolist() == [[60, 30], [5, 5]]
+
+
+def test_store_with_different_numbers_of_runs(tmp_path):
+    path = tmp_path / "convergence.npz"
+    with ConvergenceStoreWriter(path) as writer:
+        writer.add({"POP_SIZE": 50}, CURVES[:1])
+        writer.add({"POP_SIZE": 100}, [Convergence(curve, stop_reason="max_gen", evaluations=len(curve))
+                                       for curve in CURVES[1:]])
+
+    store = ConvergenceStore(path)
+    assert store.ragged and store.shape == (2, 3, 7)
+    assert store.run_counts.tolist() == [1, 3]
+    np.testing.assert_array_equal(store.config_runs(0), _padded(CURVES[:1], 7))
+    np.testing.assert_array_equal(store.config_runs(1), _padded(CURVES[1:], 7))
+    assert [len(df) for df in store.to_dataframes().values()] == [1, 3]
+    assert store.evaluations.tolist() == [[0, 0, 0], [3, 1, 7]]
+    assert store.stop_reasons.tolist() == [["", "", ""], ["max_gen"] * 3]
+    with pytest.raises(ValueError):
+        store.fitness
+
+
+def test_convert_csv_logs(tmp_path):
+    label = "POP=50 XO=0.8 mut_prob=0.2 mutation=single_player_swap_2teams elitism=True"
+    pd.DataFrame([_padded(CURVES[:1], 6)[0], np.r_[CURVES[1], [np.nan] * 3]]).to_csv(
+        tmp_path / f"{label}.csv", index=False)
+
+    store = ConvergenceStore(convert_csv_logs(tmp_path))
+
+    assert store.labels == [label]
+    row = store.configs.iloc[0]
+    assert (row["POP_SIZE"], row["xo_prob"], row["elitism"]) == (50, 0.8, True)
+    np.testing.assert_array_equal(store.config_runs(0), _padded(CURVES[:2], 6))
@@ -0,0 +1,83 @@
+import copy
+import pickle
+import random
+
+import numpy as np
+
+from Operators.population import Player, League, calculate_fitness
+from Operators.mutations import single_player_swap_2teams, full_position_swap_2teams
+
+
+def _snapshot(league):
+    return league.genome.copy(), calculate_fitness(league)
+
+
+def test_copy_shares_until_written(population):
+    parent = population[0]
+    calculate_fitness(parent)
+    child = parent.copy()
+
+    assert child.genome is parent.genome
+    assert not parent.genome.flags.writeable and not child.genome.flags.writeable
+
+    genome, fitness = _snapshot(parent)
+    t, s = 0, 0
+    child.own_genome()[t, s] = child.genome[1, s]
+    child.mark_dirty(t, 1)
+
+    assert child.genome is not parent.genome
+    np.testing.assert_array_equal(parent.genome, genome)
+    assert calculate_fitness(parent) == fitness
+    assert calculate_fitness(child) != fitness
+
+
+def test_parent_writes_do_not_reach_the_child(population):
+    parent = population[1]
+    child = parent.copy()
+    genome, fitness = _snapshot(child)
+
+    parent.own_genome()[[0, 1], [0, 0]] = parent.genome[[1, 0], [0, 0]]
+    parent.mark_dirty(0, 1)
+    calculate_fitness(parent)
+
+    np.testing.assert_array_equal(child.genome, genome)
+    assert calculate_fitness(child) == fitness
+
+
+def test_mutations_leave_the_parent_unchanged(population):
+    random.seed(0)
+    for league in population:
+        genome, fitness = _snapshot(league)
+        for mutation in (single_player_swap_2teams, full_position_swap_2teams):
+            child = mutation(league, 1.0)
+            if child is not None:
+                calculate_fitness(child)
+        np.testing.assert_array_equal(league.genome, genome)
+        assert calculate_fitness(league) == fitness
+        assert League.from_genome(league.roster, genome, spec=league.spec).get_fitness() == fitness
+
+
+def test_pickled_copies_stay_frozen(population):
+    parent = population[2]
+    child = parent.copy()
+    parent_back, child_back = pickle.loads(pickle.dumps([parent, child]))
+
+    assert not parent_back.genome.flags.writeable and not child_back.genome.flags.writeable
+    child_back.own_genome()[0, 0] = child_back.genome[1, 0]
+    np.testing.assert_array_equal(parent_back.genome, parent.genome)
+
+
+def test_players_are_interned(players):
+    player = players[0]
+    assert Player(player.name, player.position, player.skill, player.cost) is player
+    assert copy.deepcopy(player) is player
+    assert pickle.loads(pickle.dumps(player)) is player
+
+
+def test_intern_key_keeps_the_value_types():
+    as_int = Player("Test Player", "GK", 80, 106)
+    as_float = Player("Test Player", "GK", 80, 106.0)
+
+    assert as_int is not as_float
+    assert type(as_int.cost) is int and type(as_float.cost) is float
+    assert Player("Test Player", "GK", 80, 106) is as_int
@@ -0,0 +1,24 @@
+import pytest
+
+from Operators.exact import solve_exact, time_to_optimal
+from Operators.population import ProblemSpec, calculate_fitness, fitness_lower_bound
+
+
+def test_solve_exact_is_optimal(players):
+    league, fitness, report = solve_exact(players=players)
+
+    assert report["optimal"] and league.is_valid()
+    assert fitness == calculate_fitness(league)
+    assert fitness >= fitness_lower_bound(league.roster) - 1e-9
+
+
+def test_runs_stopped_at_the_bound_reach_the_target(players):
+    optimum, runs = time_to_optimal(players=players, n_runs=2, max_gen=300, POP_SIZE=30, stop_at_bound=True)
+
+    assert runs["reached"].tolist() == (runs["best_fitness"] <= optimum + 1e-9).tolist()
+    assert runs["reached"].any()
+
+
+def test_no_incumbent_raises(players):
+    with pytest.raises(ValueError, match="no league"):
+        time_to_optimal(players=players, spec=ProblemSpec(salary_cap=10), n_runs=1)
@@ -0,0 +1,65 @@
+import numpy as np
+import pytest
+
+from Operators.population import (ProblemSpec, League, FitnessCache, calculate_fitness, evaluate_genomes,
+                                  population_fitness)
+from Operators.genetic_algorithm import run_algorithm
+
+
+def _fresh(league, spec=None):
+    # Same genome, nothing memoized
+    return League.from_genome(league.roster, league.genome.copy(), spec=spec or league.spec)
+
+
+def _broken(population):
+    # Valid leagues, and leagues breaking player uniqueness and the formations
+    duplicated = _fresh(population[0])
+    duplicated.genome[0] = duplicated.genome[1]
+    wrong_formation = _fresh(population[1])
+    wrong_formation.genome[0, [0, -1]] = wrong_formation.genome[0, [-1, 0]]
+    wrong_formation.genome[1, 0] = wrong_formation.genome[1, -1]
+    return population + [duplicated, wrong_formation]
+
+
+@pytest.mark.parametrize("penalty, salary_cap", [("flat", 750), ("graded", 750), ("graded", 650)])
+def test_evaluate_genomes_matches_calculate_fitness(population, penalty, salary_cap):
+    spec = ProblemSpec(salary_cap=salary_cap, penalty=penalty)
+    leagues = [_fresh(league, spec) for league in _broken(population)]
+    expected = np.array([calculate_fitness(_fresh(league, spec)) for league in leagues])
+
+    fitness = evaluate_genomes(np.stack([league.genome for league in leagues]), leagues[0].roster, spec)
+
+    assert not spec.is_valid_fitness(expected[-1]) and not spec.is_valid_fitness(expected[-2])
+    np.testing.assert_allclose(fitness, expected, rtol=0, atol=1e-12)
+
+
+def test_population_fitness_matches_and_memoizes(population):
+    leagues = [_fresh(league) for league in _broken(population)]
+    expected = np.array([calculate_fitness(_fresh(league)) for league in leagues])
+
+    fitness = population_fitness(leagues)
+
+    np.testing.assert_allclose(fitness, expected, rtol=0, atol=1e-12)
+    assert [league._fitness for league in leagues] == list(fitness)
+
+
+def test_population_fitness_uses_the_cache(population):
+    cache = FitnessCache()
+    first = [_fresh(league) for league in population]
+    for league in first:
+        league.cache = cache
+    fitness = population_fitness(first)
+    assert cache.stats()["misses"] == len(first) and len(cache) == len(first)
+
+    # Same leagues with their teams in another order: all hits, same values
+    again = [League.from_genome(league.roster, league.genome[::-1].copy(), cache=cache) for league in population]
+    np.testing.assert_array_equal(population_fitness(again), fitness)
+    assert cache.stats()["hits"] == len(again)
+
+
+def test_run_records_cache_hits(players):
+    cache = FitnessCache()
+    run_algorithm(players=players, POP_SIZE=20, max_gen=15, seed=0, cache=cache)
+
+    stats = cache.stats()
+    assert stats["hits"] > 0 and stats["misses"] > 0
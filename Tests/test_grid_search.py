@@ -0,0 +1,91 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from Operators.genetic_algorithm import run_grid_search, run_seed
+from Operators.convergence_store import ConvergenceStore, STORE_FILENAME, convert_csv_logs
+from Operators.evaluation import load_fitness_logs
+from Operators.results import load_results
+from Operators.mutations import single_player_swap_2teams, full_position_swap_2teams
+from Operators.crossovers import crossover_swap_whole_position, crossover_swap_extreme_player
+from Operators.selection import tournament_selection
+from conftest import PLAYERS_CSV
+
+PARAM_GRID = {"POP_SIZE": [10], "xo_prob": [0.8], "mut_prob": [0.3],
+              "mutation": [single_player_swap_2teams, full_position_swap_2teams],
+              "crossover": [crossover_swap_whole_position], "selection_algorithm": [tournament_selection],
+              "elitism": [True, False]}
+# Adaptive operators also write operator statistics
+ADAPTIVE_GRID = {**PARAM_GRID, "mutation": [(single_player_swap_2teams, full_position_swap_2teams)],
+                 "crossover": [(crossover_swap_whole_position, crossover_swap_extreme_player)]}
+
+
+def _grid(folder, n_workers, seed=0, log_format="npz", param_grid=PARAM_GRID):
+    # Summary next to the logs folder, as in the notebooks
+    summary_path = folder / "summary.csv"
+    run_grid_search(param_grid, n_runs=4, max_gen=8, filepath=PLAYERS_CSV, summary_path=summary_path,
+                    output_folder=folder / "logs", n_workers=n_workers, seed=seed, log_format=log_format)
+    return pd.read_csv(summary_path)
+
+
+def test_run_seed_depends_on_the_grid_position_only():
+    seeds = {run_seed(0, config_idx, run_idx) for config_idx in range(3) for run_idx in range(3)}
+    assert len(seeds) == 9
+    assert run_seed(0, 1, 2) == run_seed(0, 1, 2) != run_seed(1, 1, 2)
+
+
+@pytest.mark.parametrize("n_workers", [1, 3])
+def test_seeded_grid_is_reproducible(tmp_path, n_workers):
+    reference = _grid(tmp_path / "reference", 1)
+    summary = _grid(tmp_path / "grid", n_workers)
+
+    pd.testing.assert_frame_equal(summary, reference)
+    np.testing.assert_array_equal(ConvergenceStore(tmp_path / "grid" / "logs" / STORE_FILENAME).fitness,
+                                  ConvergenceStore(tmp_path / "reference" / "logs" / STORE_FILENAME).fitness)
+
+
+def test_other_seed_other_runs(tmp_path):
+    _grid(tmp_path / "a", 1, seed=0)
+    _grid(tmp_path / "b", 1, seed=1)
+    assert not np.array_equal(ConvergenceStore(tmp_path / "a" / "logs" / STORE_FILENAME).fitness,
+                              ConvergenceStore(tmp_path / "b" / "logs" / STORE_FILENAME).fitness)
+
+
+def test_csv_logs_match_the_store(tmp_path):
+    summary = _grid(tmp_path / "npz", 1)
+    csv_summary = _grid(tmp_path / "csv", 1, log_format="csv")
+
+    pd.testing.assert_frame_equal(csv_summary, summary)
+    store = ConvergenceStore(tmp_path / "npz" / "logs" / STORE_FILENAME)
+    for i, label in enumerate(store.labels):
+        # CSV rows end with NaN after a run stops, the store pads them with their last value
+        runs = pd.read_csv(tmp_path / "csv" / "logs" / f"{label}.csv", float_precision="round_trip").ffill(axis=1).to_numpy(dtype=float)
+        np.testing.assert_array_equal(runs, store.fitness[i, :, :runs.shape[1]])
+
+
+@pytest.mark.parametrize("param_grid", [PARAM_GRID, ADAPTIVE_GRID])
+def test_csv_logs_read_back(tmp_path, param_grid):
+    summary = _grid(tmp_path, 1, log_format="csv", param_grid=param_grid)
+    expected = {f.stem for f in (tmp_path / "logs").glob("*.csv")}
+
+    results = load_results(tmp_path / "logs", tmp_path / "summary.csv")
+    assert set(results.labels) == expected and len(expected) == len(summary)
+    for _, row in results.summary.iterrows():
+        assert results.runs(results.lookup(row)).shape[0] == 4
+    fitness_dfs = load_fitness_logs(tmp_path / "logs")
+    assert all(len(df) == 4 for df in fitness_dfs.values())
+    store = ConvergenceStore(convert_csv_logs(tmp_path / "logs", tmp_path / "packed.npz"))
+    assert store.shape[:2] == (len(summary), 4)
+    assert (tmp_path / "summary.generation_stats.csv").exists()
+    assert (tmp_path / "summary.operator_stats.csv").exists() == (param_grid is ADAPTIVE_GRID)
+
+
+def test_csv_grid_replaces_an_earlier_store(tmp_path):
+    _grid(tmp_path, 1, seed=0)
+    _grid(tmp_path, 1, seed=1, log_format="csv")
+
+    assert not (tmp_path / "logs" / STORE_FILENAME).exists()
+    fresh = load_results(tmp_path / "logs").to_dataframes()
+    label = next(iter(fresh))
+    logged = pd.read_csv(tmp_path / "logs" / f"{label}.csv").ffill(axis=1).to_numpy()
+    np.testing.assert_allclose(fresh[label].to_numpy()[:, :logged.shape[1]], logged, rtol=0, atol=1e-12)
@@ -0,0 +1,53 @@
+import random
+
+import numpy as np
+
+from Operators.population import League, calculate_fitness
+
+
+def _random_swap(league, rng):
+    # Two players of the same position in two different teams trade places
+    t1, t2 = rng.sample(range(len(league.genome)), 2)
+    position = rng.choice(league.spec.positions)
+    s1 = int(rng.choice(league.position_slots(t1, position)))
+    s2 = int(rng.choice(league.position_slots(t2, position)))
+    return [t1, t2], [s1, s2], [league.genome[t2, s2], league.genome[t1, s1]]
+
+
+def _recomputed(league, teams, slots, players):
+    genome = league.genome.copy()
+    genome[teams, slots] = players
+    return League.from_genome(league.roster, genome, spec=league.spec)
+
+
+def test_move_delta_matches_recomputation(population):
+    rng = random.Random(0)
+    feasible_moves = 0
+    for league in population:
+        for _ in range(20):
+            teams, slots, players = _random_swap(league, rng)
+            delta, feasible = league.move_delta(teams, slots, players)
+            after = _recomputed(league, teams, slots, players)
+
+            assert feasible == after.is_valid()
+            if feasible:
+                feasible_moves += 1
+                assert abs(calculate_fitness(league) + delta - calculate_fitness(after)) < 1e-9
+    assert feasible_moves > 0
+
+
+def test_apply_move_updates_the_running_sums(population):
+    rng = random.Random(1)
+    league = population[0].copy()
+    for _ in range(50):
+        teams, slots, players = _random_swap(league, rng)
+        delta, feasible = league.move_delta(teams, slots, players)
+        if not feasible:
+            continue
+        before = calculate_fitness(league)
+        league.apply_move(teams, slots, players)
+
+        after = _recomputed(league, [], [], [])
+        np.testing.assert_array_equal(league.genome, after.genome)
+        assert abs(calculate_fitness(league) - calculate_fitness(after)) < 1e-9
+        assert abs(before + delta - calculate_fitness(league)) < 1e-9
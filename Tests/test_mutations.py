@@ -0,0 +1,29 @@
+import random
+
+import numpy as np
+import pytest
+
+from Operators.population import ProblemSpec, generate_population
+from Operators.mutations import single_player_swap_2teams, full_position_swap_2teams, single_player_shift_all_teams
+
+MUTATIONS = (single_player_swap_2teams, full_position_swap_2teams, single_player_shift_all_teams)
+
+
+@pytest.mark.parametrize("mutation", MUTATIONS)
+def test_children_are_valid_or_rejected(population, mutation):
+    random.seed(0)
+    for league in population:
+        child = mutation(league, 1.0)
+        if child is not None:
+            assert child.is_valid()
+            np.testing.assert_array_equal(np.sort(child.genome, axis=None), np.sort(league.genome, axis=None))
+
+
+@pytest.mark.parametrize("mutation", MUTATIONS)
+def test_single_team_league_is_left_unchanged(players, mutation):
+    random.seed(0)
+    spec = ProblemSpec(num_teams=1)
+    for league in generate_population(players, 5, spec=spec):
+        child = mutation(league, 1.0)
+        assert child is not None and child is not league
+        assert sorted(child.genome.ravel()) == sorted(league.genome.ravel())
@@ -0,0 +1,77 @@
+import numpy as np
+import pandas as pd
+
+from Operators.genetic_algorithm import Convergence, run_grid_search
+from Operators.convergence_store import ConvergenceStore, STORE_FILENAME
+from Operators.streaming import P2Quantile, StreamingSummary, Welford
+from Operators.mutations import single_player_swap_2teams
+from Operators.crossovers import crossover_swap_whole_position
+from Operators.selection import tournament_selection
+from conftest import PLAYERS_CSV
+
+
+def test_welford_matches_numpy():
+    rng = np.random.default_rng(0)
+    observations = rng.normal(size=(200, 7))
+    welford = Welford(7)
+    for x in observations:
+        welford.add(x)
+
+    np.testing.assert_allclose(welford.mean, observations.mean(axis=0))
+    np.testing.assert_allclose(welford.std, observations.std(axis=0))
+
+
+def test_p2_quantile_exact_up_to_five_then_close():
+    rng = np.random.default_rng(1)
+    observations = rng.normal(size=(2000, 3))
+    median = P2Quantile(0.5, shape=(3,))
+    for i, x in enumerate(observations, start=1):
+        median.add(x)
+        if i <= 5:
+            np.testing.assert_allclose(median.value, np.median(observations[:i], axis=0))
+
+    np.testing.assert_allclose(median.value, np.median(observations, axis=0), atol=0.1)
+
+
+def test_streaming_summary_matches_exact_statistics():
+    rng = np.random.default_rng(2)
+    curves = [Convergence(np.sort(rng.random(length))[::-1], stop_reason=reason, evaluations=10 * length)
+              for length, reason in zip(rng.integers(1, 11, size=13), ["max_gen", "stagnation"] * 7)]
+    summary = StreamingSummary(10)
+    for curve in curves:
+        summary.add(curve[-1], curve)
+
+    finals = [curve[-1] for curve in curves]
+    stats = summary.stats()
+    assert stats["median_fitness"] == np.median(finals)
+    np.testing.assert_allclose([stats["mean_fitness"], stats["std_fitness"]], [np.mean(finals), np.std(finals)])
+    assert (stats["min_fitness"], stats["max_fitness"]) == (min(finals), max(finals))
+    np.testing.assert_allclose(stats["mean_stop_generation"], np.mean([len(curve) for curve in curves]))
+    assert stats["stop_reasons"] == "max_gen:7;stagnation:6"
+
+    padded = np.array([np.r_[curve, np.full(10 - len(curve), curve[-1])] for curve in curves])
+    curve_stats = summary.curve_stats()
+    np.testing.assert_allclose(curve_stats["mean"], padded.mean(axis=0))
+    np.testing.assert_allclose(curve_stats["std"], padded.std(axis=0), atol=1e-12)
+
+
+def test_grid_summary_uses_exact_statistics(tmp_path):
+    param_grid = {"POP_SIZE": [10, 14], "xo_prob": [0.8], "mut_prob": [0.3],
+                  "mutation": [single_player_swap_2teams], "crossover": [crossover_swap_whole_position],
+                  "selection_algorithm": [tournament_selection], "elitism": [True], "stagnation": [4]}
+    summary_path = tmp_path / "summary.csv"
+    run_grid_search(param_grid, n_runs=7, max_gen=12, filepath=PLAYERS_CSV, summary_path=summary_path,
+                    output_folder=tmp_path, seed=0)
+
+    store = ConvergenceStore(tmp_path / STORE_FILENAME)
+    finals = store.fitness[:, :, -1]
+    summary = pd.read_csv(summary_path)
+    np.testing.assert_allclose(summary["median_fitness"], np.median(finals, axis=1), rtol=0, atol=1e-12)
+    np.testing.assert_allclose(summary["mean_fitness"], finals.mean(axis=1), rtol=0, atol=1e-12)
+    np.testing.assert_allclose(summary["std_fitness"], finals.std(axis=1), rtol=0, atol=1e-12)
+
+    generations = pd.read_csv(tmp_path / "summary.generation_stats.csv")
+    np.testing.assert_allclose(generations["median_fitness"], np.median(store.fitness, axis=1).ravel(),
+                               rtol=0, atol=1e-12)
+    np.testing.assert_allclose(generations["mean_fitness"], store.fitness.mean(axis=1).ravel(), rtol=0, atol=1e-12)
+    assert not (tmp_path / "summary.partial.csv").exists()
@@ -0,0 +1,42 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from Operators.tuning import tune_grid_search, halving_survivors
+from Operators.results import load_results
+from Operators.mutations import single_player_swap_2teams
+from Operators.crossovers import crossover_swap_whole_position
+from Operators.selection import tournament_selection
+from conftest import PLAYERS_CSV
+
+# The race compares two configurations (Wilcoxon test), POP=4 is soon left behind
+PARAM_GRID = {"POP_SIZE": [4, 10, 20, 30], "xo_prob": [0.8], "mut_prob": [0.5],
+              "mutation": [single_player_swap_2teams], "crossover": [crossover_swap_whole_position],
+              "selection_algorithm": [tournament_selection], "elitism": [True]}
+
+
+def test_halving_keeps_the_best_medians():
+    scores = np.array([[3.0, 1.0, 2.0, 4.0], [3.0, 1.0, 2.0, 4.0]])
+    assert halving_survivors(scores, eta=2).tolist() == [False, True, True, False]
+
+
+@pytest.mark.parametrize("method, options", [("race", {"first_round": 6, "round_size": 2}),
+                                             ("halving", {"first_round": 3, "eta": 2})])
+@pytest.mark.parametrize("log_format", ["npz", "csv"])
+def test_every_configuration_is_loadable(tmp_path, method, options, log_format):
+    param_grid = dict(PARAM_GRID, POP_SIZE=[4, 30]) if method == "race" else PARAM_GRID
+    summary_path = tmp_path / "summary.csv"
+    report = tune_grid_search(param_grid, n_runs=12, max_gen=5, filepath=PLAYERS_CSV, summary_path=summary_path,
+                              output_folder=tmp_path / "logs", seed=0, log_format=log_format, method=method,
+                              **options)
+    # Eliminated configurations have fewer runs than the survivors
+    assert report["eliminated_round"].notna().any() and report["runs"].nunique() > 1
+
+    results = load_results(tmp_path / "logs", summary_path)
+    runs = dict(zip(report["config"], report["runs"]))
+    assert len(results) == len(results.summary) == len(runs)
+    for _, row in results.summary.iterrows():
+        config = results.lookup(row)
+        assert config is not None
+        assert len(results.runs(config)) == runs[results.labels[config]]
+    assert len(results.median_curves) == len(runs)